@@ -0,0 +1,63 @@
+# bench_startup.py – tracks application cold start time
+#
+#   python benchmarks/bench_startup.py            # 5 runs
+#   python benchmarks/bench_startup.py --runs 20
+#
+# Each run uses a fresh interpreter so module caches are cold, and reports:
+#   import_ms   – time to import src.chatbot.main
+#   startup_ms  – time for the lifespan startup phase to finish
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+PROBE = r"""
+import asyncio, json, time
+
+t0 = time.perf_counter()
+from src.chatbot.main import app
+t1 = time.perf_counter()
+
+async def startup():
+    async with app.router.lifespan_context(app):
+        t2 = time.perf_counter()
+    return t2
+
+t2 = asyncio.run(startup())
+print(json.dumps({"import_ms": (t1 - t0) * 1000, "startup_ms": (t2 - t1) * 1000}))
+"""
+
+
+def run_once() -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold start benchmark")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    samples = [run_once() for _ in range(args.runs)]
+
+    for metric in ("import_ms", "startup_ms"):
+        values = [sample[metric] for sample in samples]
+        print(
+            f"{metric:<11} median={statistics.median(values):8.1f}  "
+            f"min={min(values):8.1f}  max={max(values):8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# bulk_bookings.py – bulk import/export of bookings through PostgreSQL COPY
+#
+#   python -m src.chatbot.bulk_bookings import bookings.csv
+#   python -m src.chatbot.bulk_bookings import bookings.ndjson --send-emails
+#   python -m src.chatbot.bulk_bookings import crm_history.csv --allow-historical
+#   python -m src.chatbot.bulk_bookings export bookings.csv --start 2026-01-01T00:00:00+00:00
+
+import argparse
+import asyncio
+import json
+from datetime import datetime
+
+from .config.db import SessionLocal
+from .routes.bookings_route import invalidate_bookings_cache
+from .utils.availability_index import AvailabilityIndex
+from .utils.bulk_booking_utils import detect_format, import_bookings, export_bookings
+
+
+def guess_format(path: str, fmt: str | None) -> str:
+    if fmt:
+        return detect_format(fmt)
+    return "ndjson" if path.endswith((".ndjson", ".jsonl")) else "csv"
+
+
+async def refresh_caches():
+    # One event loop for both: the Redis client is bound to the loop that made it
+    await AvailabilityIndex.rebuild()
+    await invalidate_bookings_cache()
+
+
+def run_import(args):
+    fmt = guess_format(args.path, args.format)
+    db = SessionLocal()
+
+    try:
+        with open(args.path, "r", encoding="utf-8-sig", newline="") as f:
+            summary = import_bookings(
+                db, f, fmt,
+                send_emails=args.send_emails,
+                allow_historical=args.allow_historical
+            )
+
+        if summary["inserted"]:
+            asyncio.run(refresh_caches())
+
+        print(json.dumps(summary, indent=2, default=str))
+    finally:
+        db.close()
+
+
+def run_export(args):
+    fmt = guess_format(args.path, args.format)
+    db = SessionLocal()
+
+    try:
+        with open(args.path, "wb") as f:
+            export_bookings(db, f, fmt, args.start, args.end)
+        print(f"✅ Bookings exported to {args.path}")
+    finally:
+        db.close()
+
+
+# --------------------------------------------------
+# Main
+# --------------------------------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk booking import/export")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    import_cmd = commands.add_parser("import", help="Import bookings from CSV/NDJSON")
+    import_cmd.add_argument("path")
+    import_cmd.add_argument("--format", choices=["csv", "ndjson"])
+    import_cmd.add_argument("--send-emails", action="store_true")
+    import_cmd.add_argument(
+        "--allow-historical",
+        action="store_true",
+        help="Accept past and off-calendar bookings, e.g. when migrating from a CRM"
+    )
+    import_cmd.set_defaults(func=run_import)
+
+    export_cmd = commands.add_parser("export", help="Export bookings to CSV/NDJSON")
+    export_cmd.add_argument("path")
+    export_cmd.add_argument("--format", choices=["csv", "ndjson"])
+    export_cmd.add_argument("--start", type=datetime.fromisoformat)
+    export_cmd.add_argument("--end", type=datetime.fromisoformat)
+    export_cmd.set_defaults(func=run_export)
+
+    args = parser.parse_args()
+    args.func(args)
@@ -0,0 +1,360 @@
+# cf_emulator.py – local stand-in for the Cloudflare APIs this service uses
+#
+#   uvicorn src.chatbot.cf_emulator:app --port 8787
+#
+# then point the backend and ingest.py at it:
+#
+#   CF_API_ROOT=http://localhost:8787/client/v4
+#
+# Emulated endpoints (under /client/v4/accounts/<account_id>):
+#   POST /ai/run/<embedding model>          Workers AI native embeddings
+#   POST /ai/v1/embeddings                  OpenAI-compatible embeddings
+#   POST /ai/v1/chat/completions            OpenAI-compatible chat (+ streaming)
+#   POST /vectorize/v2/indexes/<idx>/upsert
+#   POST /vectorize/v2/indexes/<idx>/query
+#   POST /vectorize/v2/indexes/<idx>/delete_by_ids
+# plus GET /client/v4/user/tokens/verify for readiness probes.
+#
+# Embeddings are deterministic (hashed bag of words), so texts sharing words
+# score close together. Latency, error rate and rate limits are configurable
+# through EMULATOR_* env vars for profiling and load tests.
+
+import asyncio
+import hashlib
+import json
+import math
+import random
+import re
+import time
+import uuid
+from typing import Dict, List, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from .config.env import get_env
+
+
+EMBEDDING_DIMENSIONS = int(get_env("EMULATOR_EMBEDDING_DIMENSIONS", 384))
+LATENCY_MS = float(get_env("EMULATOR_LATENCY_MS", 0))
+LATENCY_JITTER_MS = float(get_env("EMULATOR_LATENCY_JITTER_MS", 0))
+ERROR_RATE = float(get_env("EMULATOR_ERROR_RATE", 0))
+RATE_LIMIT_RPS = float(get_env("EMULATOR_RATE_LIMIT_RPS", 0))  # 0 = unlimited
+STREAM_TOKEN_DELAY_MS = float(get_env("EMULATOR_STREAM_TOKEN_DELAY_MS", 10))
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+app = FastAPI(title="Cloudflare API emulator")
+
+# index name -> vector id -> {"values", "metadata", "namespace"}
+indexes: Dict[str, Dict[str, Dict]] = {}
+
+_bucket = {"tokens": RATE_LIMIT_RPS, "ts": time.monotonic()}
+
+
+# -----------------------------
+# Fault injection
+# -----------------------------
+
+def cf_error(status_code: int, message: str) -> JSONResponse:
+    return JSONResponse(
+        status_code=status_code,
+        content={"success": False, "errors": [{"code": status_code, "message": message}], "result": None}
+    )
+
+
+@app.middleware("http")
+async def inject_faults(request: Request, call_next):
+    if RATE_LIMIT_RPS > 0:
+        now = time.monotonic()
+        _bucket["tokens"] = min(RATE_LIMIT_RPS, _bucket["tokens"] + (now - _bucket["ts"]) * RATE_LIMIT_RPS)
+        _bucket["ts"] = now
+
+        if _bucket["tokens"] < 1:
+            response = cf_error(429, "Rate limited")
+            response.headers["Retry-After"] = "1"
+            return response
+
+        _bucket["tokens"] -= 1
+
+    delay = LATENCY_MS + random.uniform(0, LATENCY_JITTER_MS)
+    if delay > 0:
+        await asyncio.sleep(delay / 1000)
+
+    if ERROR_RATE > 0 and random.random() < ERROR_RATE:
+        return cf_error(500, "Injected upstream error")
+
+    return await call_next(request)
+
+
+# -----------------------------
+# Deterministic embeddings
+# -----------------------------
+
+def embed_text(text: str) -> List[float]:
+    """Feature-hashed bag of words, L2 normalised."""
+    vector = [0.0] * EMBEDDING_DIMENSIONS
+
+    for token in TOKEN_RE.findall(text.lower()):
+        digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+        bucket = int.from_bytes(digest[:4], "little") % EMBEDDING_DIMENSIONS
+        sign = 1.0 if digest[4] & 1 else -1.0
+        vector[bucket] += sign
+
+    norm = math.sqrt(sum(v * v for v in vector))
+    if norm == 0:
+        # Empty text still gets a stable unit vector
+        vector[0] = 1.0
+        return vector
+
+    return [v / norm for v in vector]
+
+
+def cosine(a: List[float], b: List[float]) -> float:
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+def count_tokens(text: str) -> int:
+    return len(text.split())
+
+
+# -----------------------------
+# Workers AI
+# -----------------------------
+
+@app.get("/client/v4/user/tokens/verify")
+async def verify_token():
+    return {"success": True, "errors": [], "result": {"status": "active"}}
+
+
+@app.post("/client/v4/accounts/{account_id}/ai/run/{model:path}")
+async def ai_run(account_id: str, model: str, request: Request):
+    body = await request.json()
+    texts = body.get("text", [])
+    if isinstance(texts, str):
+        texts = [texts]
+
+    return {
+        "success": True,
+        "errors": [],
+        "result": {
+            "shape": [len(texts), EMBEDDING_DIMENSIONS],
+            "data": [embed_text(t) for t in texts]
+        }
+    }
+
+
+@app.post("/client/v4/accounts/{account_id}/ai/v1/embeddings")
+async def openai_embeddings(account_id: str, request: Request):
+    body = await request.json()
+    texts = body.get("input", [])
+    if isinstance(texts, str):
+        texts = [texts]
+
+    tokens = sum(count_tokens(t) for t in texts)
+
+    return {
+        "object": "list",
+        "model": body.get("model"),
+        "data": [
+            {"object": "embedding", "index": i, "embedding": embed_text(t)}
+            for i, t in enumerate(texts)
+        ],
+        "usage": {"prompt_tokens": tokens, "total_tokens": tokens}
+    }
+
+
+def emulated_reply(messages: List[Dict], max_tokens: Optional[int]) -> str:
+    last_user = next(
+        (m.get("content", "") for m in reversed(messages) if m.get("role") == "user"),
+        ""
+    )
+    reply = f"[emulated] You asked: {last_user}"
+    words = reply.split()
+    if max_tokens:
+        words = words[:max_tokens]
+    return " ".join(words)
+
+
+@app.post("/client/v4/accounts/{account_id}/ai/v1/chat/completions")
+async def openai_chat_completions(account_id: str, request: Request):
+    body = await request.json()
+    messages = body.get("messages", [])
+    model = body.get("model")
+    reply = emulated_reply(messages, body.get("max_tokens"))
+
+    completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+    created = int(time.time())
+    prompt_tokens = sum(count_tokens(str(m.get("content", ""))) for m in messages)
+    completion_tokens = count_tokens(reply)
+
+    if body.get("stream"):
+        async def event_stream():
+            words = reply.split(" ")
+            for i, word in enumerate(words):
+                chunk = {
+                    "id": completion_id,
+                    "object": "chat.completion.chunk",
+                    "created": created,
+                    "model": model,
+                    "choices": [{
+                        "index": 0,
+                        "delta": {"content": word if i == 0 else f" {word}"},
+                        "finish_reason": None
+                    }]
+                }
+                yield f"data: {json.dumps(chunk)}\n\n"
+                if STREAM_TOKEN_DELAY_MS:
+                    await asyncio.sleep(STREAM_TOKEN_DELAY_MS / 1000)
+
+            final = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]
+            }
+            yield f"data: {json.dumps(final)}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+    return {
+        "id": completion_id,
+        "object": "chat.completion",
+        "created": created,
+        "model": model,
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": reply},
+            "finish_reason": "stop"
+        }],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens
+        }
+    }
+
+
+# -----------------------------
+# Vectorize
+# -----------------------------
+
+@app.post("/client/v4/accounts/{account_id}/vectorize/v2/indexes/{index_name}/upsert")
+async def vectorize_upsert(account_id: str, index_name: str, request: Request):
+    raw = await request.body()
+
+    # Real Vectorize takes NDJSON; the backend sends {"vectors": [...]}
+    try:
+        vectors = json.loads(raw)["vectors"]
+    except (ValueError, KeyError, TypeError):
+        vectors = [json.loads(line) for line in raw.decode().splitlines() if line.strip()]
+
+    index = indexes.setdefault(index_name, {})
+    for vector in vectors:
+        index[vector["id"]] = {
+            "values": vector["values"],
+            "metadata": vector.get("metadata", {}),
+            "namespace": vector.get("namespace"),
+        }
+
+    return {
+        "success": True,
+        "errors": [],
+        "result": {"mutationId": uuid.uuid4().hex, "count": len(vectors)}
+    }
+
+
+@app.post("/client/v4/accounts/{account_id}/vectorize/v2/indexes/{index_name}/delete_by_ids")
+async def vectorize_delete_by_ids(account_id: str, index_name: str, request: Request):
+    ids = (await request.json()).get("ids", [])
+
+    index = indexes.get(index_name, {})
+    for vector_id in ids:
+        index.pop(vector_id, None)
+
+    return {
+        "success": True,
+        "errors": [],
+        "result": {"mutationId": uuid.uuid4().hex, "count": len(ids)}
+    }
+
+
+@app.get("/client/v4/accounts/{account_id}/vectorize/v2/indexes/{index_name}/list")
+async def vectorize_list(account_id: str, index_name: str, count: int = 100, cursor: Optional[str] = None):
+    # The cursor is just an offset into the insertion-ordered ids
+    ids = list(indexes.get(index_name, {}))
+    start = int(cursor) if cursor else 0
+    page = ids[start:start + count]
+    truncated = start + count < len(ids)
+
+    return {
+        "success": True,
+        "errors": [],
+        "result": {
+            "count": len(page),
+            "totalCount": len(ids),
+            "isTruncated": truncated,
+            "nextCursor": str(start + count) if truncated else None,
+            "vectors": [{"id": vector_id} for vector_id in page]
+        }
+    }
+
+
+def matches_filter(metadata: Dict, filter_: Optional[Dict]) -> bool:
+    if not filter_:
+        return True
+
+    for key, condition in filter_.items():
+        value = metadata.get(key)
+        if isinstance(condition, dict):
+            if "$eq" in condition and value != condition["$eq"]:
+                return False
+            if "$ne" in condition and value == condition["$ne"]:
+                return False
+            if "$in" in condition and value not in condition["$in"]:
+                return False
+            if "$nin" in condition and value in condition["$nin"]:
+                return False
+        elif value != condition:
+            return False
+
+    return True
+
+
+@app.post("/client/v4/accounts/{account_id}/vectorize/v2/indexes/{index_name}/query")
+async def vectorize_query(account_id: str, index_name: str, request: Request):
+    body = await request.json()
+    query = body["vector"]
+    top_k = int(body.get("topK", 5))
+    namespace = body.get("namespace")
+    filter_ = body.get("filter")
+    return_metadata = body.get("returnMetadata", "none") not in ("none", False)
+    return_values = bool(body.get("returnValues", False))
+
+    # Brute force: score every vector in the (namespace-filtered) index
+    scored = []
+    for vector_id, entry in indexes.get(index_name, {}).items():
+        if namespace is not None and entry["namespace"] != namespace:
+            continue
+        if not matches_filter(entry["metadata"], filter_):
+            continue
+        scored.append((cosine(query, entry["values"]), vector_id, entry))
+
+    scored.sort(key=lambda item: item[0], reverse=True)
+
+    matches = []
+    for score, vector_id, entry in scored[:top_k]:
+        match = {"id": vector_id, "score": score}
+        if return_metadata:
+            match["metadata"] = entry["metadata"]
+        if return_values:
+            match["values"] = entry["values"]
+        if entry["namespace"] is not None:
+            match["namespace"] = entry["namespace"]
+        matches.append(match)
+
+    return {"success": True, "errors": [], "result": {"count": len(matches), "matches": matches}}
@@ -0,0 +1,68 @@
+import httpx
+from typing import Optional, TYPE_CHECKING
+
+from .env import get_env
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
+
+CLOUDFLARE_API_ROOT = "https://api.cloudflare.com/client/v4"
+
+# Point CF_API_ROOT at the local emulator (src/chatbot/cf_emulator.py) to run
+# offline; credentials then default to placeholders.
+CF_API_ROOT = get_env("CF_API_ROOT", CLOUDFLARE_API_ROOT).rstrip("/")
+USING_EMULATOR = CF_API_ROOT != CLOUDFLARE_API_ROOT
+
+CF_ACCOUNT_ID = get_env("CF_ACCOUNT_ID", "local" if USING_EMULATOR else None)
+CF_API_TOKEN = get_env("CF_API_TOKEN", "local" if USING_EMULATOR else None)
+VECTORIZE_INDEX = get_env("VECTORIZE_INDEX_NAME", "onetracker-knowledge")
+
+CF_BASE = f"{CF_API_ROOT}/accounts/{CF_ACCOUNT_ID}"
+
+
+class CloudflareClient:
+    """
+    Lazily built Cloudflare clients. Nothing is constructed (and credentials
+    are not checked) until the first request that actually needs Workers AI.
+    """
+    _ai_client: Optional["AsyncOpenAI"] = None
+    _http_client: Optional[httpx.AsyncClient] = None
+
+    @staticmethod
+    def check_credentials():
+        if not CF_ACCOUNT_ID or not CF_API_TOKEN:
+            raise RuntimeError("Missing Cloudflare credentials")
+
+    @classmethod
+    def get_http_client(cls) -> httpx.AsyncClient:
+        if cls._http_client is None:
+            cls.check_credentials()
+            cls._http_client = httpx.AsyncClient(
+                headers={
+                    "Authorization": f"Bearer {CF_API_TOKEN}",
+                    "Content-Type": "application/json"
+                },
+                timeout=60.0
+            )
+        return cls._http_client
+
+    @classmethod
+    def get_ai_client(cls) -> "AsyncOpenAI":
+        if cls._ai_client is None:
+            # Imported here: the openai package is slow to import
+            from openai import AsyncOpenAI
+
+            cls._ai_client = AsyncOpenAI(
+                api_key=CF_API_TOKEN,
+                base_url=f"{CF_BASE}/ai/v1",
+                http_client=cls.get_http_client()
+            )
+        return cls._ai_client
+
+    @classmethod
+    async def close(cls):
+        if cls._http_client is not None:
+            await cls._http_client.aclose()
+        cls._http_client = None
+        cls._ai_client = None
@@ -1,13 +1,222 @@
-from sqlalchemy import create_engine
+import logging
+import time
+from fastapi import Request, Response
+from sqlalchemy import create_engine, exc
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker
-import os
-from dotenv import load_dotenv
+from sqlalchemy.pool import QueuePool
+from typing import Optional
 
-load_dotenv()
-DATABASE_URI = os.getenv("DB_URI")
+from .env import get_env, get_bool_env
+
+logger = logging.getLogger(__name__)
+
+DATABASE_URI = get_env("DB_URI")
+DB_REPLICA_URI = get_env("DB_REPLICA_URI")
+
+DB_POOL_SIZE = int(get_env("DB_POOL_SIZE", 5))
+DB_MAX_OVERFLOW = int(get_env("DB_MAX_OVERFLOW", 10))
+DB_POOL_TIMEOUT = float(get_env("DB_POOL_TIMEOUT", 30))
+DB_POOL_RECYCLE = int(get_env("DB_POOL_RECYCLE", 1800))
+DB_POOL_PRE_PING = get_bool_env("DB_POOL_PRE_PING", True)
+
+# Reads within this many seconds of the client's last write go to the primary
+DB_READ_YOUR_WRITES_WINDOW = int(get_env("DB_READ_YOUR_WRITES_WINDOW", 5))
+# How long to keep routing reads to the primary after the replica fails
+DB_REPLICA_RETRY_AFTER = int(get_env("DB_REPLICA_RETRY_AFTER", 30))
+
+LAST_WRITE_COOKIE = "last_write_at"
+READ_YOUR_WRITES_HEADER = "x-read-your-writes"
+
+
+class PoolMetrics:
+    checkouts = 0
+    timeouts = 0
+    wait_time_total = 0.0
+    wait_time_max = 0.0
+
+    @classmethod
+    def record_wait(cls, seconds: float):
+        cls.checkouts += 1
+        cls.wait_time_total += seconds
+        cls.wait_time_max = max(cls.wait_time_max, seconds)
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long callers wait for a connection."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            PoolMetrics.timeouts += 1
+            raise
+        finally:
+            PoolMetrics.record_wait(time.perf_counter() - start)
+
+
+# The engine is created on first use instead of at import, so importing the
+# app (CLI tools, tests, cold starts) never pays for driver setup.
+_engine: Optional[Engine] = None
+_session_factory = sessionmaker(autocommit = False,autoflush = False)
+
+_replica_engine: Optional[Engine] = None
+_replica_session_factory = sessionmaker(autocommit = False,autoflush = False)
+_replica_down_until = 0.0
+
+
+def _build_engine(uri: str) -> Engine:
+    return create_engine(
+        uri,
+        poolclass = TimedQueuePool,
+        pool_size = DB_POOL_SIZE,
+        max_overflow = DB_MAX_OVERFLOW,
+        pool_timeout = DB_POOL_TIMEOUT,
+        pool_recycle = DB_POOL_RECYCLE,
+        pool_pre_ping = DB_POOL_PRE_PING
+    )
+
+
+def get_engine() -> Engine:
+    global _engine
+    if _engine is None:
+        _engine = _build_engine(DATABASE_URI)
+        _session_factory.configure(bind = _engine)
+    return _engine
+
+
+def get_replica_engine() -> Optional[Engine]:
+    global _replica_engine
+    if _replica_engine is None and DB_REPLICA_URI:
+        _replica_engine = _build_engine(DB_REPLICA_URI)
+        _replica_session_factory.configure(bind = _replica_engine)
+    return _replica_engine
+
+
+def warm_pool():
+    """Opens pool_size connections up front so first requests skip the handshake."""
+    engines = [get_engine()]
+    if get_replica_engine() is not None:
+        engines.append(get_replica_engine())
+
+    for engine in engines:
+        connections = []
+        try:
+            for _ in range(DB_POOL_SIZE):
+                connections.append(engine.connect())
+        finally:
+            for connection in connections:
+                connection.close()
+
+
+def get_pool_stats() -> dict:
+    stats = {
+        "checkouts": PoolMetrics.checkouts,
+        "timeouts": PoolMetrics.timeouts,
+        "wait_time_avg_ms": round(
+            PoolMetrics.wait_time_total / PoolMetrics.checkouts * 1000, 3
+        ) if PoolMetrics.checkouts else 0.0,
+        "wait_time_max_ms": round(PoolMetrics.wait_time_max * 1000, 3),
+    }
+
+    if _engine is None:
+        return {"initialized": False, **stats}
+
+    stats = {"initialized": True, **_engine_pool_stats(_engine), **stats}
+
+    if _replica_engine is not None:
+        stats["replica"] = _engine_pool_stats(_replica_engine)
+
+    return stats
+
+
+def _engine_pool_stats(engine: Engine) -> dict:
+    pool = engine.pool
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        "max_overflow": DB_MAX_OVERFLOW,
+    }
+
+
+def SessionLocal():
+    get_engine()
+    return _session_factory()
+
+
+def ReplicaSessionLocal():
+    """Session on the read replica, or None if no usable replica."""
+    global _replica_down_until
+
+    if get_replica_engine() is None or time.monotonic() < _replica_down_until:
+        return None
+
+    db = _replica_session_factory()
+    try:
+        # Check out a connection now so a dead replica falls back up front
+        db.connection()
+        return db
+    except exc.OperationalError:
+        db.close()
+        _replica_down_until = time.monotonic() + DB_REPLICA_RETRY_AFTER
+        logger.warning("Read replica unavailable, falling back to primary", exc_info=True)
+        return None
+
+
+def dispose_engine():
+    global _engine, _replica_engine
+    if _engine is not None:
+        _engine.dispose()
+        _engine = None
+    if _replica_engine is not None:
+        _replica_engine.dispose()
+        _replica_engine = None
+
+
+def wants_primary(request: Request) -> bool:
+    if request.headers.get(READ_YOUR_WRITES_HEADER, "").lower() in ("1", "true"):
+        return True
+
+    last_write = request.cookies.get(LAST_WRITE_COOKIE)
+    try:
+        return last_write is not None and time.time() - float(last_write) < DB_READ_YOUR_WRITES_WINDOW
+    except ValueError:
+        return False
+
+
+def mark_recent_write(response: Response):
+    """Pin this client's reads to the primary for the read-your-writes window."""
+    response.set_cookie(
+        LAST_WRITE_COOKIE,
+        str(time.time()),
+        max_age=DB_READ_YOUR_WRITES_WINDOW,
+        httponly=True
+    )
+
+
+class LazySession:
+    """
+    Opens a primary session on first use. Chat turns that never reach the
+    booking flow don't check out a connection at all, and long-lived
+    websocket connections close it after each turn instead of pinning one.
+    """
+
+    def __init__(self):
+        self._db = None
+
+    def get(self):
+        if self._db is None:
+            self._db = SessionLocal()
+        return self._db
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
 
-engine = create_engine(DATABASE_URI)
-SessionLocal = sessionmaker(autocommit = False,autoflush = False,bind = engine)
 
 def get_db():
     db = SessionLocal()
@@ -16,4 +225,39 @@ def get_db():
     except Exception as e:
         raise e
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+class LazyReadSession:
+    """
+    Stands in for a Session on read endpoints. Nothing is checked out until
+    the endpoint first uses it, so cache hits and 304s never touch Postgres.
+    The first use opens a replica session, or the primary when the client
+    asked for its own writes or the replica is unavailable.
+    """
+
+    def __init__(self, prefer_primary: bool = False):
+        self._prefer_primary = prefer_primary
+        self._db = None
+
+    def _resolve(self):
+        if self._db is None:
+            db = None if self._prefer_primary else ReplicaSessionLocal()
+            self._db = db if db is not None else SessionLocal()
+        return self._db
+
+    def __getattr__(self, name):
+        return getattr(self._resolve(), name)
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+
+def get_read_db(request: Request):
+    db = LazyReadSession(prefer_primary=wants_primary(request))
+    try:
+       yield db
+    finally:
+        db.close()
@@ -0,0 +1,17 @@
+import os
+from dotenv import load_dotenv
+
+# .env is read once, on first import. Modules read settings through get_env
+# so the file is loaded before any of them look at the environment.
+load_dotenv()
+
+
+def get_env(key: str, default=None):
+    return os.getenv(key, default)
+
+
+def get_bool_env(key: str, default: bool = False) -> bool:
+    value = os.getenv(key)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
@@ -1,9 +1,10 @@
 import redis.asyncio as redis
 from typing import Optional
-import os
 
+from .env import get_env
 
-REDIS_URL = os.getenv("REDIS_URI", "redis://redis:6379/0")
+
+REDIS_URL = get_env("REDIS_URI", "redis://redis:6379/0")
 
 
 class RedisClient:
@@ -16,4 +17,10 @@ class RedisClient:
                 REDIS_URL,
                 decode_responses=True
             )
-        return cls._client
\ No newline at end of file
+        return cls._client
+
+    @classmethod
+    async def close(cls):
+        if cls._client is not None:
+            await cls._client.aclose()
+            cls._client = None
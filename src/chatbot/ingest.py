@@ -2,10 +2,14 @@
 
 import httpx
 import asyncio
+import hashlib
+import json
 import os
-import uuid
+import re
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
 from dotenv import load_dotenv
-from typing import List, Dict
+from typing import Awaitable, Callable, List, Dict, Iterable, Iterator, Optional, Tuple
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 
 # --------------------------------------------------
@@ -13,123 +17,426 @@ from langchain_text_splitters import RecursiveCharacterTextSplitter
 # --------------------------------------------------
 load_dotenv()
 
-CF_ACCOUNT_ID = os.getenv("CF_ACCOUNT_ID")
-CF_API_TOKEN = os.getenv("CF_API_TOKEN")
+CLOUDFLARE_API_ROOT = "https://api.cloudflare.com/client/v4"
+
+# Set CF_API_ROOT to the local emulator (cf_emulator.py) to ingest offline
+CF_API_ROOT = os.getenv("CF_API_ROOT", CLOUDFLARE_API_ROOT).rstrip("/")
+USING_EMULATOR = CF_API_ROOT != CLOUDFLARE_API_ROOT
+
+CF_ACCOUNT_ID = os.getenv("CF_ACCOUNT_ID", "local" if USING_EMULATOR else None)
+CF_API_TOKEN = os.getenv("CF_API_TOKEN", "local" if USING_EMULATOR else None)
 VECTORIZE_INDEX = os.getenv("VECTORIZE_INDEX_NAME", "onetracker-knowledge")
 
 # 384 dimensions model
 EMBEDDING_MODEL = "@cf/baai/bge-small-en-v1.5"
 
-if not CF_ACCOUNT_ID or not CF_API_TOKEN:
-    raise ValueError("❌ Missing CF_ACCOUNT_ID or CF_API_TOKEN in .env")
-
-CF_BASE = f"https://api.cloudflare.com/client/v4/accounts/{CF_ACCOUNT_ID}"
+CF_BASE = f"{CF_API_ROOT}/accounts/{CF_ACCOUNT_ID}"
 
 CF_HEADERS = {
     "Authorization": f"Bearer {CF_API_TOKEN}",
     "Content-Type": "application/json"
 }
 
+# Records mtime/size of every ingested file so unchanged files are skipped
+MANIFEST_FILENAME = ".ingest_manifest.json"
+
+# Checkpoints embedded and upserted chunks of an unfinished run
+JOURNAL_FILENAME = ".ingest_journal.sqlite"
+
+# Upper bounds for the adaptive batch sizes (Workers AI / Vectorize limits)
+EMBED_BATCH_MAX = int(os.getenv("INGEST_EMBED_BATCH_MAX", 100))
+UPSERT_BATCH_MAX = int(os.getenv("INGEST_UPSERT_BATCH_MAX", 1000))
+# Consecutive 413/429 responses tolerated for one batch before giving up
+INGEST_MAX_RETRIES = int(os.getenv("INGEST_MAX_RETRIES", 8))
+
+# Category (and Vectorize namespace) for files with no front-matter category
+# that sit directly in the docs folder
+DEFAULT_CATEGORY = "general"
+FRONT_MATTER_DELIMITER = "---"
+
+# Ids the ingester wrote before stable ids: "<source>-<8 random hex>", no namespace
+LEGACY_ID_RE = re.compile(r"^.+-[0-9a-f]{8}$")
+LIST_PAGE_SIZE = 1000
+
+def check_credentials():
+    if not CF_ACCOUNT_ID or not CF_API_TOKEN:
+        raise ValueError("❌ Missing CF_ACCOUNT_ID or CF_API_TOKEN in .env")
+
+
 # --------------------------------------------------
 # Embedding Function
 # --------------------------------------------------
-async def embed_batch(texts: List[str]) -> List[List[float]]:
-    async with httpx.AsyncClient() as client:
-        resp = await client.post(
-            f"{CF_BASE}/ai/run/{EMBEDDING_MODEL}",
-            headers=CF_HEADERS,
-            json={"text": texts},
-            timeout=60.0
+async def embed_batch(texts: List[str], client: Optional[httpx.AsyncClient] = None) -> List[List[float]]:
+    if client is None:
+        async with httpx.AsyncClient() as own_client:
+            return await embed_batch(texts, own_client)
+
+    resp = await client.post(
+        f"{CF_BASE}/ai/run/{EMBEDDING_MODEL}",
+        headers=CF_HEADERS,
+        json={"text": texts},
+        timeout=60.0
+    )
+
+    if resp.status_code != 200:
+        print("❌ Embedding Error:", resp.text)
+        resp.raise_for_status()
+
+    data = resp.json()
+
+    if "result" not in data or "data" not in data["result"]:
+        raise ValueError(f"Embedding failed: {data}")
+
+    embeddings = data["result"]["data"]
+
+    # Validate dimension
+    if embeddings:
+        print("Embedding dimension:", len(embeddings[0]))
+
+    return embeddings
+
+
+# --------------------------------------------------
+# Front-matter
+# --------------------------------------------------
+def split_front_matter(text: str):
+    """
+    Splits a leading '---' block of simple 'key: value' lines from the body.
+    Returns ({}, text) when the document has no front-matter.
+    """
+    lines = text.splitlines(keepends=True)
+    if not lines or lines[0].strip() != FRONT_MATTER_DELIMITER:
+        return {}, text
+
+    meta = {}
+    for i, line in enumerate(lines[1:], start=1):
+        if line.strip() == FRONT_MATTER_DELIMITER:
+            return meta, "".join(lines[i + 1:])
+
+        key, sep, value = line.partition(":")
+        if sep:
+            meta[key.strip().lower()] = value.strip().strip("\"'")
+
+    # Unterminated block: treat the whole file as body
+    return {}, text
+
+
+def read_front_matter(path: str) -> Dict[str, str]:
+    # Only the header is read here; the body is read by the chunking workers
+    with open(path, "r", encoding="utf-8") as f:
+        head = []
+        for line in f:
+            head.append(line)
+            if len(head) > 1 and line.strip() == FRONT_MATTER_DELIMITER:
+                break
+            if len(head) == 1 and line.strip() != FRONT_MATTER_DELIMITER:
+                return {}
+
+    meta, _ = split_front_matter("".join(head))
+    return meta
+
+
+def normalize_category(value: str) -> str:
+    return "-".join(value.strip().lower().replace("_", " ").split())
+
+
+# --------------------------------------------------
+# Chunking (runs in worker processes)
+# --------------------------------------------------
+_splitters: Dict[Tuple[int, int], RecursiveCharacterTextSplitter] = {}
+
+
+def split_doc(doc: Dict, chunk_size: int, chunk_overlap: int) -> Dict:
+    # One splitter per worker process and settings, reused for every document
+    splitter = _splitters.get((chunk_size, chunk_overlap))
+    if splitter is None:
+        splitter = RecursiveCharacterTextSplitter(
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
+            length_function=len,
+            separators=["\n\n", "\n", ". ", " ", ""]
+        )
+        _splitters[(chunk_size, chunk_overlap)] = splitter
+
+    text = doc.get("text")
+    if text is None:
+        with open(doc["path"], "r", encoding="utf-8") as f:
+            text = f.read()
+
+    _, body = split_front_matter(text)
+    chunks = splitter.split_text(body)
+
+    return {**{k: v for k, v in doc.items() if k != "text"}, "chunks": chunks}
+
+
+async def iter_chunked_docs(
+    docs: Iterable[Dict],
+    chunk_size: int,
+    chunk_overlap: int,
+    workers: Optional[int] = None
+):
+    """
+    Fans documents out to a process pool and yields them as soon as each is
+    chunked. At most 2 * workers documents are in flight, so the corpus is
+    never held in memory at once.
+    """
+    loop = asyncio.get_running_loop()
+    workers = workers or os.cpu_count() or 1
+    window = workers * 2
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+
+        for doc in docs:
+            pending.add(loop.run_in_executor(pool, split_doc, doc, chunk_size, chunk_overlap))
+
+            if len(pending) >= window:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for fut in done:
+                    yield fut.result()
+
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for fut in done:
+                yield fut.result()
+
+
+def vector_id_for(source: str, chunk_index: int) -> str:
+    # Stable ids: re-ingesting a changed file overwrites its vectors
+    return hashlib.sha1(f"{source}#{chunk_index}".encode("utf-8")).hexdigest()
+
+
+async def list_legacy_ids(client: httpx.AsyncClient) -> List[str]:
+    """
+    Pages through every id in the index and returns the legacy random ones.
+    Upserts never overwrite those, so without this they would keep answering
+    unfiltered queries with outdated text.
+    """
+    url = f"{CF_BASE}/vectorize/v2/indexes/{VECTORIZE_INDEX}/list"
+    legacy: List[str] = []
+    cursor = None
+
+    while True:
+        params = {"count": LIST_PAGE_SIZE}
+        if cursor:
+            params["cursor"] = cursor
+
+        resp = await client.get(url, headers=CF_HEADERS, params=params, timeout=90.0)
+        resp.raise_for_status()
+        result = resp.json()["result"]
+
+        legacy.extend(
+            vector["id"] for vector in result.get("vectors", [])
+            if LEGACY_ID_RE.match(vector["id"])
         )
 
-        if resp.status_code != 200:
-            print("❌ Embedding Error:", resp.text)
-            resp.raise_for_status()
+        cursor = result.get("nextCursor")
+        if not result.get("isTruncated") or not cursor:
+            return legacy
+
+
+def chunk_hash(text: str, metadata: Dict) -> str:
+    # A journaled vector is only reused for the same text, metadata and model
+    payload = json.dumps([EMBEDDING_MODEL, text, metadata], sort_keys=True)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
 
-        data = resp.json()
 
-        if "result" not in data or "data" not in data["result"]:
-            raise ValueError(f"Embedding failed: {data}")
+# --------------------------------------------------
+# Checkpoint Journal
+# --------------------------------------------------
+class IngestJournal:
+    """
+    SQLite checkpoint of an ingestion run. Each chunk is stored with its
+    vector as soon as its embedding batch returns, and flagged once the
+    upsert batch it was in is acknowledged. A rerun after a failure upserts
+    stored vectors without embedding them again and skips acknowledged ones.
+    Cleared when a run completes.
+    """
+
+    def __init__(self, folder: str):
+        self.path = os.path.join(folder, JOURNAL_FILENAME)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS chunks (
+                vector_id TEXT PRIMARY KEY,
+                content_hash TEXT NOT NULL,
+                vector TEXT NOT NULL,
+                upserted INTEGER NOT NULL DEFAULT 0
+            )
+            """
+        )
+        self.conn.commit()
+
+    def lookup(self, vector_id: str, content_hash: str) -> Optional[Tuple[Dict, bool]]:
+        row = self.conn.execute(
+            "SELECT vector, upserted FROM chunks WHERE vector_id = ? AND content_hash = ?",
+            (vector_id, content_hash)
+        ).fetchone()
+
+        if row is None:
+            return None
+        return json.loads(row[0]), bool(row[1])
+
+    def record_embedded(self, entries: List[Tuple[Dict, str]]):
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO chunks (vector_id, content_hash, vector, upserted) VALUES (?, ?, ?, 0)",
+            [(vector["id"], content_hash, json.dumps(vector)) for vector, content_hash in entries]
+        )
+        self.conn.commit()
 
-        embeddings = data["result"]["data"]
+    def record_upserted(self, vector_ids: List[str]):
+        self.conn.executemany(
+            "UPDATE chunks SET upserted = 1 WHERE vector_id = ?",
+            [(vector_id,) for vector_id in vector_ids]
+        )
+        self.conn.commit()
 
-        # Validate dimension
-        if embeddings:
-            print("Embedding dimension:", len(embeddings[0]))
+    def clear(self):
+        self.conn.execute("DELETE FROM chunks")
+        self.conn.commit()
 
-        return embeddings
+    def close(self):
+        self.conn.close()
+
+
+# --------------------------------------------------
+# Adaptive Batch Sizing
+# --------------------------------------------------
+class AdaptiveBatchSize:
+    """
+    AIMD batch size: grows by step after every accepted batch, halves on
+    413 (payload too large) or 429 (rate limited).
+    """
+
+    def __init__(self, initial: int, maximum: int, minimum: int = 1, step: int = 4):
+        self.minimum = minimum
+        self.maximum = max(minimum, maximum)
+        self.size = max(minimum, min(initial, self.maximum))
+        self.step = step
+        self.failures = 0
+
+    def on_success(self):
+        self.size = min(self.maximum, self.size + self.step)
+        self.failures = 0
+
+    def on_limited(self, status_code: int, sent: int) -> bool:
+        """Shrinks for the retry; False when retrying can't help."""
+        self.failures += 1
+        if self.failures > INGEST_MAX_RETRIES:
+            return False
+        if status_code == 413 and sent <= self.minimum:
+            return False
+
+        self.size = max(self.minimum, min(self.size, sent) // 2)
+        return True
+
+    def backoff(self, response: httpx.Response) -> float:
+        retry_after = response.headers.get("Retry-After")
+        if retry_after and retry_after.isdigit():
+            return float(retry_after)
+        return min(60.0, 0.5 * 2 ** self.failures)
+
+
+async def send_in_batches(
+    items: List,
+    sizer: AdaptiveBatchSize,
+    send: Callable[[List], Awaitable[None]],
+    label: str
+):
+    """Sends items in sizer-sized batches, retrying smaller after 413/429."""
+    while items:
+        batch = items[:sizer.size]
+
+        try:
+            await send(batch)
+        except httpx.HTTPStatusError as e:
+            status_code = e.response.status_code
+            if status_code not in (413, 429) or not sizer.on_limited(status_code, len(batch)):
+                raise
+
+            delay = sizer.backoff(e.response)
+            print(f"↻ {label}: HTTP {status_code}, retrying with batch size {sizer.size} in {delay:.1f}s")
+            await asyncio.sleep(delay)
+            continue
+
+        sizer.on_success()
+        del items[:len(batch)]
 
 
 # --------------------------------------------------
 # Ingestion Function
 # --------------------------------------------------
 async def ingest_docs(
-    docs: List[Dict],
+    docs: Iterable[Dict],
     chunk_size: int = 500,
     chunk_overlap: int = 100,
-    batch_size: int = 40
+    batch_size: int = 40,
+    workers: Optional[int] = None,
+    manifest: Optional["Manifest"] = None,
+    journal: Optional[IngestJournal] = None
 ):
-    splitter = RecursiveCharacterTextSplitter(
-        chunk_size=chunk_size,
-        chunk_overlap=chunk_overlap,
-        length_function=len,
-        separators=["\n\n", "\n", ". ", " ", ""]
-    )
+    """
+    batch_size is the starting size for embedding and upsert batches; both
+    then adapt to what the upstream accepts.
+    """
+    check_credentials()
 
-    all_vectors = []
+    pending_chunks = []   # (text, metadata) waiting for embedding
+    pending_vectors = []  # embedded vectors waiting for upsert
+    total_vectors = 0
+    upsert_batches = 0
+    resumed = 0
 
-    for doc in docs:
-        source = doc.get("source", "unknown")
-        category = doc.get("category", "")
-        title = doc.get("title", source)
+    embed_sizer = AdaptiveBatchSize(batch_size, EMBED_BATCH_MAX)
+    upsert_sizer = AdaptiveBatchSize(batch_size, UPSERT_BATCH_MAX)
+    delete_sizer = AdaptiveBatchSize(batch_size, UPSERT_BATCH_MAX)
 
-        chunks = splitter.split_text(doc["text"])
-        print(f"→ {source}: split into {len(chunks)} chunks")
+    # Vectors of chunks that no longer exist: tails of shrunk files, removed files
+    stale_ids: List[str] = []
 
-        # Embed chunks in batches
-        for i in range(0, len(chunks), batch_size):
-            batch_texts = chunks[i:i + batch_size]
-            embeddings = await embed_batch(batch_texts)
+    url = f"{CF_BASE}/vectorize/v2/indexes/{VECTORIZE_INDEX}/upsert"
+    delete_url = f"{CF_BASE}/vectorize/v2/indexes/{VECTORIZE_INDEX}/delete_by_ids"
 
-            for j, emb in enumerate(embeddings):
-                chunk_text = batch_texts[j]
+    async with httpx.AsyncClient() as client:
+
+        async def embed_and_collect(batch):
+            embeddings = await embed_batch([text for text, _ in batch], client)
 
+            embedded = []
+            for (chunk_text, metadata), emb in zip(batch, embeddings):
                 if not isinstance(emb, list):
                     raise ValueError("Embedding is not a list of floats")
 
-                vector_id = f"{source}-{uuid.uuid4().hex[:8]}"
-
-                all_vectors.append({
-                    "id": vector_id,
+                embedded.append(({
+                    "id": vector_id_for(metadata["source"], metadata["chunk_index"]),
                     "values": emb,
-                    "metadata": {
-                        "text": chunk_text,
-                        "source": source,
-                        "title": title,
-                        "category": category,
-                        "chunk_index": i + j,
-                    }
-                })
-
-    print(f"\nTotal vectors prepared: {len(all_vectors)}")
-
-    # --------------------------------------------------
-    # Upsert into Cloudflare Vectorize
-    # --------------------------------------------------
-    async with httpx.AsyncClient() as client:
-        for k in range(0, len(all_vectors), batch_size):
-            batch = all_vectors[k:k + batch_size]
+                    # One namespace per category, so chat queries can search
+                    # just the slice of the index a question belongs to
+                    "namespace": metadata["category"],
+                    "metadata": {"text": chunk_text, **metadata}
+                }, chunk_hash(chunk_text, metadata)))
 
-            payload = {
-                "vectors": batch   # 🔥 THIS WAS YOUR ISSUE
-            }
+            if journal is not None:
+                journal.record_embedded(embedded)
+
+            pending_vectors.extend(vector for vector, _ in embedded)
 
-            url = f"{CF_BASE}/vectorize/v2/indexes/{VECTORIZE_INDEX}/upsert"
+        async def flush_embeddings():
+            nonlocal pending_chunks
+            batch, pending_chunks = pending_chunks, []
+            await send_in_batches(batch, embed_sizer, embed_and_collect, "embed")
+
+        # --------------------------------------------------
+        # Upsert into Cloudflare Vectorize
+        # --------------------------------------------------
+        async def upsert(batch):
+            nonlocal total_vectors, upsert_batches
 
             resp = await client.post(
                 url,
                 headers=CF_HEADERS,
-                json=payload,
+                json={"vectors": batch},
                 timeout=90.0
             )
 
@@ -137,39 +444,210 @@ async def ingest_docs(
                 print("❌ Upsert Error:", resp.text)
                 resp.raise_for_status()
 
-            result = resp.json()
-            print(f"✅ Upserted batch {k // batch_size + 1}: {result}")
+            if journal is not None:
+                journal.record_upserted([vector["id"] for vector in batch])
+
+            upsert_batches += 1
+            total_vectors += len(batch)
+            print(f"✅ Upserted batch {upsert_batches} ({len(batch)} vectors): {resp.json()}")
+
+        async def flush_vectors():
+            nonlocal pending_vectors
+            batch, pending_vectors = pending_vectors, []
+            await send_in_batches(batch, upsert_sizer, upsert, "upsert")
+
+        async def delete_ids(batch):
+            resp = await client.post(
+                delete_url,
+                headers=CF_HEADERS,
+                json={"ids": batch},
+                timeout=90.0
+            )
+
+            if resp.status_code != 200:
+                print("❌ Delete Error:", resp.text)
+                resp.raise_for_status()
+
+            print(f"🗑 Deleted {len(batch)} stale vectors")
+
+        async for doc in iter_chunked_docs(docs, chunk_size, chunk_overlap, workers):
+            source = doc.get("source", "unknown")
+            chunks = doc["chunks"]
+            print(f"→ {source}: split into {len(chunks)} chunks")
+
+            for i, chunk_text in enumerate(chunks):
+                metadata = {
+                    "source": source,
+                    "title": doc.get("title", source),
+                    "category": doc.get("category") or DEFAULT_CATEGORY,
+                    "chunk_index": i,
+                }
+
+                checkpoint = None
+                if journal is not None:
+                    checkpoint = journal.lookup(
+                        vector_id_for(source, i), chunk_hash(chunk_text, metadata)
+                    )
+
+                if checkpoint is None:
+                    pending_chunks.append((chunk_text, metadata))
+                else:
+                    # Embedded (and maybe upserted) by an earlier, interrupted run
+                    vector, upserted = checkpoint
+                    resumed += 1
+                    if not upserted:
+                        pending_vectors.append(vector)
+
+                if len(pending_chunks) >= embed_sizer.size:
+                    await flush_embeddings()
+
+                if len(pending_vectors) >= upsert_sizer.size:
+                    await flush_vectors()
+
+            if manifest is not None and "mtime" in doc:
+                previous = manifest.chunk_count(source)
+                stale_ids.extend(vector_id_for(source, i) for i in range(len(chunks), previous))
+                manifest.mark(doc)
+
+        if pending_chunks:
+            await flush_embeddings()
+
+        while pending_vectors:
+            await flush_vectors()
 
-    print(f"\n🎉 Total vectors ingested successfully: {len(all_vectors)}")
+        # Only known once the folder walk is finished
+        if manifest is not None:
+            for source in manifest.missing_sources():
+                print(f"✗ {source}: removed, deleting its vectors")
+                stale_ids.extend(vector_id_for(source, i) for i in range(manifest.chunk_count(source)))
+                manifest.remove(source)
+
+        try:
+            legacy_ids = await list_legacy_ids(client)
+        except httpx.HTTPError as e:
+            # Cleanup only; the new vectors are in place either way
+            print("⚠ Could not list vectors to remove legacy ids:", e)
+            legacy_ids = []
+
+        if legacy_ids:
+            print(f"✗ {len(legacy_ids)} vectors with pre-namespace ids, deleting")
+            stale_ids.extend(legacy_ids)
+
+        if stale_ids:
+            await send_in_batches(stale_ids, delete_sizer, delete_ids, "delete")
+
+    if manifest is not None:
+        manifest.save()
+
+    # Everything is in the manifest now; the next run starts a fresh journal
+    if journal is not None:
+        journal.clear()
+
+    if resumed:
+        print(f"↷ Resumed {resumed} chunks from the checkpoint journal")
+
+    print(f"\n🎉 Total vectors ingested successfully: {total_vectors}")
 
 
 # --------------------------------------------------
 # Load Markdown Docs
 # --------------------------------------------------
-def load_docs_from_folder(folder="docs"):
-    docs = []
-
+class Manifest:
+    def __init__(self, folder: str):
+        self.path = os.path.join(folder, MANIFEST_FILENAME)
+        self.entries: Dict[str, Dict] = {}
+
+        if os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.entries = json.load(f)
+
+        self.updated: Dict[str, Dict] = {}
+        self.seen: set = set()
+        self.removed: set = set()
+
+    def is_unchanged(self, source: str, stat: os.stat_result) -> bool:
+        self.seen.add(source)
+        entry = self.entries.get(source)
+        return bool(entry) and entry["mtime"] == stat.st_mtime and entry["size"] == stat.st_size
+
+    def chunk_count(self, source: str) -> int:
+        # 0 for new sources and for entries written before counts were recorded
+        return self.entries.get(source, {}).get("chunks", 0)
+
+    def missing_sources(self) -> List[str]:
+        """Previously ingested sources the last folder walk did not find."""
+        return sorted(set(self.entries) - self.seen)
+
+    def mark(self, doc: Dict):
+        self.updated[doc["source"]] = {
+            "mtime": doc["mtime"],
+            "size": doc["size"],
+            "chunks": len(doc["chunks"]),
+        }
+
+    def remove(self, source: str):
+        self.removed.add(source)
+
+    def save(self):
+        # Only written after every vector was upserted and stale ones deleted
+        entries = {**self.entries, **self.updated}
+        for source in self.removed:
+            entries.pop(source, None)
+
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(entries, f, indent=2, sort_keys=True)
+
+
+def load_docs_from_folder(folder="docs", manifest: Optional[Manifest] = None) -> Iterator[Dict]:
+    """
+    Walks folder recursively and lazily yields one document descriptor per
+    markdown file. Text is read later by the chunking workers.
+
+    Category comes from a 'category:' front-matter key, else the top-level
+    subfolder the file sits in (docs/billing/refunds.md -> billing), else
+    DEFAULT_CATEGORY.
+    """
     if not os.path.exists(folder):
         raise ValueError(f"Folder '{folder}' does not exist")
 
-    for filename in os.listdir(folder):
-        if filename.endswith(".md"):
-            path = os.path.join(folder, filename)
+    for root, dirs, files in os.walk(folder):
+        dirs.sort()
+
+        for filename in sorted(files):
+            if not filename.endswith(".md"):
+                continue
 
-            with open(path, "r", encoding="utf-8") as f:
-                docs.append({
-                    "text": f.read(),
-                    "source": filename,
-                    "title": filename.replace(".md", "").replace("-", " ").title(),
-                    "category": "general"
-                })
+            path = os.path.join(root, filename)
+            source = os.path.relpath(path, folder).replace(os.sep, "/")
+            stat = os.stat(path)
 
-    return docs
+            if manifest is not None and manifest.is_unchanged(source, stat):
+                print(f"↷ {source}: unchanged, skipping")
+                continue
+
+            front_matter = read_front_matter(path)
+            folder_category = source.split("/", 1)[0] if "/" in source else None
+            category = front_matter.get("category") or folder_category or DEFAULT_CATEGORY
+
+            yield {
+                "path": path,
+                "source": source,
+                "title": front_matter.get("title") or filename.replace(".md", "").replace("-", " ").title(),
+                "category": normalize_category(category),
+                "mtime": stat.st_mtime,
+                "size": stat.st_size,
+            }
 
 
 # --------------------------------------------------
 # Main
 # --------------------------------------------------
 if __name__ == "__main__":
-    documents = load_docs_from_folder()
-    asyncio.run(ingest_docs(documents))
+    folder = "docs"
+    manifest = Manifest(folder)
+    journal = IngestJournal(folder)
+    documents = load_docs_from_folder(folder, manifest)
+    try:
+        asyncio.run(ingest_docs(documents, manifest=manifest, journal=journal))
+    finally:
+        journal.close()
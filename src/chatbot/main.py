@@ -1,34 +1,104 @@
 from fastapi import FastAPI,Depends,Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from dotenv import load_dotenv
+from fastapi.responses import JSONResponse
+from brotli_asgi import BrotliMiddleware
+from contextlib import asynccontextmanager
 
 import uvicorn
+import asyncio
 import logging
 import time
-import os
+from sqlalchemy import text
 from sqlalchemy.orm import Session
 
-from .routes.bookings_route import booking_router
-from .routes.chatbot_route import chatbot_router
-from .config.db import engine,get_db
+from .config.env import get_env, get_bool_env
+from .routes.bookings_route import (
+    booking_router,
+    warm_availability,
+    refresh_bookings_cache,
+    invalidate_bookings_cache,
+    BOOKINGS_CACHE_KEY
+)
+from .routes.chatbot_route import chatbot_router, embedding_batcher, warm_faq_embeddings
+from .routes.bulk_bookings_route import bulk_booking_router
+from .routes.health_route import health_router, metrics_router, warm_pools
+from .config.db import get_db,get_engine,dispose_engine,SessionLocal
+from .config.redis import RedisClient
+from .config.cloudflare import CloudflareClient
+from .utils.availability_index import run_reconcile_loop, RECONCILE_INTERVAL
+from .utils.booking_partitions import run_partition_loop
+from .utils.cache_warmer import cache_warmer
+from .utils.invalidation_bus import invalidation_bus
+from .utils.reminder_scheduler import run_reminder_loop, REMINDERS_ENABLED
+from .utils.email_utils import smtp_pool
+from .utils.transcript_writer import transcript_writer
+from .utils.request_profiler import ProfilingMiddleware
+from .migrations import run_migrations
 from . import models
-from src.chatbot.config.base import Base
 from .config.logging import setup_logging
 
 
-load_dotenv()
 setup_logging()
 
 logger = logging.getLogger(__name__)
 
+# Schema is owned by migrations (python -m src.chatbot.migrations); set this
+# for local dev to apply pending migrations on boot instead.
+RUN_MIGRATIONS_ON_STARTUP = get_bool_env("RUN_MIGRATIONS_ON_STARTUP", False)
+
+# Responses smaller than this are sent uncompressed
+COMPRESSION_MIN_SIZE = int(get_env("COMPRESSION_MIN_SIZE", 1024))
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if RUN_MIGRATIONS_ON_STARTUP:
+        await run_in_threadpool(run_migrations, get_engine())
+
+    # Pools, availability index and FAQ embeddings are ready before the first request
+    cache_warmer.add_warmup("pools", warm_pools)
+    cache_warmer.add_warmup("availability", warm_availability)
+    cache_warmer.add_warmup("faq_embeddings", warm_faq_embeddings)
+    cache_warmer.add_warmup("bookings", refresh_bookings_cache)
+    cache_warmer.add_hot_key(BOOKINGS_CACHE_KEY, refresh_bookings_cache)
+    await cache_warmer.warm()
+
+    # Keeps reconciling the availability index with the DB
+    background_tasks = [
+        asyncio.create_task(run_reconcile_loop(initial_delay=RECONCILE_INTERVAL)),
+        asyncio.create_task(cache_warmer.run_refresh_loop()),
+        # Evicts this worker's local caches when another worker writes
+        asyncio.create_task(invalidation_bus.run()),
+        # Creates upcoming monthly booking partitions and archives old ones
+        asyncio.create_task(run_partition_loop(get_engine(), on_archive=invalidate_bookings_cache))
+    ]
+
+    if REMINDERS_ENABLED:
+        background_tasks.append(asyncio.create_task(run_reminder_loop(SessionLocal)))
+
+    yield
+
+    for task in background_tasks:
+        task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+
+    await embedding_batcher.close()
+    await transcript_writer.close()
+    await CloudflareClient.close()
+    await RedisClient.close()
+    await run_in_threadpool(smtp_pool.close)
+    dispose_engine()
+
 
 app = FastAPI(
      title="OneTracker",
     description="This is the backend of OneTracker and intigrating the chatbot .",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
-origins = os.getenv("CORS_ORIGIN")
+origins = get_env("CORS_ORIGIN")
 
 app.add_middleware(
     CORSMiddleware,
@@ -36,8 +106,15 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],            # allow all HTTP methods
     allow_headers=["*"],            # allow all headers
+    expose_headers=["ETag"],        # dashboards revalidate with If-None-Match
 )
 
+# Profiles requests sent with X-Profile: 1 plus the admin key, or a PROFILE_SAMPLE_RATE sample
+app.add_middleware(ProfilingMiddleware)
+
+# Brotli for clients that accept it, gzip for the rest
+app.add_middleware(BrotliMiddleware, minimum_size=COMPRESSION_MIN_SIZE, gzip_fallback=True)
+
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
     start_time = time.time()
@@ -57,25 +134,27 @@ async def log_requests(request: Request, call_next):
 
 @app.get("/")
 def health_check(db:Session = Depends(get_db)):
-     if not db:
-           return {
+     # A session object alone proves nothing; the database has to answer
+     try:
+          db.execute(text("SELECT 1"))
+     except Exception:
+          logger.warning("Health check: database unreachable", exc_info=True)
+          return JSONResponse(status_code=503, content={
           "status":False,
           "message":"Database connect nehi hua hai....."
-     }
+     })
      return {
           "status":True,
           "message":"Server alive",
      }
      
+app.include_router(health_router,tags = ["Health"])
+app.include_router(metrics_router,tags = ["Health"])
+app.include_router(bulk_booking_router,prefix ="/api/v1/booking/bulk",tags = ["Bookings"])
 app.include_router(booking_router,prefix ="/api/v1/booking",tags = ["Bookings"])
 app.include_router(chatbot_router,prefix ="/api/v1/chatbot",tags = ["ChatBot"])
 
 
-@app.on_event("startup")
-def on_startup():
-    Base.metadata.create_all(bind=engine)
-    logger.info(f"Tables created: {list(Base.metadata.tables.keys())}")
-
 def start():
     try:
          uvicorn.run("src.chatbot.main:app",host = "127.0.0.1", port =8000,reload = True)
@@ -0,0 +1,12 @@
+# Apply pending schema migrations:
+#
+#   python -m src.chatbot.migrations
+
+from ..config.db import get_engine
+from ..config.logging import setup_logging
+from .runner import run_migrations
+
+
+if __name__ == "__main__":
+    setup_logging()
+    run_migrations(get_engine())
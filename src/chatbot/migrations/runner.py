@@ -0,0 +1,65 @@
+import logging
+from pathlib import Path
+from typing import List
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+
+logger = logging.getLogger(__name__)
+
+VERSIONS_DIR = Path(__file__).parent / "versions"
+
+# Arbitrary constant; serializes migration runs across containers
+MIGRATION_LOCK_ID = 7_202_601
+
+
+def list_migrations() -> List[Path]:
+    return sorted(VERSIONS_DIR.glob("*.sql"))
+
+
+def run_migrations(engine: Engine) -> List[str]:
+    """Apply every versions/*.sql file not yet recorded in schema_migrations."""
+    applied_now = []
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT pg_advisory_lock(:id)"), {"id": MIGRATION_LOCK_ID})
+
+        try:
+            conn.execute(text(
+                """
+                CREATE TABLE IF NOT EXISTS schema_migrations (
+                    version VARCHAR PRIMARY KEY,
+                    applied_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()
+                )
+                """
+            ))
+            conn.commit()
+
+            applied = set(conn.execute(
+                text("SELECT version FROM schema_migrations")
+            ).scalars().all())
+
+            for path in list_migrations():
+                version = path.stem
+                if version in applied:
+                    continue
+
+                logger.info(f"Applying migration {version}")
+
+                # Each file runs in its own transaction with its version row
+                conn.exec_driver_sql(path.read_text(encoding="utf-8"))
+                conn.execute(
+                    text("INSERT INTO schema_migrations (version) VALUES (:version)"),
+                    {"version": version}
+                )
+                conn.commit()
+
+                applied_now.append(version)
+
+        finally:
+            conn.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": MIGRATION_LOCK_ID})
+            conn.commit()
+
+    logger.info(f"Migrations up to date | applied={applied_now}")
+    return applied_now
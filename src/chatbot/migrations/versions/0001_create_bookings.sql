@@ -0,0 +1,16 @@
+-- Initial schema, matching what Base.metadata.create_all used to build.
+-- IF NOT EXISTS keeps it safe on databases created before migrations existed.
+
+CREATE TABLE IF NOT EXISTS bookings (
+    id UUID NOT NULL PRIMARY KEY,
+    name VARCHAR NOT NULL,
+    business_name VARCHAR NOT NULL,
+    work_email VARCHAR NOT NULL,
+    contact_number VARCHAR NOT NULL,
+    booking_datetime TIMESTAMP WITH TIME ZONE NOT NULL,
+    message TEXT,
+    timezone VARCHAR NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS ix_bookings_id ON bookings (id);
+CREATE INDEX IF NOT EXISTS ix_bookings_booking_datetime ON bookings (booking_datetime);
@@ -0,0 +1,22 @@
+-- Indexes backing GET /api/v1/booking/search
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- Exact, case-insensitive email lookups
+CREATE INDEX IF NOT EXISTS ix_bookings_work_email_lower
+    ON bookings (lower(work_email));
+
+-- Prefix search on business name (text_pattern_ops supports LIKE 'abc%')
+CREATE INDEX IF NOT EXISTS ix_bookings_business_name_lower_prefix
+    ON bookings (lower(business_name) text_pattern_ops);
+
+-- Fuzzy / substring search on business name
+CREATE INDEX IF NOT EXISTS ix_bookings_business_name_trgm
+    ON bookings USING gin (lower(business_name) gin_trgm_ops);
+
+-- Keyset pagination order and timezone filter
+CREATE INDEX IF NOT EXISTS ix_bookings_booking_datetime_id
+    ON bookings (booking_datetime DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS ix_bookings_timezone_booking_datetime
+    ON bookings (timezone, booking_datetime DESC);
@@ -0,0 +1,9 @@
+-- One row per reminder sent. The primary key is the dedupe guard: a reminder
+-- is claimed by inserting its row before the email goes out.
+
+CREATE TABLE IF NOT EXISTS booking_reminders (
+    booking_id UUID NOT NULL,
+    kind VARCHAR NOT NULL,
+    sent_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now(),
+    PRIMARY KEY (booking_id, kind)
+);
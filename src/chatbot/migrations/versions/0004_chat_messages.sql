@@ -0,0 +1,17 @@
+-- Chat transcripts, written behind the request path in batches by
+-- utils/transcript_writer.py. created_at is the time the message was
+-- received, not the time the batch was flushed.
+
+CREATE TABLE IF NOT EXISTS chat_messages (
+    id BIGSERIAL PRIMARY KEY,
+    session_id VARCHAR NOT NULL,
+    role VARCHAR NOT NULL,
+    content TEXT NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS ix_chat_messages_session_created
+    ON chat_messages (session_id, created_at);
+
+CREATE INDEX IF NOT EXISTS ix_chat_messages_created_at
+    ON chat_messages (created_at);
@@ -0,0 +1,81 @@
+-- Monthly range partitions on booking_datetime (UTC months).
+--
+-- Every unique constraint on a partitioned table must include the partition
+-- key, so the primary key becomes (id, booking_datetime). Future months are
+-- added ahead of time and old months are detached into bookings_archive by
+-- utils/booking_partitions.py. Rows outside every monthly range land in
+-- bookings_default until their month's partition is created.
+
+CREATE SCHEMA IF NOT EXISTS bookings_archive;
+
+ALTER TABLE bookings RENAME TO bookings_unpartitioned;
+
+CREATE TABLE bookings (
+    id UUID NOT NULL,
+    name VARCHAR NOT NULL,
+    business_name VARCHAR NOT NULL,
+    work_email VARCHAR NOT NULL,
+    contact_number VARCHAR NOT NULL,
+    booking_datetime TIMESTAMP WITH TIME ZONE NOT NULL,
+    message TEXT,
+    timezone VARCHAR NOT NULL
+) PARTITION BY RANGE (booking_datetime);
+
+CREATE TABLE bookings_default PARTITION OF bookings DEFAULT;
+
+-- One partition per month from the oldest existing booking through four
+-- months ahead, which covers the booking calendar's horizon
+DO $$
+DECLARE
+    month_start TIMESTAMP;
+    last_month TIMESTAMP := date_trunc('month', now() AT TIME ZONE 'UTC') + interval '4 months';
+BEGIN
+    SELECT date_trunc('month', min(booking_datetime) AT TIME ZONE 'UTC')
+      INTO month_start
+      FROM bookings_unpartitioned;
+
+    month_start := least(
+        coalesce(month_start, date_trunc('month', now() AT TIME ZONE 'UTC')),
+        date_trunc('month', now() AT TIME ZONE 'UTC')
+    );
+
+    WHILE month_start <= last_month LOOP
+        EXECUTE 'CREATE TABLE ' || quote_ident('bookings_p' || to_char(month_start, 'YYYYMM'))
+            || ' PARTITION OF bookings FOR VALUES FROM ('
+            || quote_literal(to_char(month_start, 'YYYY-MM-DD') || ' 00:00:00+00')
+            || ') TO ('
+            || quote_literal(to_char(month_start + interval '1 month', 'YYYY-MM-DD') || ' 00:00:00+00')
+            || ')';
+        month_start := month_start + interval '1 month';
+    END LOOP;
+END
+$$;
+
+INSERT INTO bookings (
+    id, name, business_name, work_email, contact_number, booking_datetime, message, timezone
+)
+SELECT id, name, business_name, work_email, contact_number, booking_datetime, message, timezone
+FROM bookings_unpartitioned;
+
+-- Drops the old indexes too, freeing their names for the partitioned ones
+DROP TABLE bookings_unpartitioned;
+
+ALTER TABLE bookings ADD PRIMARY KEY (id, booking_datetime);
+
+CREATE INDEX ix_bookings_id ON bookings (id);
+CREATE INDEX ix_bookings_booking_datetime ON bookings (booking_datetime);
+
+CREATE INDEX ix_bookings_work_email_lower
+    ON bookings (lower(work_email));
+
+CREATE INDEX ix_bookings_business_name_lower_prefix
+    ON bookings (lower(business_name) text_pattern_ops);
+
+CREATE INDEX ix_bookings_business_name_trgm
+    ON bookings USING gin (lower(business_name) gin_trgm_ops);
+
+CREATE INDEX ix_bookings_booking_datetime_id
+    ON bookings (booking_datetime DESC, id DESC);
+
+CREATE INDEX ix_bookings_timezone_booking_datetime
+    ON bookings (timezone, booking_datetime DESC);
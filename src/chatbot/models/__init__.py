@@ -1,3 +1,5 @@
 from .booking import Bookings
+from .booking_reminder import BookingReminders
+from .chat_message import ChatMessages
 
-__all__ = ["Bookings"]
\ No newline at end of file
+__all__ = ["Bookings", "BookingReminders", "ChatMessages"]
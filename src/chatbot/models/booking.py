@@ -3,7 +3,13 @@ from ..config.base import Base
 
 class Bookings(Base):
     __tablename__ = "bookings"
+    # Monthly range partitions, managed by migrations and utils/booking_partitions.py
+    __table_args__ = {"postgresql_partition_by": "RANGE (booking_datetime)"}
 
+    # The table's primary key is (id, booking_datetime), as partitioning requires,
+    # so Postgres does not enforce id alone as unique. The ORM still treats id as
+    # the identity (db.get(Bookings, id)); that relies on every id being a fresh
+    # server-side uuid4 from get_uuid(), in the booking and bulk import paths alike
     id = Column(UUID, primary_key=True, index=True)
     name = Column(String, nullable=False)
     business_name = Column(String, nullable=False)
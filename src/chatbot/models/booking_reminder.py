@@ -0,0 +1,11 @@
+from sqlalchemy import Column, String, DateTime, UUID, func
+from ..config.base import Base
+
+class BookingReminders(Base):
+    __tablename__ = "booking_reminders"
+
+    # No FK to bookings: the pair is only a dedupe record for sent reminders
+    booking_id = Column(UUID, primary_key=True)
+    kind = Column(String, primary_key=True)
+
+    sent_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, BigInteger, String, DateTime, Text, func
+from ..config.base import Base
+
+class ChatMessages(Base):
+    __tablename__ = "chat_messages"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    session_id = Column(String, nullable=False)
+
+    # "user" or "assistant"
+    role = Column(String, nullable=False)
+    content = Column(Text, nullable=False)
+
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
@@ -1,75 +1,214 @@
 import logging
-from datetime import datetime, timezone, timedelta
-from fastapi import APIRouter, HTTPException, Depends, Query
-from fastapi.encoders import jsonable_encoder
+from datetime import date, datetime, timezone, timedelta
+from typing import Awaitable, List, Optional, Tuple
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Depends, Header, Query, Response
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from sqlalchemy import select, func
+from sqlalchemy import select, func, tuple_, or_
 
-from ..config.db import get_db
+from ..config.db import get_db, get_read_db, mark_recent_write, SessionLocal
+from ..config.env import get_env
+from ..config.redis import RedisClient
 from ..utils.cache_utils import CacheUtils
 from ..utils.security_utils import verify_api_key
 from ..utils.uuid_generator import get_uuid
-from ..utils.api_response import ApiResponse
+from ..utils.api_response import ApiResponse, ApiEnvelope, ORJSONResponse
 from ..utils.email_utils import send_booking_email
+from ..utils.availability_index import AvailabilityIndex, AVAILABILITY_TOPIC
+from ..utils.invalidation_bus import LocalCache, invalidation_bus
+from ..utils.calendar_engine import BookingCalendar
+from ..utils.idempotency import run_idempotent, fingerprint
+from ..utils.http_cache import make_etag, etag_matches, etag_headers, not_modified
+from ..utils.timezone_utils import is_valid_timezone, render_availability
+from ..utils.pagination_utils import encode_cursor, decode_cursor, escape_like
 from src.chatbot.models.booking import Bookings
 from ..validations.booking_validations import CreateBooking
+from ..validations.booking_responses import (
+    BookingResponse,
+    PaginatedBookingsResponse,
+    BookingSearchResponse,
+    AvailabilityResponse
+)
 
 
 logger = logging.getLogger(__name__)
 
 booking_router = APIRouter(
-    dependencies=[Depends(verify_api_key)]
+    dependencies=[Depends(verify_api_key)],
+    default_response_class=ORJSONResponse
 )
 
-AVAILABLE_HOURS = [2, 3, 4, 5]
+BOOKINGS_CACHE_KEY = "bookings"
+BOOKINGS_CACHE_TTL = 300
+# Bumped on every bookings write; the list endpoint's ETag is derived from it
+BOOKINGS_VERSION_KEY = "bookings:version"
+BOOKINGS_TOPIC = "bookings"
+
+# Per-worker copies in front of Redis, evicted through the invalidation bus
+bookings_local_cache = LocalCache(BOOKINGS_TOPIC)
+availability_local_cache = LocalCache(AVAILABILITY_TOPIC)
+
+# Timezones whose rendered availability is prepared at startup
+WARM_TIMEZONES = [
+    tz.strip() for tz in get_env("WARM_TIMEZONES", "UTC,Asia/Kolkata").split(",") if tz.strip()
+]
+
+# Only the columns the API returns, fetched as plain rows (no ORM identity map)
+BOOKING_COLUMNS = (
+    Bookings.id,
+    Bookings.name,
+    Bookings.business_name,
+    Bookings.work_email,
+    Bookings.contact_number,
+    Bookings.booking_datetime,
+    Bookings.message,
+    Bookings.timezone,
+)
 
 
 def get_utc_now():
     return datetime.now(timezone.utc)
 
 
-@booking_router.get("/")
-async def get_all_bookings(db: Session = Depends(get_db)):
+def booking_to_dict(booking: Bookings) -> dict:
+    return BookingResponse.model_validate(booking).model_dump()
+
+
+def render_bookings_body(db: Session) -> str:
+    rows = db.execute(
+        select(*BOOKING_COLUMNS)
+        .order_by(Bookings.booking_datetime.desc())
+    ).mappings().all()
+
+    response = ApiResponse().json_response(
+        message="Bookings fetched successfully",
+        data=[dict(row) for row in rows]
+    )
+
+    return response.body.decode()
+
+
+def _render_bookings_fresh() -> str:
+    # Primary, not replica: this often runs right after a write cleared the key
+    db = SessionLocal()
+    try:
+        return render_bookings_body(db)
+    finally:
+        db.close()
+
+
+async def invalidate_bookings_cache():
+    """Drops the shared Redis copy and every worker's local copy."""
+    client = await RedisClient.get_client()
+
+    # Delete before bumping: a reader that sees the new version never gets the old body
+    async with client.pipeline(transaction=True) as pipe:
+        pipe.delete(BOOKINGS_CACHE_KEY)
+        pipe.incr(BOOKINGS_VERSION_KEY)
+        _, version = await pipe.execute()
+
+    await invalidation_bus.publish(BOOKINGS_TOPIC, version)
+
+
+async def sync_caches_after_write(index_update: Awaitable[None]):
+    """
+    Brings the availability index and bookings caches in line with a write
+    that is already committed. Redis failures are logged, not raised: the
+    booking exists either way, the reconcile loop repairs the index and the
+    cached bookings list expires on its own.
+    """
+    try:
+        await index_update
+        logger.info("Availability index updated")
+    except Exception:
+        # At least this worker stops serving the old slots
+        availability_local_cache.invalidate()
+        logger.error("Availability index update failed after commit", exc_info=True)
+
+    try:
+        await invalidate_bookings_cache()
+    except Exception:
+        bookings_local_cache.invalidate()
+        logger.error("Bookings cache invalidation failed after commit", exc_info=True)
+
+
+async def get_bookings_version() -> Optional[int]:
+    """Current bookings version, or None when Redis can't be read (no ETag then)."""
+    try:
+        client = await RedisClient.get_client()
+        version = await client.get(BOOKINGS_VERSION_KEY)
+        return int(version) if version else 0
+    except Exception:
+        logger.warning("Bookings version unavailable", exc_info=True)
+        return None
+
+
+async def refresh_bookings_cache():
+    """Rebuilds the cached bookings body ahead of expiry (refresh-ahead)."""
+    version = await get_bookings_version()
+    body = await run_in_threadpool(_render_bookings_fresh)
+
+    # A write landed while rendering; leave the key for the next reader to fill
+    if version is None or version != await get_bookings_version():
+        return
+
+    await CacheUtils.set_raw(BOOKINGS_CACHE_KEY, body, expire=BOOKINGS_CACHE_TTL)
+
+
+@booking_router.get("/", response_model=ApiEnvelope[List[BookingResponse]])
+async def get_all_bookings(
+    if_none_match: Optional[str] = Header(None)
+):
     try:
         logger.info("Request received: Get all bookings")
 
-        cache_key = "bookings"
-        cached = await CacheUtils.get(cache_key)
+        # Read before the body, so the ETag is never newer than what it labels
+        version = await get_bookings_version()
+        etag = make_etag("bookings", version) if version is not None else None
+
+        if etag and etag_matches(if_none_match, etag):
+            logger.info("Bookings not modified")
+            return not_modified(etag)
+
+        headers = etag_headers(etag)
+
+        generation = bookings_local_cache.generation
+        cached = bookings_local_cache.get(BOOKINGS_CACHE_KEY)
 
         if cached:
-            logger.info("Bookings returned from cache")
-            return ApiResponse().success_response(
-                message="Bookings fetched successfully",
-                data=cached
-            )
+            logger.info("Bookings returned from local cache")
+            return Response(content=cached, media_type="application/json", headers=headers)
 
-        logger.info("Cache miss. Fetching bookings from DB")
+        # The cache holds the fully rendered body, so a hit costs no serialization
+        cached = await CacheUtils.get_raw(BOOKINGS_CACHE_KEY)
 
-        bookings = db.execute(
-            select(Bookings)
-            .order_by(Bookings.booking_datetime.desc())
-        ).scalars().all()
+        if cached:
+            logger.info("Bookings returned from cache")
+            bookings_local_cache.set(BOOKINGS_CACHE_KEY, cached, generation)
+            return Response(content=cached, media_type="application/json", headers=headers)
 
-        booking_data = jsonable_encoder(bookings)
+        logger.info("Cache miss. Fetching bookings from DB")
 
-        await CacheUtils.set(cache_key, booking_data)
+        # Primary, not replica: a lagging body must not be cached under the current ETag
+        body = await run_in_threadpool(_render_bookings_fresh)
 
-        logger.info("Bookings fetched and cached successfully")
+        # A write landed while rendering; serve this body but don't cache it
+        if version is not None and version == await get_bookings_version():
+            await CacheUtils.set_raw(BOOKINGS_CACHE_KEY, body, expire=BOOKINGS_CACHE_TTL)
+            bookings_local_cache.set(BOOKINGS_CACHE_KEY, body, generation)
+            logger.info("Bookings fetched and cached successfully")
 
-        return ApiResponse().success_response(
-            message="Bookings fetched successfully",
-            data=booking_data
-        )
+        return Response(content=body, media_type="application/json", headers=headers)
 
     except Exception as e:
         logger.error("Error in get_all_bookings", exc_info=True)
         raise HTTPException(status_code=500, detail="Internal Server Error")
     
-@booking_router.get("/paginated")
+@booking_router.get("/paginated", response_model=ApiEnvelope[PaginatedBookingsResponse])
 def get_bookings_paginated(
     page: int = Query(1, ge=1),
     limit: int = Query(10, ge=1, le=100),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     try:
         logger.info(f"Request: Paginated bookings | page={page} | limit={limit}")
@@ -80,20 +219,20 @@ def get_bookings_paginated(
             select(func.count()).select_from(Bookings)
         ).scalar()
 
-        bookings = db.execute(
-            select(Bookings)
+        rows = db.execute(
+            select(*BOOKING_COLUMNS)
             .order_by(Bookings.booking_datetime.desc())
             .offset(offset)
             .limit(limit)
-        ).scalars().all()
+        ).mappings().all()
 
-        return ApiResponse().success_response(
+        return ApiResponse().json_response(
             message="Paginated bookings fetched successfully",
             data={
                 "page": page,
                 "limit": limit,
                 "total": total_count,
-                "records": bookings
+                "records": [dict(row) for row in rows]
             }
         )
 
@@ -101,73 +240,219 @@ def get_bookings_paginated(
         logger.error("Error in paginated bookings", exc_info=True)
         raise HTTPException(status_code=500, detail="Internal Server Error")
     
-@booking_router.get("/availability")
-async def get_10_days_availability(db: Session = Depends(get_db)):
+def resolve_availability_request(
+    tz: Optional[str],
+    start: Optional[date],
+    end: Optional[date]
+) -> Tuple[date, date]:
+    """Validates tz and fills in the date range; raises 400 on bad input."""
+    if tz is not None and not is_valid_timezone(tz):
+        logger.warning(f"Availability rejected: invalid timezone {tz}")
+        raise HTTPException(status_code=400, detail="Invalid timezone")
+
+    try:
+        return BookingCalendar.resolve_range(start, end)
+    except ValueError as e:
+        logger.warning(f"Availability rejected: {e}")
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def availability_etag(version: int, slot_epoch: str, tz: Optional[str], start: date, end: date) -> str:
+    # slot_epoch moves as slots pass, so a tag never outlives the slots it lists
+    return make_etag(
+        "availability",
+        version,
+        BookingCalendar.version(),
+        slot_epoch,
+        tz or "UTC",
+        start,
+        end
+    )
+
+
+async def load_availability(
+    tz: Optional[str] = None,
+    start: Optional[date] = None,
+    end: Optional[date] = None
+) -> dict:
+    """
+    Availability payload shared by the endpoint and the chatbot flow. start
+    and end are inclusive UTC dates and default to the calendar's default
+    window (tomorrow onwards).
+    """
+    start, end = resolve_availability_request(tz, start, end)
+
+    calendar_version = BookingCalendar.version()
+    slot_epoch = BookingCalendar.slot_epoch()
+    cache_key = (tz, start, end, calendar_version, slot_epoch)
+
+    # Hits skip Redis entirely; booking writes on any worker evict this
+    generation = availability_local_cache.generation
+    cached = availability_local_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    version = await AvailabilityIndex.get_version()
+    availability = await AvailabilityIndex.get_availability(start, end)
+
+    logger.info("Availability read from index")
+
+    if tz is not None:
+        availability = render_availability(availability, tz, f"{calendar_version}:{version}:{slot_epoch}")
+
+    payload = ApiResponse().success_response(
+        message="Availability fetched successfully",
+        data=availability,
+        meta={
+            "timezone": tz or "UTC",
+            "from": start.isoformat(),
+            "to": end.isoformat(),
+            "version": version,
+            "calendar_version": calendar_version
+        }
+    )
+
+    availability_local_cache.set(cache_key, payload, generation)
+
+    return payload
+
+
+async def warm_availability():
+    """Builds the availability index and pre-renders WARM_TIMEZONES."""
+    await AvailabilityIndex.rebuild()
+    for tz in WARM_TIMEZONES:
+        await load_availability(tz=tz)
+
+
+@booking_router.get("/availability", response_model=ApiEnvelope[AvailabilityResponse])
+async def get_availability(
+    tz: Optional[str] = Query(None, description="IANA timezone, e.g. Asia/Kolkata"),
+    from_date: Optional[date] = Query(None, alias="from", description="First UTC date, inclusive"),
+    to_date: Optional[date] = Query(None, alias="to", description="Last UTC date, inclusive"),
+    if_none_match: Optional[str] = Header(None)
+):
     try:
-        logger.info("Request: Get availability")
+        logger.info(f"Request: Get availability | tz={tz} | from={from_date} | to={to_date}")
 
-        cache_key = "availability"
-        cached = await CacheUtils.get(cache_key)
+        start, end = resolve_availability_request(tz, from_date, to_date)
 
-        if cached:
-            logger.info("Availability returned from cache")
-            return ApiResponse().success_response(
-                message="Availability fetched successfully",
-                data=cached
+        # Taken before the payload is built, so the payload is never older than its tag
+        slot_epoch = BookingCalendar.slot_epoch()
+
+        # Only the version counter is read before deciding on a 304
+        if if_none_match:
+            try:
+                etag = availability_etag(await AvailabilityIndex.get_version(), slot_epoch, tz, start, end)
+                if etag_matches(if_none_match, etag):
+                    logger.info("Availability not modified")
+                    return not_modified(etag)
+            except Exception:
+                logger.warning("Availability version unavailable, skipping ETag check", exc_info=True)
+
+        payload = await load_availability(tz, start, end)
+
+        # Derived from the version the payload was built at, not a fresh read
+        etag = availability_etag(payload["meta"]["version"], slot_epoch, tz, start, end)
+
+        return ORJSONResponse(content=payload, headers=etag_headers(etag))
+
+    except HTTPException:
+        raise
+
+    except Exception:
+        logger.error("Error in availability endpoint", exc_info=True)
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+@booking_router.get("/search", response_model=ApiEnvelope[BookingSearchResponse])
+def search_bookings(
+    email: Optional[str] = Query(None, description="Exact work email (case-insensitive)"),
+    business_name: Optional[str] = Query(None, min_length=1),
+    match: str = Query("prefix", pattern="^(prefix|fuzzy)$"),
+    start: Optional[datetime] = Query(None, description="booking_datetime >= start"),
+    end: Optional[datetime] = Query(None, description="booking_datetime < end"),
+    tz: Optional[str] = Query(None, alias="timezone"),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
+    db: Session = Depends(get_read_db)
+):
+    try:
+        logger.info(
+            f"Request: Search bookings | match={match} | limit={limit} | "
+            f"cursor={'yes' if cursor else 'no'}"
+        )
+
+        statement = select(*BOOKING_COLUMNS)
+
+        # Each filter maps onto an index from migration 0002
+        if email:
+            statement = statement.where(
+                func.lower(Bookings.work_email) == email.strip().lower()
             )
 
-        utc_now = get_utc_now()
-        start_date = utc_now.date() + timedelta(days=1)
-
-        availability = []
-
-        for i in range(10):
-            current_date = start_date + timedelta(days=i)
-            day_slots = []
-
-            for hour in AVAILABLE_HOURS:
-                slot_datetime = datetime(
-                    current_date.year,
-                    current_date.month,
-                    current_date.day,
-                    hour,
-                    0,
-                    tzinfo=timezone.utc
+        if business_name:
+            name = business_name.strip().lower()
+            lowered = func.lower(Bookings.business_name)
+
+            if match == "prefix":
+                statement = statement.where(
+                    lowered.like(f"{escape_like(name)}%", escape="\\")
                 )
+            else:
+                statement = statement.where(or_(
+                    lowered.op("%")(name),
+                    lowered.like(f"%{escape_like(name)}%", escape="\\")
+                ))
+
+        if start:
+            statement = statement.where(Bookings.booking_datetime >= start)
 
-                if slot_datetime <= utc_now:
-                    continue
+        if end:
+            statement = statement.where(Bookings.booking_datetime < end)
 
-                existing = db.execute(
-                    select(Bookings).where(
-                        Bookings.booking_datetime == slot_datetime
-                    )
-                ).scalar_one_or_none()
+        if tz:
+            statement = statement.where(Bookings.timezone == tz)
 
-                if not existing:
-                    day_slots.append(slot_datetime.isoformat())
+        if cursor:
+            cursor_datetime, cursor_id = decode_cursor(cursor)
+            statement = statement.where(
+                tuple_(Bookings.booking_datetime, Bookings.id) < tuple_(cursor_datetime, cursor_id)
+            )
 
-            availability.append({
-                "date": current_date.isoformat(),
-                "available_slots": day_slots
-            })
+        # Fetch one extra row to learn whether another page exists
+        rows = db.execute(
+            statement
+            .order_by(Bookings.booking_datetime.desc(), Bookings.id.desc())
+            .limit(limit + 1)
+        ).mappings().all()
 
-        await CacheUtils.set(cache_key, availability)
+        records = [dict(row) for row in rows[:limit]]
+        next_cursor = None
 
-        logger.info("Availability fetched from DB and cached")
+        if len(rows) > limit:
+            last = records[-1]
+            next_cursor = encode_cursor(last["booking_datetime"], last["id"])
 
-        return ApiResponse().success_response(
-            message="Availability fetched successfully",
-            data=availability
+        return ApiResponse().json_response(
+            message="Bookings fetched successfully",
+            data={
+                "limit": limit,
+                "next_cursor": next_cursor,
+                "records": records
+            }
         )
 
+    except ValueError as e:
+        logger.warning(f"Search rejected: {e}")
+        raise HTTPException(status_code=400, detail=str(e))
+
     except Exception:
-        logger.error("Error in availability endpoint", exc_info=True)
+        logger.error("Error in search_bookings", exc_info=True)
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
 
-@booking_router.get("/{booking_id}")
-def get_booking_by_id(booking_id: str, db: Session = Depends(get_db)):
+@booking_router.get("/{booking_id}", response_model=ApiEnvelope[BookingResponse])
+def get_booking_by_id(booking_id: str, db: Session = Depends(get_read_db)):
     try:
         logger.info(f"Request: Get booking by ID | id={booking_id}")
 
@@ -177,9 +462,9 @@ def get_booking_by_id(booking_id: str, db: Session = Depends(get_db)):
             logger.warning("Booking not found")
             raise HTTPException(status_code=404, detail="Booking not found")
 
-        return ApiResponse().success_response(
+        return ApiResponse().json_response(
             message="Booking fetched successfully",
-            data=booking
+            data=booking_to_dict(booking)
         )
 
     except HTTPException:
@@ -191,8 +476,32 @@ def get_booking_by_id(booking_id: str, db: Session = Depends(get_db)):
 
 
 
-@booking_router.post("/", status_code=201)
-async def create_booking(payload: CreateBooking, db: Session = Depends(get_db)):
+@booking_router.post("/", status_code=201, response_model=ApiEnvelope[BookingResponse])
+async def create_booking(
+    payload: CreateBooking,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")
+):
+    # Retries with the same key replay the first response from Redis,
+    # skipping Postgres and the confirmation email
+    created: List[Bookings] = []
+    response = await run_idempotent(
+        "booking:create",
+        idempotency_key,
+        fingerprint(payload.model_dump_json()),
+        lambda: _create_booking(payload, db, created)
+    )
+
+    # Sent once the result is recorded, so a slow SMTP server can't outlive
+    # the idempotency lock and let a retry book the slot a second time
+    for booking in created:
+        background_tasks.add_task(send_booking_email, booking)
+
+    return response
+
+
+async def _create_booking(payload: CreateBooking, db: Session, created: List[Bookings]):
     try:
         logger.info(f"Booking attempt by {payload.work_email}")
 
@@ -206,8 +515,8 @@ async def create_booking(payload: CreateBooking, db: Session = Depends(get_db)):
             logger.warning("Booking rejected: past date")
             raise HTTPException(status_code=400, detail="Past booking not allowed")
 
-        if payload.booking_datetime.hour not in AVAILABLE_HOURS:
-            logger.warning("Booking rejected: invalid hour slot")
+        if not BookingCalendar.is_bookable(payload.booking_datetime):
+            logger.warning("Booking rejected: not a calendar slot")
             raise HTTPException(status_code=400, detail="Invalid time slot")
 
         existing = db.execute(
@@ -237,16 +546,18 @@ async def create_booking(payload: CreateBooking, db: Session = Depends(get_db)):
 
         logger.info(f"Booking created successfully | ID: {booking.id}")
 
-        await CacheUtils.delete("availability")
-        logger.info("Availability cache invalidated")
+        await sync_caches_after_write(AvailabilityIndex.mark_booked(booking.booking_datetime))
 
-        send_booking_email(booking)
-        logger.info("Booking confirmation email sent")
+        created.append(booking)
 
-        return ApiResponse().success_response(
+        response = ApiResponse().json_response(
             message="Booking created successfully",
-            data=booking
+            data=booking_to_dict(booking),
+            status_code=201
         )
+        mark_recent_write(response)
+
+        return response
 
     except HTTPException as http_error:
         db.rollback()
@@ -258,7 +569,7 @@ async def create_booking(payload: CreateBooking, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail="Internal Server Error")
 
 @booking_router.delete("/{booking_id}")
-def delete_booking(booking_id: str, db: Session = Depends(get_db)):
+async def delete_booking(booking_id: str, db: Session = Depends(get_db)):
     try:
         logger.info(f"Delete request | id={booking_id}")
 
@@ -268,14 +579,21 @@ def delete_booking(booking_id: str, db: Session = Depends(get_db)):
             logger.warning("Delete failed: booking not found")
             raise HTTPException(status_code=404, detail="Booking not found")
 
+        booking_datetime = booking.booking_datetime
+
         db.delete(booking)
         db.commit()
 
         logger.info(f"Booking deleted | id={booking_id}")
 
-        return ApiResponse().success_response(
+        await sync_caches_after_write(AvailabilityIndex.mark_free(booking_datetime))
+
+        response = ApiResponse().json_response(
             message="Booking deleted successfully"
         )
+        mark_recent_write(response)
+
+        return response
 
     except HTTPException:
         db.rollback()
@@ -0,0 +1,108 @@
+import io
+import logging
+import tempfile
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from ..config.db import get_db, get_read_db, mark_recent_write
+from ..utils.api_response import ApiResponse
+from ..utils.availability_index import AvailabilityIndex
+from ..utils.security_utils import verify_api_key
+from ..utils.bulk_booking_utils import detect_format, import_bookings, export_bookings
+from .bookings_route import invalidate_bookings_cache
+
+
+logger = logging.getLogger(__name__)
+
+bulk_booking_router = APIRouter(
+    dependencies=[Depends(verify_api_key)]
+)
+
+# Request bodies larger than this are spooled to disk instead of RAM
+SPOOL_MAX_SIZE = 8 * 1024 * 1024
+EXPORT_CHUNK_SIZE = 64 * 1024
+
+
+@bulk_booking_router.post("/import")
+async def bulk_import_bookings(
+    request: Request,
+    format: Optional[str] = Query(None, pattern="^(csv|ndjson)$"),
+    send_emails: bool = Query(False),
+    allow_historical: bool = Query(False, description="Skip the upcoming-slot and calendar checks (CRM migrations)"),
+    db: Session = Depends(get_db)
+):
+    try:
+        fmt = detect_format(format, request.headers.get("content-type"))
+        logger.info(
+            f"Bulk import started | format={fmt} | send_emails={send_emails} | "
+            f"allow_historical={allow_historical}"
+        )
+
+        with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE) as spool:
+            async for chunk in request.stream():
+                spool.write(chunk)
+            spool.seek(0)
+
+            stream = io.TextIOWrapper(spool, encoding="utf-8-sig", newline="")
+            summary = await run_in_threadpool(
+                import_bookings, db, stream, fmt, send_emails, allow_historical
+            )
+            stream.detach()
+
+        if summary["inserted"]:
+            await AvailabilityIndex.rebuild()
+            await invalidate_bookings_cache()
+
+        response = ApiResponse().json_response(
+            message="Bulk import completed",
+            data=summary
+        )
+        mark_recent_write(response)
+
+        return response
+
+    except ValueError as e:
+        logger.warning(f"Bulk import rejected: {e}")
+        raise HTTPException(status_code=400, detail=str(e))
+
+    except Exception:
+        logger.error("Error in bulk_import_bookings", exc_info=True)
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+
+@bulk_booking_router.get("/export")
+async def bulk_export_bookings(
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    start: Optional[datetime] = Query(None),
+    end: Optional[datetime] = Query(None),
+    db: Session = Depends(get_read_db)
+):
+    try:
+        logger.info(f"Bulk export started | format={format}")
+
+        spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+        await run_in_threadpool(export_bookings, db, spool, format, start, end)
+        spool.seek(0)
+
+    except Exception:
+        logger.error("Error in bulk_export_bookings", exc_info=True)
+        raise HTTPException(status_code=500, detail="Internal Server Error")
+
+    def iter_file():
+        with spool:
+            while chunk := spool.read(EXPORT_CHUNK_SIZE):
+                yield chunk
+
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    filename = f"bookings.{'csv' if format == 'csv' else 'ndjson'}"
+
+    return StreamingResponse(
+        iter_file(),
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
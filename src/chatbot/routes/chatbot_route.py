@@ -1,42 +1,106 @@
-from fastapi import APIRouter, Depends, HTTPException
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import uuid
+
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Request, WebSocket, WebSocketDisconnect, status
 from pydantic import BaseModel
-from typing import Dict, List
+from typing import Awaitable, Callable, Dict, List, Optional
 from datetime import datetime
-from zoneinfo import ZoneInfo
-from sqlalchemy.orm import Session
 
-import httpx
-import os
-from dotenv import load_dotenv
-from openai import AsyncOpenAI
-
-from ..config.db import get_db
+from ..config.db import LazySession
+from ..config.env import get_env
+from ..config.cloudflare import CloudflareClient, CF_BASE, VECTORIZE_INDEX
 from .bookings_route import (
-    get_10_days_availability,
+    load_availability,
     create_booking
 )
 from ..validations.booking_validations import CreateBooking
+from ..utils.embedding_batcher import EmbeddingBatcher
+from ..utils.embedding_cache import EmbeddingCache
+from ..utils.cache_warmer import cache_warmer
+from ..utils.query_classifier import classify_query, GENERAL_CATEGORY
+from ..utils.model_router import model_router
+from ..utils.timezone_utils import is_valid_timezone
+from ..utils.calendar_engine import BookingCalendar
+from ..utils.rate_limiter import enforce_chat_rate_limit, llm_admission
+from ..utils.transcript_writer import transcript_writer
+from ..utils.idempotency import IdempotencyInProgress
 
-load_dotenv()
 
-CF_ACCOUNT_ID = os.getenv("CF_ACCOUNT_ID")
-CF_API_TOKEN = os.getenv("CF_API_TOKEN")
-VECTORIZE_INDEX = os.getenv("VECTORIZE_INDEX_NAME", "onetracker-knowledge")
+logger = logging.getLogger(__name__)
 
-if not CF_ACCOUNT_ID or not CF_API_TOKEN:
-    raise RuntimeError("Missing Cloudflare credentials")
+EMBEDDING_MODEL = "@cf/baai/bge-small-en-v1.5"
 
-cf_client = AsyncOpenAI(
-    api_key=CF_API_TOKEN,
-    base_url=f"https://api.cloudflare.com/client/v4/accounts/{CF_ACCOUNT_ID}/ai/v1",
-    http_client=httpx.AsyncClient(
-        headers={"Authorization": f"Bearer {CF_API_TOKEN}"},
-        timeout=60.0
-    )
+RETRIEVAL_TOP_K = 5
+RETRIEVAL_MIN_SCORE = 0.68
+
+FAQ_WARM_FILE = get_env(
+    "FAQ_WARM_FILE",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), "docs", "faq.md")
 )
 
-DEFAULT_MODEL = "@cf/meta/llama-3.1-8b-instruct-fast"
-EMBEDDING_MODEL = "@cf/baai/bge-small-en-v1.5"
+
+async def embed_texts(texts: List[str]) -> List[List[float]]:
+    embed_resp = await CloudflareClient.get_ai_client().embeddings.create(
+        model=EMBEDDING_MODEL,
+        input=texts
+    )
+    return [
+        item.embedding
+        for item in sorted(embed_resp.data, key=lambda item: item.index)
+    ]
+
+
+embedding_batcher = EmbeddingBatcher(embed_fn=embed_texts)
+
+
+async def embed_query(text: str) -> List[float]:
+    # The cache is an optimisation only: Redis errors fall through to upstream
+    try:
+        vector = await EmbeddingCache.get(EMBEDDING_MODEL, text)
+    except Exception:
+        logger.warning("Embedding cache read failed", exc_info=True)
+        vector = None
+
+    if vector is None:
+        vector = await embedding_batcher.embed(text)
+        try:
+            await EmbeddingCache.set(EMBEDDING_MODEL, text, vector)
+        except Exception:
+            logger.warning("Embedding cache write failed", exc_info=True)
+
+    return vector
+
+
+def load_faq_questions(path: str = FAQ_WARM_FILE) -> List[str]:
+    """Questions are the '## ...?' headings of the FAQ markdown."""
+    with open(path, "r", encoding="utf-8") as f:
+        return [
+            line[3:].strip()
+            for line in f
+            if line.startswith("## ") and line.rstrip().endswith("?")
+        ]
+
+
+async def warm_faq_embeddings():
+    """Pre-embeds frequent questions and keeps their cache entries fresh."""
+    questions = load_faq_questions()
+    if not questions:
+        return
+
+    vectors = await embed_texts(questions)
+
+    for question, vector in zip(questions, vectors):
+        await EmbeddingCache.set(EMBEDDING_MODEL, question, vector)
+
+        async def refresh(question: str = question):
+            vector = await embedding_batcher.embed(question)
+            await EmbeddingCache.set(EMBEDDING_MODEL, question, vector)
+
+        cache_warmer.add_hot_key(EmbeddingCache.key_for(EMBEDDING_MODEL, question), refresh)
 
 chatbot_router = APIRouter()
 
@@ -44,6 +108,42 @@ CANCEL_KEYWORDS = ["cancel", "stop", "exit", "quit"]
 
 sessions: Dict[str, List[dict]] = {}
 booking_states: Dict[str, dict] = {}
+# Final message and payload of each session's last booking attempt, kept for one turn
+last_bookings: Dict[str, dict] = {}
+
+async def search_knowledge(query_vector: List[float], namespace: Optional[str] = None) -> List[dict]:
+    """Vectorize matches above the relevance threshold, optionally in one namespace."""
+    body = {
+        "vector": query_vector,
+        "topK": RETRIEVAL_TOP_K,
+        "returnMetadata": "all"
+    }
+    if namespace is not None:
+        body["namespace"] = namespace
+
+    vec_resp = await CloudflareClient.get_http_client().post(
+        f"{CF_BASE}/vectorize/v2/indexes/{VECTORIZE_INDEX}/query",
+        json=body
+    )
+
+    matches = vec_resp.json()["result"]["matches"]
+    return [m for m in matches if m.get("score", 0) >= RETRIEVAL_MIN_SCORE]
+
+
+async def search_category(query_vector: List[float], category: str) -> List[dict]:
+    """The category's namespace plus the general one (FAQ), best matches first."""
+    namespaces = {category, GENERAL_CATEGORY}
+    results = await asyncio.gather(
+        *(search_knowledge(query_vector, namespace) for namespace in namespaces)
+    )
+
+    merged = sorted(
+        (match for matches in results for match in matches),
+        key=lambda m: m.get("score", 0),
+        reverse=True
+    )
+    return merged[:RETRIEVAL_TOP_K]
+
 
 # -----------------------------
 # Schemas
@@ -59,41 +159,137 @@ class ChatResponse(BaseModel):
 
 
 # -----------------------------
-# Chat Endpoint
+# Sessions
 # -----------------------------
 
-@chatbot_router.post("/chat", response_model=ChatResponse)
-async def chat(req: ChatRequest, db: Session = Depends(get_db)):
+class ChatSession:
+    """
+    Conversation history and booking state for one session id. Shared by the
+    HTTP endpoint and websocket connections, so either transport can resume
+    a session started on the other.
+    """
 
-    user_input = req.message.strip()
-    user_message_lower = user_input.lower()
+    def __init__(self, session_id: str):
+        self.session_id = session_id
+        self.conversation = sessions.setdefault(session_id, [])
+        self.state = booking_states.setdefault(session_id, {})
+
+    def reset_booking(self):
+        # Cleared in place: the dicts stay registered for the next turn
+        self.state.clear()
+
+    def reset(self):
+        self.state.clear()
+        self.conversation.clear()
+        last_bookings.pop(self.session_id, None)
+
+
+def chat_booking_key(session_id: str, payload: CreateBooking) -> str:
+    # Same session and same collected fields give the same key, however often it's sent
+    raw = f"{session_id}|{payload.model_dump_json()}"
+    return "chat:" + hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+async def submit_chat_booking(
+    session: ChatSession,
+    payload: CreateBooking,
+    user_input: str,
+    db_provider: LazySession
+) -> str:
+    emails = BackgroundTasks()
+
+    try:
+        # A resent final message (client retry, second tab) replays the
+        # first outcome instead of booking or emailing twice
+        response = await create_booking(
+            payload,
+            background_tasks=emails,
+            db=db_provider.get(),
+            idempotency_key=chat_booking_key(session.session_id, payload)
+        )
+
+    except IdempotencyInProgress:
+        # Booking state is kept, so the next attempt lands here again
+        return "Your booking is still being processed. Please wait a moment."
+
+    except HTTPException as e:
+        reply = f"Booking failed: {e.detail}"
 
-    if req.session_id not in sessions:
-        sessions[req.session_id] = []
-        booking_states[req.session_id] = {}
+    except Exception:
+        reply = "Something went wrong while booking."
+
+    else:
+        if response.status_code >= 400:
+            detail = json.loads(response.body).get("detail", "Unknown error")
+            reply = f"Booking failed: {detail}"
+        else:
+            # The idempotent result is already recorded; only now wait on SMTP
+            await emails()
+            reply = "🎉 Demo booked successfully! Confirmation email sent."
+
+    session.reset_booking()
+    last_bookings[session.session_id] = {"input": user_input, "payload": payload}
+
+    return reply
+
+
+# -----------------------------
+# Chat Turn
+# -----------------------------
 
-    state = booking_states[req.session_id]
+async def handle_chat_turn(
+    session: ChatSession,
+    user_input: str,
+    db_provider: LazySession,
+    on_token: Optional[Callable[[str], Awaitable[None]]] = None
+) -> str:
+    """
+    Runs one user message through the booking flow or the RAG assistant and
+    returns the reply. When on_token is given the LLM answer is streamed to
+    it as it is generated.
+    """
+    transcript_writer.record(session.session_id, "user", user_input)
+
+    reply = await _run_chat_turn(session, user_input, db_provider, on_token)
+
+    # Persisted in the background; never blocks the reply
+    transcript_writer.record(session.session_id, "assistant", reply)
+
+    return reply
+
+
+async def _run_chat_turn(
+    session: ChatSession,
+    user_input: str,
+    db_provider: LazySession,
+    on_token: Optional[Callable[[str], Awaitable[None]]]
+) -> str:
+    user_input = user_input.strip()
+    user_message_lower = user_input.lower()
+    state = session.state
+    last_booking = last_bookings.pop(session.session_id, None)
 
     # -----------------------------------
     # Cancel Booking
     # -----------------------------------
     if any(word in user_message_lower for word in CANCEL_KEYWORDS):
-        booking_states.pop(req.session_id, None)
-        sessions.pop(req.session_id, None)
-        return ChatResponse(
-            session_id=req.session_id,
-            reply="Booking session cancelled."
-        )
+        session.reset()
+        return "Booking session cancelled."
+
+    # -----------------------------------
+    # Retried Final Booking Message
+    # -----------------------------------
+    # The booking state is already reset, so only the stored payload can
+    # rebuild the same idempotency key and replay the first outcome
+    if last_booking and not state and user_input == last_booking["input"]:
+        return await submit_chat_booking(session, last_booking["payload"], user_input, db_provider)
 
     # -----------------------------------
     # Start Booking
     # -----------------------------------
     if "demo" in user_message_lower and not state:
         state["step"] = "collect_timezone"
-        return ChatResponse(
-            session_id=req.session_id,
-            reply="Please provide your timezone (Example: Asia/Kolkata)"
-        )
+        return "Please provide your timezone (Example: Asia/Kolkata)"
 
     # -----------------------------------
     # BOOKING FLOW (AI BLOCKED)
@@ -103,113 +299,91 @@ async def chat(req: ChatRequest, db: Session = Depends(get_db)):
 
         # 1️⃣ Collect Timezone
         if step == "collect_timezone":
+            if not is_valid_timezone(user_input):
+                return "Invalid timezone."
+
             try:
-                ZoneInfo(user_input)
                 state["timezone"] = user_input
                 state["step"] = "choose_slot"
 
-                availability_response = await get_10_days_availability(db)
-                availability_data = availability_response["data"]
-
-                state["availability"] = availability_data
+                availability_response = await load_availability(tz=user_input)
+                local_days = availability_response["data"]
 
-                all_slots = [
-                    slot
-                    for day in availability_data
-                    for slot in day["available_slots"]
+                # Users pick by number; keep the UTC value behind each label
+                state["slot_options"] = [
+                    slot["value"]
+                    for day in local_days
+                    for slot in day["slots"]
                 ]
 
-                if not all_slots:
-                    booking_states.pop(req.session_id, None)
-                    return ChatResponse(
-                        session_id=req.session_id,
-                        reply="No slots available in next 10 days."
-                    )
+                if not state["slot_options"]:
+                    session.reset_booking()
+                    return f"No slots available in next {BookingCalendar.get_config().default_days} days."
 
-                formatted = "\n".join(all_slots)
+                lines = []
+                number = 1
+                for day in local_days:
+                    lines.append(day["label"])
+                    for slot in day["slots"]:
+                        lines.append(f"  {number}. {slot['label']}")
+                        number += 1
 
-                return ChatResponse(
-                    session_id=req.session_id,
-                    reply=f"Available slots:\n{formatted}\n\nPlease select one slot."
+                formatted = "\n".join(lines)
+
+                return (
+                    f"Available slots ({user_input}):\n{formatted}\n\n"
+                    "Please reply with the slot number."
                 )
 
             except Exception:
-                return ChatResponse(
-                    session_id=req.session_id,
-                    reply="Invalid timezone."
-                )
+                session.reset_booking()
+                return "Could not fetch availability. Please try again."
 
         # 2️⃣ Choose Slot
         elif step == "choose_slot":
             selected_slot = user_input.strip()
+            slot_options = state.get("slot_options", [])
 
-            valid_slots = [
-                slot
-                for day in state.get("availability", [])
-                for slot in day["available_slots"]
-            ]
+            if selected_slot.isdigit() and 1 <= int(selected_slot) <= len(slot_options):
+                selected_slot = slot_options[int(selected_slot) - 1]
 
-            if selected_slot not in valid_slots:
-                return ChatResponse(
-                    session_id=req.session_id,
-                    reply="Invalid or unavailable slot."
-                )
+            if selected_slot not in slot_options:
+                return "Invalid or unavailable slot."
 
             state["booking_datetime"] = selected_slot
             state["step"] = "collect_name"
 
-            return ChatResponse(
-                session_id=req.session_id,
-                reply="Please provide your full name."
-            )
+            return "Please provide your full name."
 
         # 3️⃣ Collect Name
         elif step == "collect_name":
             state["name"] = user_input
             state["step"] = "collect_email"
-            return ChatResponse(
-                session_id=req.session_id,
-                reply="Please provide your work email."
-            )
+            return "Please provide your work email."
 
         # 4️⃣ Collect Email
         elif step == "collect_email":
             if "@" not in user_input:
-                return ChatResponse(
-                    session_id=req.session_id,
-                    reply="Please enter a valid email address."
-                )
+                return "Please enter a valid email address."
 
             state["work_email"] = user_input
             state["step"] = "collect_business"
-            return ChatResponse(
-                session_id=req.session_id,
-                reply="Please provide your business name."
-            )
+            return "Please provide your business name."
 
         # 5️⃣ Collect Business
         elif step == "collect_business":
             state["business_name"] = user_input
             state["step"] = "collect_contact"
-            return ChatResponse(
-                session_id=req.session_id,
-                reply="Please provide your contact number."
-            )
+            return "Please provide your contact number."
  
         # 6️⃣ Collect Contact
         elif step == "collect_contact":
             if not user_input.isdigit():
-                return ChatResponse(
-                    session_id=req.session_id,
-                    reply="Contact number should contain digits only."
-                )
+                return "Contact number should contain digits only."
 
             state["contact_number"] = user_input
             state["step"] = "collect_message"
-            return ChatResponse(
-                session_id=req.session_id,
-                reply="Any additional message?"
-            )
+            return "Any additional message?"
 
         # 7️⃣ Final Booking
         elif step == "collect_message":
@@ -228,76 +402,48 @@ async def chat(req: ChatRequest, db: Session = Depends(get_db)):
                     timezone=state["timezone"]
                 )
 
-                await create_booking(booking_payload, db)
-
-                booking_states.pop(req.session_id, None)
-
-                return ChatResponse(
-                    session_id=req.session_id,
-                    reply="🎉 Demo booked successfully! Confirmation email sent."
-                )
-
-            except HTTPException as e:
-                booking_states.pop(req.session_id, None)
-                return ChatResponse(
-                    session_id=req.session_id,
-                    reply=f"Booking failed: {e.detail}"
-                )
-
             except Exception:
-                booking_states.pop(req.session_id, None)
-                return ChatResponse(
-                    session_id=req.session_id,
-                    reply="Something went wrong while booking."
-                )
+                session.reset_booking()
+                return "Something went wrong while booking."
+
+            return await submit_chat_booking(session, booking_payload, user_input, db_provider)
 
     # -----------------------------------
     # AI RAG SECTION (ONLY IF NOT BOOKING)
     # -----------------------------------
 
-    conversation = sessions[req.session_id]
-    conversation.append({"role": "user", "content": user_input})
+    # Shed load before touching upstream once too many LLM calls are in flight
+    async with llm_admission.slot():
+        conversation = session.conversation
+        conversation.append({"role": "user", "content": user_input})
 
-    try:
-        embed_resp = await cf_client.embeddings.create(
-            model=EMBEDDING_MODEL,
-            input=[user_input]
-        )
-        query_vector = embed_resp.data[0].embedding
-    except Exception:
-        query_vector = None
+        try:
+            query_vector = await embed_query(user_input)
+        except Exception:
+            query_vector = None
 
-    contexts_str = ""
+        contexts_str = ""
 
-    if query_vector:
-        try:
-            async with httpx.AsyncClient() as http:
-                vec_url = f"https://api.cloudflare.com/client/v4/accounts/{CF_ACCOUNT_ID}/vectorize/v2/indexes/{VECTORIZE_INDEX}/query"
-
-                vec_resp = await http.post(
-                    vec_url,
-                    json={
-                        "vector": query_vector,
-                        "topK": 5,
-                        "returnMetadata": "all"
-                    },
-                    headers={
-                        "Authorization": f"Bearer {CF_API_TOKEN}",
-                        "Content-Type": "application/json"
-                    }
-                )
+        if query_vector:
+            try:
+                namespace = classify_query(user_input)
+                if namespace is None:
+                    relevant = await search_knowledge(query_vector)
+                else:
+                    relevant = await search_category(query_vector, namespace)
 
-                matches = vec_resp.json()["result"]["matches"]
-                relevant = [m for m in matches if m.get("score", 0) >= 0.68]
+                if not relevant and namespace is not None:
+                    # Misclassified or thin category: widen to the whole index once
+                    relevant = await search_knowledge(query_vector)
 
                 contexts_str = "\n\n".join(
                     m["metadata"].get("text", "")[:500]
                     for m in relevant
                 )
-        except Exception:
-            pass
+            except Exception:
+                pass
 
-    system_content = f"""
+        system_content = f"""
 You are OneTracker AI assistant.
 Only answer OneTracker related queries.
 Use documentation context only if relevant.
@@ -309,23 +455,98 @@ Context:
 Never simulate bookings.
 """
 
-    try:
-        completion = await cf_client.chat.completions.create(
-            model=DEFAULT_MODEL,
-            messages=[
-                {"role": "system", "content": system_content},
-                *conversation[-12:]
-            ],
-            temperature=0.7,
-            max_tokens=600
-        )
+        messages = [
+            {"role": "system", "content": system_content},
+            *conversation[-12:]
+        ]
+
+        try:
+            # Model and max_tokens are picked per turn from the question,
+            # retrieved context size and recent upstream latency
+            reply = await model_router.complete(
+                user_input,
+                messages,
+                context_chars=len(contexts_str),
+                on_token=on_token
+            )
 
-        reply = completion.choices[0].message.content.strip()
+        except WebSocketDisconnect:
+            raise
 
-    except Exception:
-        reply = "AI is currently unavailable."
+        except Exception:
+            reply = "AI is currently unavailable."
 
     conversation.append({"role": "assistant", "content": reply})
-    sessions[req.session_id] = conversation
+
+    return reply
+
+
+# -----------------------------
+# Chat Endpoints
+# -----------------------------
+
+@chatbot_router.post("/chat", response_model=ChatResponse)
+async def chat(req: ChatRequest, request: Request):
+
+    await enforce_chat_rate_limit(request, req.session_id)
+
+    db_provider = LazySession()
+    try:
+        reply = await handle_chat_turn(ChatSession(req.session_id), req.message, db_provider)
+    finally:
+        db_provider.close()
 
     return ChatResponse(session_id=req.session_id, reply=reply)
+
+
+@chatbot_router.websocket("/ws")
+async def chat_websocket(websocket: WebSocket, session_id: Optional[str] = None):
+    """
+    Persistent chat connection. The client sends {"message": ...} (or plain
+    text) frames and receives "token" frames while the answer streams,
+    followed by a final "reply" frame per turn.
+    """
+    await websocket.accept()
+
+    session = ChatSession(session_id or str(uuid.uuid4()))
+    db_provider = LazySession()
+
+    async def send_token(token: str):
+        await websocket.send_json({"type": "token", "content": token})
+
+    try:
+        await websocket.send_json({"type": "session", "session_id": session.session_id})
+
+        while True:
+            raw = await websocket.receive_text()
+
+            try:
+                message = json.loads(raw).get("message", "")
+            except (ValueError, AttributeError):
+                message = raw
+
+            if not isinstance(message, str) or not message.strip():
+                await websocket.send_json({"type": "error", "status": 400, "detail": "Empty message"})
+                continue
+
+            try:
+                await enforce_chat_rate_limit(websocket, session.session_id)
+                reply = await handle_chat_turn(session, message, db_provider, on_token=send_token)
+            except HTTPException as e:
+                await websocket.send_json({"type": "error", "status": e.status_code, "detail": e.detail})
+                continue
+            finally:
+                # Don't pin a pooled connection while the client is idle
+                db_provider.close()
+
+            await websocket.send_json({"type": "reply", "session_id": session.session_id, "reply": reply})
+
+    except WebSocketDisconnect:
+        logger.info(f"Chat websocket closed | session_id={session.session_id}")
+
+    except Exception:
+        logger.error("Error in chat_websocket", exc_info=True)
+        await websocket.close(code=status.WS_1011_INTERNAL_ERROR)
+
+    finally:
+        db_provider.close()
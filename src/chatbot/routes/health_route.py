@@ -0,0 +1,172 @@
+import asyncio
+import logging
+import time
+from typing import Dict, Optional
+
+from fastapi import APIRouter, Depends
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse
+from sqlalchemy import text
+
+from ..config.db import SessionLocal, get_pool_stats, warm_pool
+from ..config.env import get_env
+from ..config.redis import RedisClient
+from ..config.cloudflare import CloudflareClient, CF_API_ROOT
+from ..utils.transcript_writer import transcript_writer
+from ..utils.model_router import model_router
+from ..utils.invalidation_bus import invalidation_bus
+from ..utils.security_utils import verify_api_key
+
+
+logger = logging.getLogger(__name__)
+
+health_router = APIRouter()
+
+# Internal counters, kept behind the same API key as the booking admin routes
+metrics_router = APIRouter(
+    prefix="/metrics",
+    dependencies=[Depends(verify_api_key)]
+)
+
+READY_CACHE_TTL = float(get_env("READY_CACHE_TTL", 2))
+READY_PROBE_TIMEOUT = float(get_env("READY_PROBE_TIMEOUT", 2))
+
+_ready_cache: Dict = {"expires_at": 0.0, "result": None}
+_ready_lock = asyncio.Lock()
+
+
+# -----------------------------
+# Probes
+# -----------------------------
+
+def _ping_postgres():
+    db = SessionLocal()
+    try:
+        db.execute(text("SELECT 1"))
+    finally:
+        db.close()
+
+
+async def probe_postgres():
+    await run_in_threadpool(_ping_postgres)
+
+
+async def probe_redis():
+    client = await RedisClient.get_client()
+    await client.ping()
+
+
+async def probe_cloudflare():
+    resp = await CloudflareClient.get_http_client().get(
+        f"{CF_API_ROOT}/user/tokens/verify",
+        timeout=READY_PROBE_TIMEOUT
+    )
+    resp.raise_for_status()
+
+
+async def warm_pools():
+    """Opens DB, Redis and Cloudflare connections before the first request."""
+    CloudflareClient.get_ai_client()
+    await asyncio.gather(
+        run_in_threadpool(warm_pool),
+        probe_redis(),
+        probe_cloudflare()
+    )
+
+
+PROBES = {
+    "postgres": probe_postgres,
+    "redis": probe_redis,
+    "cloudflare": probe_cloudflare,
+}
+
+# Probes the app cannot serve without. A failing Cloudflare check only means
+# chat answers degrade; bookings still work, so it does not fail readiness.
+CRITICAL_PROBES = {"postgres", "redis"}
+
+
+async def run_probe(name: str, probe) -> Dict:
+    start = time.perf_counter()
+    error: Optional[str] = None
+
+    try:
+        await asyncio.wait_for(probe(), timeout=READY_PROBE_TIMEOUT)
+    except asyncio.TimeoutError:
+        error = "timeout"
+        logger.warning(f"Readiness probe timed out | {name}")
+    except Exception:
+        # /ready is public; the exception text stays in the logs
+        error = "unavailable"
+        logger.warning(f"Readiness probe failed | {name}", exc_info=True)
+
+    return {
+        "ok": error is None,
+        "latency_ms": round((time.perf_counter() - start) * 1000, 2),
+        "error": error,
+    }
+
+
+async def check_readiness() -> Dict:
+    """Runs all probes concurrently; results are cached for READY_CACHE_TTL."""
+    if time.monotonic() < _ready_cache["expires_at"]:
+        return _ready_cache["result"]
+
+    async with _ready_lock:
+        # Another request may have refreshed the cache while we waited
+        if time.monotonic() < _ready_cache["expires_at"]:
+            return _ready_cache["result"]
+
+        results = await asyncio.gather(
+            *(run_probe(name, probe) for name, probe in PROBES.items())
+        )
+        checks = dict(zip(PROBES.keys(), results))
+
+        result = {
+            "status": all(checks[name]["ok"] for name in CRITICAL_PROBES),
+            "degraded": [
+                name for name, check in checks.items()
+                if not check["ok"] and name not in CRITICAL_PROBES
+            ],
+            "checks": checks,
+            "checked_at": time.time(),
+        }
+
+        _ready_cache["result"] = result
+        _ready_cache["expires_at"] = time.monotonic() + READY_CACHE_TTL
+
+        return result
+
+
+# -----------------------------
+# Endpoints
+# -----------------------------
+
+@health_router.get("/ready")
+async def readiness():
+    result = await check_readiness()
+
+    return JSONResponse(
+        status_code=200 if result["status"] else 503,
+        # Pool internals stay behind the API key, at /metrics/db-pool
+        content=result
+    )
+
+
+@metrics_router.get("/db-pool")
+def db_pool_metrics():
+    return get_pool_stats()
+
+
+@metrics_router.get("/transcripts")
+def transcript_metrics():
+    return transcript_writer.stats()
+
+
+@metrics_router.get("/llm")
+def llm_metrics():
+    return model_router.snapshot()
+
+
+@metrics_router.get("/cache-bus")
+def cache_bus_metrics():
+    return invalidation_bus.stats()
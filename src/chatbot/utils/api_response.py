@@ -1,5 +1,25 @@
-from typing import Any, Optional
+from typing import Any, Generic, Optional, TypeVar
 from pydantic import BaseModel
+from fastapi.responses import JSONResponse
+import orjson
+
+T = TypeVar("T")
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered by orjson (handles datetime/UUID natively)."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+class ApiEnvelope(BaseModel, Generic[T]):
+    """Typed shape of success_response, used for response_model docs."""
+    success: bool = True
+    message: Optional[str] = None
+    data: Optional[T] = None
+    meta: Optional[dict] = None
+
 
 class ApiResponse(BaseModel):
     success: bool = True
@@ -18,4 +38,21 @@ class ApiResponse(BaseModel):
             "message": message,
             "data": data,
             "meta": meta
-        }
\ No newline at end of file
+        }
+
+    @staticmethod
+    def json_response(
+        data: Any = None,
+        message: str = "Request successful",
+        meta: dict | None = None,
+        status_code: int = 200
+    ) -> ORJSONResponse:
+        """
+        success_response rendered straight to bytes with orjson. Returning a
+        Response skips FastAPI's jsonable_encoder pass, so data must already be
+        plain dicts/lists (datetime and UUID values are fine).
+        """
+        return ORJSONResponse(
+            status_code=status_code,
+            content=ApiResponse.success_response(data, message, meta)
+        )
@@ -0,0 +1,192 @@
+import asyncio
+import logging
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, List
+
+from redis.exceptions import WatchError
+from sqlalchemy import select
+
+from ..config.db import SessionLocal
+from ..config.env import get_env
+from ..config.redis import RedisClient
+from .calendar_engine import BookingCalendar
+from .invalidation_bus import invalidation_bus
+from src.chatbot.models.booking import Bookings
+
+
+logger = logging.getLogger(__name__)
+
+INDEX_KEY_PREFIX = "availability:index"
+INDEX_READY_KEY = "availability:index:ready"
+VERSION_KEY = "availability:version"
+AVAILABILITY_TOPIC = "availability"
+
+RECONCILE_INTERVAL = int(get_env("AVAILABILITY_RECONCILE_INTERVAL", 600))
+REBUILD_MAX_ATTEMPTS = 5
+
+
+def day_key(day: date) -> str:
+    return f"{INDEX_KEY_PREFIX}:{day.isoformat()}"
+
+
+def slot_offset(slot_datetime: datetime) -> int:
+    # One bit per minute of the UTC day, so any slot grid fits in 180 bytes
+    return slot_datetime.hour * 60 + slot_datetime.minute
+
+
+def day_expiry(day: date) -> int:
+    # Keep a day's bitmap until the day after it has passed
+    expires = datetime(day.year, day.month, day.day, tzinfo=timezone.utc) + timedelta(days=2)
+    return int(expires.timestamp())
+
+
+def load_booked_slots(window_start: datetime, window_end: datetime) -> List[datetime]:
+    # Always the primary: a lagging replica would clear bits for fresh bookings
+    db = SessionLocal()
+    try:
+        return db.execute(
+            select(Bookings.booking_datetime).where(
+                Bookings.booking_datetime >= window_start,
+                Bookings.booking_datetime < window_end
+            )
+        ).scalars().all()
+    finally:
+        db.close()
+
+
+class AvailabilityIndex:
+    """
+    Slot occupancy index kept in Redis: one bitmap per UTC day, one bit per
+    slot. Booking writes flip bits atomically, so reads never touch Postgres.
+    """
+
+    @staticmethod
+    async def mark_booked(slot_datetime: datetime):
+        await AvailabilityIndex._set_slot(slot_datetime, 1)
+
+    @staticmethod
+    async def mark_free(slot_datetime: datetime):
+        await AvailabilityIndex._set_slot(slot_datetime, 0)
+
+    @staticmethod
+    async def _set_slot(slot_datetime: datetime, value: int):
+        slot_datetime = slot_datetime.astimezone(timezone.utc)
+        key = day_key(slot_datetime.date())
+
+        client = await RedisClient.get_client()
+        async with client.pipeline(transaction=True) as pipe:
+            pipe.setbit(key, slot_offset(slot_datetime), value)
+            pipe.expireat(key, day_expiry(slot_datetime.date()))
+            pipe.incr(VERSION_KEY)
+            *_, version = await pipe.execute()
+
+        await invalidation_bus.publish(AVAILABILITY_TOPIC, version)
+
+    @staticmethod
+    async def get_version() -> int:
+        client = await RedisClient.get_client()
+        version = await client.get(VERSION_KEY)
+        return int(version) if version else 0
+
+    @staticmethod
+    async def rebuild():
+        """
+        Reconcile the bitmaps against the bookings table on the primary. The
+        version key is WATCHed from before the SELECT until EXEC: a
+        mark_booked/mark_free landing in between bumps it, aborting the
+        rewrite so it is retried against a fresh snapshot instead of wiping
+        that write. The SELECT runs in a worker thread, off the event loop.
+        """
+        # Cover every day the calendar can offer slots on
+        today = datetime.now(timezone.utc).date()
+        _, last_day = BookingCalendar.window()
+        days = [today + timedelta(days=i) for i in range(max((last_day - today).days, 0) + 1)]
+
+        window_start = datetime(today.year, today.month, today.day, tzinfo=timezone.utc)
+        window_end = window_start + timedelta(days=len(days))
+
+        client = await RedisClient.get_client()
+
+        for attempt in range(1, REBUILD_MAX_ATTEMPTS + 1):
+            async with client.pipeline(transaction=True) as pipe:
+                await pipe.watch(VERSION_KEY)
+
+                # A fresh session per attempt sees bookings committed since the last one
+                booked = await asyncio.to_thread(load_booked_slots, window_start, window_end)
+
+                pipe.multi()
+
+                for day in days:
+                    pipe.delete(day_key(day))
+
+                for booking_datetime in booked:
+                    booking_datetime = booking_datetime.astimezone(timezone.utc)
+                    pipe.setbit(day_key(booking_datetime.date()), slot_offset(booking_datetime), 1)
+
+                for day in days:
+                    pipe.expireat(day_key(day), day_expiry(day))
+
+                pipe.set(INDEX_READY_KEY, 1)
+                pipe.incr(VERSION_KEY)
+
+                try:
+                    *_, version = await pipe.execute()
+                except WatchError:
+                    logger.info(f"Availability index changed during rebuild, retrying | attempt={attempt}")
+                    continue
+
+            await invalidation_bus.publish(AVAILABILITY_TOPIC, version)
+
+            logger.info(f"Availability index rebuilt | booked_slots={len(booked)}")
+            return
+
+        logger.warning("Availability index rebuild kept conflicting with writes; left for the next pass")
+
+    @staticmethod
+    async def get_availability(start: date, end: date) -> List[Dict]:
+        """Free calendar slots on UTC dates start..end inclusive, one entry per day."""
+        client = await RedisClient.get_client()
+
+        if not await client.exists(INDEX_READY_KEY):
+            logger.info("Availability index missing. Rebuilding from DB")
+            await AvailabilityIndex.rebuild()
+
+        utc_now = datetime.now(timezone.utc)
+        slots = [
+            slot for slot in BookingCalendar.slots_between(start, end)
+            if slot > utc_now
+        ]
+
+        async with client.pipeline(transaction=False) as pipe:
+            for slot_datetime in slots:
+                pipe.getbit(day_key(slot_datetime.date()), slot_offset(slot_datetime))
+            bits = await pipe.execute() if slots else []
+
+        free_by_day: Dict[date, List[str]] = {}
+        for slot_datetime, booked in zip(slots, bits):
+            if not booked:
+                free_by_day.setdefault(slot_datetime.date(), []).append(slot_datetime.isoformat())
+
+        return [
+            {
+                "date": day.isoformat(),
+                "available_slots": free_by_day.get(day, [])
+            }
+            for day in (start + timedelta(days=i) for i in range((end - start).days + 1))
+        ]
+
+
+async def run_reconcile_loop(
+    interval: int = RECONCILE_INTERVAL,
+    initial_delay: float = 0
+):
+    # Lets startup skip the first pass when warm-up already rebuilt the index
+    await asyncio.sleep(initial_delay)
+
+    while True:
+        try:
+            await AvailabilityIndex.rebuild()
+        except Exception:
+            logger.error("Availability index reconcile failed", exc_info=True)
+
+        await asyncio.sleep(interval)
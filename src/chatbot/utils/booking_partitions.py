@@ -0,0 +1,230 @@
+import asyncio
+import logging
+import re
+from datetime import date, datetime, timezone
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+from ..config.env import get_env
+from ..migrations.runner import MIGRATION_LOCK_ID
+
+
+logger = logging.getLogger(__name__)
+
+# Months ahead of the current one that always have a partition
+PARTITION_MONTHS_AHEAD = int(get_env("BOOKING_PARTITION_MONTHS_AHEAD", 4))
+# Full past months kept attached; older ones move to ARCHIVE_SCHEMA (0 keeps everything)
+BOOKING_RETENTION_MONTHS = int(get_env("BOOKING_RETENTION_MONTHS", 12))
+PARTITION_MAINTENANCE_INTERVAL = int(get_env("BOOKING_PARTITION_INTERVAL_SECONDS", 6 * 3600))
+
+PARENT_TABLE = "bookings"
+DEFAULT_PARTITION = "bookings_default"
+ARCHIVE_SCHEMA = "bookings_archive"
+
+PARTITION_NAME_RE = re.compile(r"^bookings_p(\d{4})(\d{2})$")
+
+
+def add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def current_month() -> date:
+    return datetime.now(timezone.utc).date().replace(day=1)
+
+
+def partition_name(month: date) -> str:
+    return f"bookings_p{month:%Y%m}"
+
+
+def _bound(month: date) -> str:
+    # Built from a date we generated, never from input, so it is safe to inline
+    return f"'{month.isoformat()} 00:00:00+00'"
+
+
+def is_partitioned(conn: Connection) -> bool:
+    return conn.execute(text(
+        """
+        SELECT c.relkind = 'p'
+        FROM pg_class c
+        JOIN pg_namespace ns ON ns.oid = c.relnamespace
+        WHERE c.relname = :parent AND ns.nspname = current_schema()
+        """
+    ), {"parent": PARENT_TABLE}).scalar() or False
+
+
+def list_partitions(conn: Connection) -> Dict[date, str]:
+    """Monthly partitions currently attached to bookings, by first day of month."""
+    names = conn.execute(text(
+        """
+        SELECT child.relname
+        FROM pg_inherits
+        JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+        JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+        JOIN pg_namespace ns ON ns.oid = parent.relnamespace
+        WHERE parent.relname = :parent AND ns.nspname = current_schema()
+        """
+    ), {"parent": PARENT_TABLE}).scalars().all()
+
+    partitions = {}
+    for name in names:
+        match = PARTITION_NAME_RE.match(name)
+        if match:
+            partitions[date(int(match.group(1)), int(match.group(2)), 1)] = name
+
+    return partitions
+
+
+def create_partition(conn: Connection, month: date):
+    """
+    Adds the partition for month. Rows already sitting in the default
+    partition for that month are moved into it first; attaching a range the
+    default partition still holds rows for would fail. Must run in its own
+    transaction, committed by the caller.
+    """
+    name = partition_name(month)
+    params = {
+        "start": datetime(month.year, month.month, 1, tzinfo=timezone.utc),
+        "end": datetime.combine(add_months(month, 1), datetime.min.time(), tzinfo=timezone.utc),
+    }
+
+    # Held until commit: no insert can land in the default partition between
+    # the move and the attach. Inserts routed to other partitions are not blocked.
+    conn.exec_driver_sql(f"LOCK TABLE {DEFAULT_PARTITION} IN SHARE ROW EXCLUSIVE MODE")
+
+    conn.exec_driver_sql(
+        f"CREATE TABLE {name} (LIKE {PARENT_TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+    )
+
+    moved = conn.execute(text(
+        f"""
+        WITH moved AS (
+            DELETE FROM {DEFAULT_PARTITION}
+            WHERE booking_datetime >= :start AND booking_datetime < :end
+            RETURNING *
+        )
+        INSERT INTO {name} SELECT * FROM moved
+        """
+    ), params).rowcount
+
+    # Partitioned indexes and the primary key are created on attach
+    conn.exec_driver_sql(
+        f"ALTER TABLE {PARENT_TABLE} ATTACH PARTITION {name} "
+        f"FOR VALUES FROM ({_bound(month)}) TO ({_bound(add_months(month, 1))})"
+    )
+
+    logger.info(f"Booking partition created | partition={name} | moved_from_default={moved}")
+
+
+def archive_partition(conn: Connection, name: str):
+    # The detached table keeps its rows and indexes, just outside the hot set
+    conn.exec_driver_sql(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}")
+    conn.exec_driver_sql(f"ALTER TABLE {name} SET SCHEMA {ARCHIVE_SCHEMA}")
+
+    logger.info(f"Booking partition archived | partition={ARCHIVE_SCHEMA}.{name}")
+
+
+def maintain_partitions(
+    engine: Engine,
+    months_ahead: int = PARTITION_MONTHS_AHEAD,
+    retention_months: int = BOOKING_RETENTION_MONTHS,
+    on_archive: Optional[Callable[[str], None]] = None
+) -> dict:
+    """
+    Creates missing partitions from the current month through months_ahead
+    and archives those older than retention_months. Each partition change
+    commits on its own; on_archive is called after each archive commits.
+    Returns the partitions touched.
+    """
+    created: List[str] = []
+    archived: List[str] = []
+
+    with engine.connect() as conn:
+        # Shares the migrations lock: only one worker runs partition DDL at a time,
+        # and never while a migration is rewriting the table
+        locked = conn.execute(
+            text("SELECT pg_try_advisory_lock(:id)"), {"id": MIGRATION_LOCK_ID}
+        ).scalar()
+        conn.commit()
+
+        if not locked:
+            logger.info("Booking partition maintenance skipped, lock held elsewhere")
+            return {"created": created, "archived": archived}
+
+        try:
+            if not is_partitioned(conn):
+                conn.commit()
+                logger.warning("Bookings table is not partitioned yet; apply migration 0005")
+                return {"created": created, "archived": archived}
+
+            this_month = current_month()
+            existing = list_partitions(conn)
+            conn.commit()
+
+            for offset in range(months_ahead + 1):
+                month = add_months(this_month, offset)
+                if month in existing:
+                    continue
+
+                create_partition(conn, month)
+                conn.commit()
+                created.append(partition_name(month))
+
+            if retention_months > 0:
+                cutoff = add_months(this_month, -retention_months)
+
+                for month, name in sorted(existing.items()):
+                    if month >= cutoff:
+                        break
+
+                    archive_partition(conn, name)
+                    conn.commit()
+                    archived.append(name)
+
+                    if on_archive is not None:
+                        on_archive(name)
+
+        except Exception:
+            conn.rollback()
+            raise
+
+        finally:
+            conn.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": MIGRATION_LOCK_ID})
+            conn.commit()
+
+    if created or archived:
+        logger.info(f"Booking partitions maintained | created={created} | archived={archived}")
+
+    return {"created": created, "archived": archived}
+
+
+async def run_partition_loop(
+    engine: Engine,
+    on_archive: Optional[Callable[[], Awaitable[None]]] = None,
+    interval: int = PARTITION_MAINTENANCE_INTERVAL
+):
+    """
+    on_archive runs on the event loop after each archived partition; archived
+    rows drop out of the API, so cached bookings responses must go too.
+    """
+    loop = asyncio.get_running_loop()
+
+    def archived(name: str):
+        if on_archive is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(on_archive(), loop).result()
+        except Exception:
+            logger.error(f"Cache invalidation failed after archiving {name}", exc_info=True)
+
+    while True:
+        try:
+            await asyncio.to_thread(
+                maintain_partitions, engine, on_archive=archived
+            )
+        except Exception:
+            logger.error("Booking partition maintenance failed", exc_info=True)
+
+        await asyncio.sleep(interval)
@@ -0,0 +1,318 @@
+import csv
+import io
+import json
+import logging
+from datetime import datetime, timezone
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional
+
+from pydantic import ValidationError
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from .uuid_generator import get_uuid
+from .calendar_engine import BookingCalendar
+from .email_utils import send_booking_email
+from src.chatbot.models.booking import Bookings
+from ..validations.booking_validations import CreateBooking
+
+
+logger = logging.getLogger(__name__)
+
+BULK_CHUNK_SIZE = 1000
+MAX_REPORTED_ERRORS = 100
+
+BOOKING_COLUMNS = [
+    "id",
+    "name",
+    "business_name",
+    "work_email",
+    "contact_number",
+    "booking_datetime",
+    "message",
+    "timezone",
+]
+
+STAGING_TABLE = "bookings_import_staging"
+
+SUPPORTED_FORMATS = ("csv", "ndjson")
+
+
+# --------------------------------------------------
+# Parsing
+# --------------------------------------------------
+
+def detect_format(fmt: Optional[str], content_type: Optional[str] = None) -> str:
+    if fmt:
+        fmt = fmt.lower()
+    elif content_type and ("ndjson" in content_type or "jsonl" in content_type):
+        fmt = "ndjson"
+    else:
+        fmt = "csv"
+
+    if fmt not in SUPPORTED_FORMATS:
+        raise ValueError(f"Unsupported format '{fmt}'")
+
+    return fmt
+
+
+def iter_rows(stream: IO[str], fmt: str) -> Iterator[Any]:
+    """
+    Yields one value per record. NDJSON lines that are not valid JSON are
+    yielded as their raw text, so the importer reports them per row.
+    """
+    if fmt == "csv":
+        yield from csv.DictReader(stream)
+        return
+
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            yield line
+
+
+def chunked(rows: Iterable[Dict], size: int = BULK_CHUNK_SIZE) -> Iterator[List[Dict]]:
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+# --------------------------------------------------
+# Import
+# --------------------------------------------------
+
+class BulkBookingImporter:
+    """
+    Streams validated rows into a temporary staging table with COPY, then
+    moves them into bookings with one set-based INSERT ... SELECT that skips
+    slots that are already taken (in the table or earlier in the same file).
+
+    Rows must be upcoming calendar slots, like POST /api/v1/booking/, unless
+    allow_historical is set for migrating past bookings from another system.
+    """
+
+    def __init__(self, db: Session, allow_historical: bool = False):
+        self.db = db
+        self.allow_historical = allow_historical
+        self.row_number = 0
+        self.staged = 0
+        self.errors: List[Dict] = []
+        self.error_count = 0
+        self.inserted_ids: List = []
+
+        self.cursor = db.connection().connection.cursor()
+        self.cursor.execute(
+            f"""
+            CREATE TEMP TABLE {STAGING_TABLE} (
+                row_number INTEGER NOT NULL,
+                id UUID NOT NULL,
+                name TEXT NOT NULL,
+                business_name TEXT NOT NULL,
+                work_email TEXT NOT NULL,
+                contact_number TEXT NOT NULL,
+                booking_datetime TIMESTAMPTZ NOT NULL,
+                message TEXT,
+                timezone TEXT NOT NULL
+            ) ON COMMIT DROP
+            """
+        )
+
+    def _record_error(self, row_number: int, errors):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": row_number, "errors": errors})
+
+    def add_rows(self, rows: List[Any]):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        utc_now = datetime.now(timezone.utc)
+
+        for row in rows:
+            self.row_number += 1
+
+            if not isinstance(row, dict):
+                self._record_error(self.row_number, "Row must be a JSON object")
+                continue
+
+            try:
+                booking = CreateBooking.model_validate(
+                    {k: v for k, v in row.items() if v not in ("", None)}
+                )
+            except ValidationError as e:
+                self._record_error(
+                    self.row_number,
+                    e.errors(include_url=False, include_context=False, include_input=False)
+                )
+                continue
+
+            if booking.booking_datetime.tzinfo is None:
+                self._record_error(self.row_number, "Timezone required")
+                continue
+
+            # Same rules as POST /api/v1/booking/
+            if not self.allow_historical:
+                if booking.booking_datetime <= utc_now:
+                    self._record_error(self.row_number, "Past booking not allowed")
+                    continue
+
+                if not BookingCalendar.is_bookable(booking.booking_datetime):
+                    self._record_error(self.row_number, "Invalid time slot")
+                    continue
+
+            writer.writerow([
+                self.row_number,
+                get_uuid(),
+                booking.name,
+                booking.business_name,
+                booking.work_email,
+                booking.contact_number,
+                booking.booking_datetime.isoformat(),
+                booking.message,
+                booking.timezone,
+            ])
+            self.staged += 1
+
+        buffer.seek(0)
+        self.cursor.copy_expert(
+            f"COPY {STAGING_TABLE} (row_number, {', '.join(BOOKING_COLUMNS)}) "
+            "FROM STDIN WITH (FORMAT csv)",
+            buffer
+        )
+
+    def finish(self) -> Dict:
+        columns = ", ".join(BOOKING_COLUMNS)
+        staged_columns = ", ".join(f"s.{column}" for column in BOOKING_COLUMNS)
+
+        # DISTINCT ON keeps the first row per slot; NOT EXISTS drops taken slots
+        self.cursor.execute(
+            f"""
+            INSERT INTO bookings ({columns})
+            SELECT DISTINCT ON (s.booking_datetime) {staged_columns}
+            FROM {STAGING_TABLE} s
+            WHERE NOT EXISTS (
+                SELECT 1 FROM bookings b
+                WHERE b.booking_datetime = s.booking_datetime
+            )
+            ORDER BY s.booking_datetime, s.row_number
+            RETURNING id
+            """
+        )
+        inserted_ids = [row[0] for row in self.cursor.fetchall()]
+
+        self.db.commit()
+
+        summary = {
+            "received": self.row_number,
+            "inserted": len(inserted_ids),
+            "conflicts": self.staged - len(inserted_ids),
+            "invalid": self.error_count,
+            "errors": self.errors,
+        }
+
+        logger.info(
+            f"Bulk import finished | received={summary['received']} "
+            f"inserted={summary['inserted']} conflicts={summary['conflicts']} "
+            f"invalid={summary['invalid']}"
+        )
+
+        self.inserted_ids = inserted_ids
+        return summary
+
+    def send_emails(self):
+        # Historical imports may include past bookings; nobody needs a confirmation for those
+        utc_now = datetime.now(timezone.utc)
+
+        for chunk in chunked(self.inserted_ids):
+            bookings = self.db.execute(
+                select(Bookings).where(
+                    Bookings.id.in_(chunk),
+                    Bookings.booking_datetime > utc_now
+                )
+            ).scalars().all()
+
+            for booking in bookings:
+                send_booking_email(booking, priority=False)
+
+
+def import_bookings(
+    db: Session,
+    stream: IO[str],
+    fmt: str = "csv",
+    send_emails: bool = False,
+    allow_historical: bool = False
+) -> Dict:
+    try:
+        importer = BulkBookingImporter(db, allow_historical=allow_historical)
+
+        for rows in chunked(iter_rows(stream, fmt)):
+            importer.add_rows(rows)
+
+        summary = importer.finish()
+
+    except Exception:
+        db.rollback()
+        raise
+
+    if send_emails:
+        importer.send_emails()
+
+    return summary
+
+
+# --------------------------------------------------
+# Export
+# --------------------------------------------------
+
+def export_bookings(
+    db: Session,
+    out: IO,
+    fmt: str = "csv",
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None
+):
+    """Write bookings ordered by booking_datetime to a binary file object."""
+    if fmt == "csv":
+        conditions = []
+        params = {}
+        if start:
+            conditions.append("booking_datetime >= %(start)s")
+            params["start"] = start
+        if end:
+            conditions.append("booking_datetime < %(end)s")
+            params["end"] = end
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        cursor = db.connection().connection.cursor()
+        query = cursor.mogrify(
+            f"SELECT {', '.join(BOOKING_COLUMNS)} FROM bookings {where} "
+            "ORDER BY booking_datetime",
+            params
+        ).decode()
+
+        cursor.copy_expert(f"COPY ({query}) TO STDOUT WITH (FORMAT csv, HEADER)", out)
+        return
+
+    statement = select(*[getattr(Bookings, column) for column in BOOKING_COLUMNS])
+    if start:
+        statement = statement.where(Bookings.booking_datetime >= start)
+    if end:
+        statement = statement.where(Bookings.booking_datetime < end)
+
+    result = db.execute(
+        statement.order_by(Bookings.booking_datetime).execution_options(yield_per=BULK_CHUNK_SIZE)
+    )
+
+    for row in result:
+        record = dict(row._mapping)
+        record["id"] = str(record["id"])
+        record["booking_datetime"] = record["booking_datetime"].isoformat()
+        out.write((json.dumps(record) + "\n").encode("utf-8"))
@@ -20,3 +20,13 @@ class CacheUtils:
     async def delete(key: str):
         client = await RedisClient.get_client()
         await client.delete(key)
+
+    @staticmethod
+    async def set_raw(key: str, value: str, expire: int = 300):
+        client = await RedisClient.get_client()
+        await client.set(key, value, ex=expire)
+
+    @staticmethod
+    async def get_raw(key: str):
+        client = await RedisClient.get_client()
+        return await client.get(key)
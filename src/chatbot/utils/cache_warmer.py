@@ -0,0 +1,94 @@
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Dict
+
+from ..config.env import get_env
+from ..config.redis import RedisClient
+
+
+logger = logging.getLogger(__name__)
+
+WARMUP_TIMEOUT = float(get_env("WARMUP_TIMEOUT_SECONDS", 20))
+REFRESH_AHEAD_SECONDS = int(get_env("CACHE_REFRESH_AHEAD_SECONDS", 60))
+REFRESH_CHECK_INTERVAL = int(get_env("CACHE_REFRESH_CHECK_INTERVAL", 15))
+
+WarmFn = Callable[[], Awaitable[None]]
+
+
+class CacheWarmer:
+    """
+    Startup warm-up plus refresh-ahead for hot Redis keys.
+
+    Warmups run once, concurrently, before the app starts serving. Hot keys
+    are polled for their TTL and rebuilt by their refresh function once they
+    are within refresh_ahead seconds of expiring (or already gone), so
+    requests keep finding them populated.
+    """
+
+    def __init__(
+        self,
+        refresh_ahead: int = REFRESH_AHEAD_SECONDS,
+        check_interval: int = REFRESH_CHECK_INTERVAL
+    ):
+        self.refresh_ahead = refresh_ahead
+        self.check_interval = check_interval
+        self._warmups: Dict[str, WarmFn] = {}
+        self._hot_keys: Dict[str, WarmFn] = {}
+
+    def add_warmup(self, name: str, fn: WarmFn):
+        self._warmups[name] = fn
+
+    def add_hot_key(self, key: str, refresh_fn: WarmFn):
+        self._hot_keys[key] = refresh_fn
+
+    async def _timed(self, name: str, fn: WarmFn):
+        start = time.perf_counter()
+        try:
+            await fn()
+            logger.info(f"Warmed {name} | {round((time.perf_counter() - start) * 1000, 2)}ms")
+        except Exception:
+            # A cold cache is slower, not fatal; the request path still works
+            logger.warning(f"Warm-up failed | {name}", exc_info=True)
+
+    async def warm(self, timeout: float = WARMUP_TIMEOUT):
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*(self._timed(name, fn) for name, fn in self._warmups.items())),
+                timeout
+            )
+        except asyncio.TimeoutError:
+            logger.warning(f"Warm-up did not finish within {timeout}s, continuing startup")
+
+    async def refresh_expiring(self) -> int:
+        if not self._hot_keys:
+            return 0
+
+        keys = list(self._hot_keys)
+        client = await RedisClient.get_client()
+        async with client.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.ttl(key)
+            ttls = await pipe.execute()
+
+        # -2: missing, -1: no expiry (never refreshed)
+        due = [
+            key for key, ttl in zip(keys, ttls)
+            if ttl == -2 or 0 <= ttl <= self.refresh_ahead
+        ]
+
+        for key in due:
+            await self._timed(f"hot key {key}", self._hot_keys[key])
+
+        return len(due)
+
+    async def run_refresh_loop(self):
+        while True:
+            await asyncio.sleep(self.check_interval)
+            try:
+                await self.refresh_expiring()
+            except Exception:
+                logger.error("Cache refresh-ahead pass failed", exc_info=True)
+
+
+cache_warmer = CacheWarmer()
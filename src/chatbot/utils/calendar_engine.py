@@ -0,0 +1,277 @@
+import bisect
+import hashlib
+import json
+import logging
+import os
+import time as time_module
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
+from ..config.env import get_env
+from .timezone_utils import get_zone
+
+
+logger = logging.getLogger(__name__)
+
+CALENDAR_FILE = get_env(
+    "BOOKING_CALENDAR_FILE",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), "config", "booking_calendar.json")
+)
+# How often (seconds) the calendar file is checked for edits
+CALENDAR_RELOAD_INTERVAL = float(get_env("BOOKING_CALENDAR_RELOAD_INTERVAL", 30))
+
+WEEKDAYS = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+
+
+def _parse_time(value: str) -> time:
+    return datetime.strptime(value, "%H:%M").time()
+
+
+def _parse_datetime(value: str) -> datetime:
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        raise ValueError(f"Blackout datetime needs a UTC offset: {value}")
+    return parsed.astimezone(timezone.utc)
+
+
+@dataclass(frozen=True)
+class CalendarConfig:
+    """
+    Working calendar for demo slots. weekly_hours, holidays and blackouts are
+    interpreted in the calendar's own timezone; slots are stored in UTC.
+    """
+    timezone: str
+    slot_minutes: int
+    lead_days: int
+    default_days: int
+    horizon_days: int
+    weekly_hours: Dict[int, Tuple[Tuple[time, time], ...]]
+    holidays: FrozenSet[date]
+    blackouts: Tuple[Tuple[datetime, datetime], ...]
+    version: str
+
+    @classmethod
+    def from_dict(cls, raw: dict) -> "CalendarConfig":
+        """Raises ValueError for an invalid calendar."""
+        tz_name = raw.get("timezone", "UTC")
+        get_zone(tz_name)
+
+        slot_minutes = int(raw.get("slot_minutes", 60))
+        if not 5 <= slot_minutes <= 24 * 60:
+            raise ValueError("slot_minutes must be between 5 and 1440")
+
+        horizon_days = int(raw.get("horizon_days", 90))
+        default_days = int(raw.get("default_days", 10))
+        lead_days = int(raw.get("lead_days", 1))
+        if horizon_days < 1 or not 1 <= default_days <= horizon_days or lead_days < 0:
+            raise ValueError("Need horizon_days >= default_days >= 1 and lead_days >= 0")
+
+        weekly_hours = {}
+        for name, intervals in raw.get("weekly_hours", {}).items():
+            if name not in WEEKDAYS:
+                raise ValueError(f"Unknown weekday: {name}")
+
+            parsed = []
+            for start, end in intervals:
+                start_time, end_time = _parse_time(start), _parse_time(end)
+                if end_time <= start_time:
+                    raise ValueError(f"Working hours end before they start: {name} {start}-{end}")
+                parsed.append((start_time, end_time))
+
+            weekly_hours[WEEKDAYS.index(name)] = tuple(sorted(parsed))
+
+        holidays = frozenset(date.fromisoformat(day) for day in raw.get("holidays", []))
+
+        blackouts = tuple(
+            (_parse_datetime(item["start"]), _parse_datetime(item["end"]))
+            for item in raw.get("blackouts", [])
+        )
+
+        version = hashlib.sha1(
+            json.dumps(raw, sort_keys=True).encode("utf-8")
+        ).hexdigest()[:12]
+
+        return cls(
+            timezone=tz_name,
+            slot_minutes=slot_minutes,
+            lead_days=lead_days,
+            default_days=default_days,
+            horizon_days=horizon_days,
+            weekly_hours=weekly_hours,
+            holidays=holidays,
+            blackouts=blackouts,
+            version=version
+        )
+
+
+class SlotGrid:
+    """
+    Every slot start (UTC) the calendar offers from first_day (local) through
+    the horizon, sorted, plus a set for O(1) membership checks. Built once per
+    calendar version and local day; range queries are a bisect.
+    """
+
+    def __init__(self, config: CalendarConfig, first_day: date):
+        self.config = config
+        self.first_day = first_day
+        self.slots: List[datetime] = self._build()
+        self._slot_set: Set[datetime] = set(self.slots)
+
+    def _build(self) -> List[datetime]:
+        config = self.config
+        zone = get_zone(config.timezone)
+        step = timedelta(minutes=config.slot_minutes)
+        slots = []
+
+        for offset in range(config.horizon_days):
+            local_day = self.first_day + timedelta(days=offset)
+            if local_day in config.holidays:
+                continue
+
+            for start_time, end_time in config.weekly_hours.get(local_day.weekday(), ()):
+                slot = datetime.combine(local_day, start_time, tzinfo=zone)
+                end = datetime.combine(local_day, end_time, tzinfo=zone)
+
+                while slot + step <= end:
+                    slot_utc = slot.astimezone(timezone.utc)
+                    if not self._blacked_out(slot_utc, step):
+                        slots.append(slot_utc)
+                    slot += step
+
+        slots.sort()
+        return slots
+
+    def _blacked_out(self, slot_start: datetime, step: timedelta) -> bool:
+        slot_end = slot_start + step
+        return any(
+            start < slot_end and slot_start < end
+            for start, end in self.config.blackouts
+        )
+
+    def between(self, start: datetime, end: datetime) -> List[datetime]:
+        """Slots with start <= slot < end."""
+        lo = bisect.bisect_left(self.slots, start)
+        hi = bisect.bisect_left(self.slots, end)
+        return self.slots[lo:hi]
+
+    def contains(self, slot: datetime) -> bool:
+        return slot.astimezone(timezone.utc) in self._slot_set
+
+    def next_after(self, moment: datetime) -> Optional[datetime]:
+        index = bisect.bisect_right(self.slots, moment)
+        return self.slots[index] if index < len(self.slots) else None
+
+
+class BookingCalendar:
+    """
+    Loads the calendar file, reloads it when it changes on disk, and keeps
+    the precomputed SlotGrid for the current version and day.
+    """
+
+    _config: Optional[CalendarConfig] = None
+    _mtime: Optional[float] = None
+    _checked_at = 0.0
+    _grid: Optional[SlotGrid] = None
+
+    @classmethod
+    def _load(cls):
+        mtime = os.path.getmtime(CALENDAR_FILE)
+        with open(CALENDAR_FILE, "r", encoding="utf-8") as f:
+            config = CalendarConfig.from_dict(json.load(f))
+
+        if cls._config is None or config.version != cls._config.version:
+            logger.info(f"Booking calendar loaded | version={config.version}")
+
+        cls._config = config
+        cls._mtime = mtime
+
+    @classmethod
+    def get_config(cls) -> CalendarConfig:
+        now = time_module.monotonic()
+
+        if cls._config is None:
+            cls._load()
+            cls._checked_at = now
+
+        elif now - cls._checked_at >= CALENDAR_RELOAD_INTERVAL:
+            cls._checked_at = now
+            try:
+                if os.path.getmtime(CALENDAR_FILE) != cls._mtime:
+                    cls._load()
+            except Exception:
+                # Keep serving the last good calendar
+                logger.error("Booking calendar reload failed", exc_info=True)
+
+        return cls._config
+
+    @classmethod
+    def local_today(cls) -> date:
+        config = cls.get_config()
+        return datetime.now(get_zone(config.timezone)).date()
+
+    @classmethod
+    def grid(cls) -> SlotGrid:
+        config = cls.get_config()
+        first_day = cls.local_today() + timedelta(days=config.lead_days)
+
+        grid = cls._grid
+        if grid is None or grid.config.version != config.version or grid.first_day != first_day:
+            grid = SlotGrid(config, first_day)
+            cls._grid = grid
+            logger.info(f"Slot grid built | version={config.version} | slots={len(grid.slots)}")
+
+        return grid
+
+    @classmethod
+    def version(cls) -> str:
+        return cls.get_config().version
+
+    @classmethod
+    def slot_epoch(cls) -> str:
+        """
+        Changes whenever the set of offerable slots does: when the next slot
+        starts (and drops out as past) or the grid rolls to a new day. Part
+        of every availability cache key and ETag.
+        """
+        upcoming = cls.grid().next_after(datetime.now(timezone.utc))
+        return upcoming.isoformat() if upcoming else "none"
+
+    @classmethod
+    def is_bookable(cls, slot: datetime) -> bool:
+        return cls.grid().contains(slot)
+
+    @classmethod
+    def window(cls) -> Tuple[date, date]:
+        """First and last UTC dates the grid can contain slots on."""
+        grid = cls.grid()
+        if not grid.slots:
+            today = datetime.now(timezone.utc).date()
+            return today, today
+        return grid.slots[0].date(), grid.slots[-1].date()
+
+    @classmethod
+    def resolve_range(cls, start: Optional[date], end: Optional[date]) -> Tuple[date, date]:
+        """
+        Defaults and validates an inclusive UTC date range for availability
+        queries. Raises ValueError when the range is reversed or too long.
+        """
+        config = cls.get_config()
+        first_day = datetime.now(timezone.utc).date() + timedelta(days=config.lead_days)
+
+        start = start or first_day
+        end = end or start + timedelta(days=config.default_days - 1)
+
+        if end < start:
+            raise ValueError("'to' must not be before 'from'")
+        if (end - start).days + 1 > config.horizon_days:
+            raise ValueError(f"Range may span at most {config.horizon_days} days")
+
+        return start, end
+
+    @classmethod
+    def slots_between(cls, start: date, end: date) -> List[datetime]:
+        """Slots on UTC dates start..end inclusive."""
+        range_start = datetime(start.year, start.month, start.day, tzinfo=timezone.utc)
+        range_end = datetime(end.year, end.month, end.day, tzinfo=timezone.utc) + timedelta(days=1)
+        return cls.grid().between(range_start, range_end)
@@ -1,17 +1,23 @@
-import smtplib
+import logging
 from email.message import EmailMessage
-import os
-from dotenv import load_dotenv
-from datetime import timezone
 from zoneinfo import ZoneInfo
 
-load_dotenv()
+from ..config.env import get_env
+from .smtp_pool import SMTPConnectionPool
+from .template_utils import load_template
+from .timezone_utils import get_zone
 
-SMTP_HOST = os.getenv("SMTP_HOST")
-SMTP_PORT = int(os.getenv("SMTP_PORT", 587))
-SMTP_USER = os.getenv("SMTP_USER")
-SMTP_PASS = os.getenv("SMTP_PASS")
-COMPANY_EMAIL = os.getenv("COMPANY_EMAIL")
+SMTP_HOST = get_env("SMTP_HOST")
+SMTP_PORT = int(get_env("SMTP_PORT", 587))
+SMTP_USER = get_env("SMTP_USER")
+SMTP_PASS = get_env("SMTP_PASS")
+COMPANY_EMAIL = get_env("COMPANY_EMAIL")
+
+SMTP_CONFIGURED = bool(SMTP_HOST and SMTP_USER and SMTP_PASS)
+
+logger = logging.getLogger(__name__)
+
+smtp_pool = SMTPConnectionPool(SMTP_HOST, SMTP_PORT, SMTP_USER, SMTP_PASS)
 
 IST = ZoneInfo("Asia/Kolkata")
 
@@ -29,13 +35,22 @@ def format_datetime(dt, tz: ZoneInfo):
     return date_str, time_str
 
 
+# ---------------------------------------------------------
+# TEMPLATES (compiled once at import, see templates/)
+# ---------------------------------------------------------
+
+USER_TEMPLATE = load_template("booking_user_email.html")
+COMPANY_TEMPLATE = load_template("booking_company_email.html")
+REMINDER_TEMPLATE = load_template("booking_reminder_email.html")
+
+
 # ---------------------------------------------------------
 # USER EMAIL TEMPLATE (User Timezone)
 # ---------------------------------------------------------
 
 def generate_user_email_template(booking):
 
-    user_tz = ZoneInfo(
+    user_tz = get_zone(
         booking.timezone if booking.timezone else "UTC"
     )
 
@@ -44,107 +59,13 @@ def generate_user_email_template(booking):
         user_tz
     )
 
-    return f"""
-    <!DOCTYPE html>
-<html>
-<head>
-<meta charset="UTF-8">
-<title>OneTracker Demo Confirmation</title>
-</head>
-
-<body style="margin:0; padding:0; background-color:#f4f6f9; font-family:Segoe UI, Arial, sans-serif;">
-
-<table width="100%" cellpadding="0" cellspacing="0" border="0" style="background-color:#f4f6f9; padding:30px 0;">
-<tr>
-<td align="center">
-
-<!-- Main Container -->
-<table width="600" cellpadding="0" cellspacing="0" border="0" style="background-color:#ffffff; border-collapse:collapse;">
-
-    <!-- Header -->
-    <tr>
-        <td style="background-color:#F4B400; padding:30px 40px; color:#ffffff;">
-            <span style="font-size:24px; font-weight:700; letter-spacing:0.5px;">
-                OneTracker Technologies Pvt. Ltd.
-            </span>
-        </td>
-    </tr>
-
-    <!-- Body Content -->
-    <tr>
-        <td style="padding:40px; color:#1f2937; font-size:14px; line-height:1.6;">
-
-            <p style="margin:0 0 16px 0;">
-                Dear <strong>{booking.name}</strong>,
-            </p>
-
-            <p style="margin:0 0 16px 0;">
-                Thank you for scheduling a product demonstration with <strong>OneTracker</strong>.
-                We look forward to discussing how our tracking solutions can support 
-                <strong>{booking.business_name}</strong>.
-            </p>
-
-            <!-- Meeting Details Box -->
-            <table width="100%" cellpadding="0" cellspacing="0" border="0" 
-                   style="margin:25px 0; background-color:#f9fafb; border:1px solid #e5e7eb;">
-                <tr>
-                    <td style="padding:20px; border-left:4px solid #229EBC ;">
-                        
-                        <p style="margin:0 0 12px 0; font-size:13px; font-weight:600; color:#F4B400; text-transform:uppercase;">
-                            Meeting Details
-                        </p>
-
-                        <p style="margin:0 0 8px 0;">
-                            <strong>Date:</strong> {date_str}
-                        </p>
-
-                        <p style="margin:0 0 8px 0;">
-                            <strong>Time:</strong> {time_str} ({booking.timezone})
-                        </p>
-
-                        <p style="margin:0;">
-                            <strong>Platform:</strong> Video Conference
-                        </p>
-
-                    </td>
-                </tr>
-            </table>
-
-           
-
-            
-
-            <p style="margin:25px 0 0 0;">
-                Regards,<br>
-                <strong>The OneTracker Team</strong><br>
-               <br>
-                <img src="https://onetraker.com/wp-content/uploads/2025/09/ot_logo_1_1_small.png" alt="OneTracker_logo">
-                <br>
-                 OneTracker Technologies Pvt. Ltd.
-               
-            </p>
-
-        </td>
-    </tr>
-
-    <!-- Footer -->
-    <tr>
-        <td style="background-color:#f9fafb; padding:25px 40px; font-size:12px; color:#6b7280; border-top:1px solid #e5e7eb;">
-            This is an automated confirmation email.<br><br>
-            © 2026 OneTracker Technologies Pvt. Ltd. All rights reserved.
-        </td>
-    </tr>
-
-</table>
-<!-- End Container -->
-
-</td>
-</tr>
-</table>
-
-</body>
-</html>
-    """
+    return USER_TEMPLATE.render(
+        name=booking.name,
+        business_name=booking.business_name,
+        date_str=date_str,
+        time_str=time_str,
+        timezone=booking.timezone
+    )
 
 
 # ---------------------------------------------------------
@@ -158,126 +79,61 @@ def generate_company_email_template(booking):
         IST
     )
 
-    return f"""
-    <!DOCTYPE html>
-<html>
-<head>
-<meta charset="UTF-8">
-<title>New Demo Booking Received</title>
-</head>
-
-<body style="margin:0; padding:0; background-color:#f4f6f9; font-family:Segoe UI, Arial, sans-serif;">
-
-<table width="100%" cellpadding="0" cellspacing="0" border="0" style="background-color:#f4f6f9; padding:30px 0;">
-<tr>
-<td align="center">
-
-<!-- Main Container -->
-<table width="600" cellpadding="0" cellspacing="0" border="0" style="background-color:#ffffff; border-collapse:collapse;">
-
-    <!-- Header -->
-    <tr>
-        <td style="background-color:#F4B400; padding:30px 40px; color:#e5e7eb;">
-            <span style="font-size:22px; font-weight:700;">
-                New Demo Booking Received
-            </span>
-        </td>
-    </tr>
-
-    <!-- Content -->
-    <tr>
-        <td style="padding:40px; color:#1f2937; font-size:14px; line-height:1.6;">
-
-            <p style="margin:0 0 20px 0;">
-                A new demo booking has been submitted via the OneTracker website.
-                The details are provided below for your review and follow-up.
-            </p>
-
-            <!-- Booking Details Box -->
-            <table width="100%" cellpadding="0" cellspacing="0" border="0" 
-                   style="margin:20px 0; background-color:#f9fafb; border:1px solid #e5e7eb;">
-                <tr>
-                    <td style="padding:20px; border-left:4px solid #229EBC;">
-
-                        <p style="margin:0 0 12px 0; font-size:13px; font-weight:600; color:#F4B400; text-transform:uppercase;">
-                            Booking Information
-                        </p>
-
-                        <p style="margin:0 0 8px 0;">
-                            <strong>Name:</strong> {booking.name}
-                        </p>
-
-                        <p style="margin:0 0 8px 0;">
-                            <strong>Business:</strong> {booking.business_name}
-                        </p>
-
-                        <p style="margin:0 0 8px 0;">
-                            <strong>Work Email:</strong> {booking.work_email}
-                        </p>
-
-                        <p style="margin:0 0 8px 0;">
-                            <strong>Contact Number:</strong> {booking.contact_number}
-                        </p>
-
-                        <p style="margin:0 0 8px 0;">
-                            <strong>Date (IST):</strong> {date_str}
-                        </p>
-
-                        <p style="margin:0 0 8px 0;">
-                            <strong>Time (IST):</strong> {time_str}
-                        </p>
-
-                        <p style="margin:0 0 8px 0;">
-                            <strong>User Timezone:</strong> {booking.timezone}
-                        </p>
-
-                        <p style="margin:0;">
-                            <strong>Message:</strong><br>
-                            {booking.message}
-                        </p>
-
-                    </td>
-                </tr>
-            </table>
-
-            <p style="margin:20px 0 0 0;">
-                Please ensure timely follow-up and schedule confirmation.
-            </p><br>
-             <img src="https://onetraker.com/wp-content/uploads/2025/09/ot_logo_1_1_small.png" alt="OneTracker_logo">
-
-        </td>
-    </tr>
-
-    <!-- Footer -->
-    <tr>
-        <td style="background-color:#f9fafb; padding:25px 40px; font-size:12px; color:#6b7280; border-top:1px solid #e5e7eb;">
-            This is an automated internal notification generated by the OneTracker booking system.<br><br>
-            © 2026 OneTracker Technologies Pvt. Ltd. All rights reserved.
-        </td>
-    </tr>
-
-</table>
-<!-- End Container -->
-
-</td>
-</tr>
-</table>
-
-</body>
-</html>
-    """
+    return COMPANY_TEMPLATE.render(
+        name=booking.name,
+        business_name=booking.business_name,
+        work_email=booking.work_email,
+        contact_number=booking.contact_number,
+        date_str=date_str,
+        time_str=time_str,
+        timezone=booking.timezone,
+        message=booking.message
+    )
+
+
+# ---------------------------------------------------------
+# REMINDER EMAIL TEMPLATE (User Timezone)
+# ---------------------------------------------------------
+
+def generate_reminder_email_template(booking, hours_left: int):
+
+    date_str, time_str = format_datetime(
+        booking.booking_datetime,
+        get_zone(booking.timezone if booking.timezone else "UTC")
+    )
+
+    return REMINDER_TEMPLATE.render(
+        name=booking.name,
+        business_name=booking.business_name,
+        date_str=date_str,
+        time_str=time_str,
+        timezone=booking.timezone,
+        hours_left=hours_left
+    )
+
+
+def build_reminder_message(booking, hours_left: int) -> EmailMessage:
+    msg = EmailMessage()
+    msg["Subject"] = "Reminder: Your OneTracker Demo"
+    msg["From"] = SMTP_USER
+    msg["To"] = booking.work_email
+
+    msg.set_content("Your email client does not support HTML.")
+    msg.add_alternative(
+        generate_reminder_email_template(booking, hours_left),
+        subtype="html"
+    )
+    return msg
 
 
 # ---------------------------------------------------------
 # SEND EMAIL FUNCTION
 # ---------------------------------------------------------
 
-def send_booking_email(booking):
+def send_booking_email(booking, priority: bool = True):
     try:
-        with smtplib.SMTP(SMTP_HOST, SMTP_PORT) as server:
-            server.starttls()
-            server.login(SMTP_USER, SMTP_PASS)
-
+        # Live confirmations may use the reserved connection; bulk sends pass priority=False
+        with smtp_pool.connection(priority=priority) as server:
             # -----------------------
             # Email to User
             # -----------------------
@@ -310,5 +166,5 @@ def send_booking_email(booking):
 
             server.send_message(company_msg)
 
-    except Exception as e:
-        print("Email sending failed:", str(e))
+    except Exception:
+        logger.error(f"Booking confirmation email failed | id={booking.id}", exc_info=True)
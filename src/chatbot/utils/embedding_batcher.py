@@ -0,0 +1,149 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+from ..config.env import get_env
+
+
+logger = logging.getLogger(__name__)
+
+EMBED_BATCH_MAX_SIZE = int(get_env("EMBED_BATCH_MAX_SIZE", 32))
+EMBED_BATCH_MAX_WAIT_MS = float(get_env("EMBED_BATCH_MAX_WAIT_MS", 5))
+# How long close() lets in-flight batches finish before cancelling them
+EMBED_BATCH_CLOSE_TIMEOUT = float(get_env("EMBED_BATCH_CLOSE_TIMEOUT", 5))
+
+EmbedFn = Callable[[List[str]], Awaitable[List[List[float]]]]
+
+
+class EmbeddingBatcher:
+    """
+    Collects embedding requests that arrive within a few milliseconds of each
+    other and sends them upstream as a single batched call. Every caller gets
+    back its own vector through a future.
+    """
+
+    def __init__(
+        self,
+        embed_fn: EmbedFn,
+        max_batch_size: int = EMBED_BATCH_MAX_SIZE,
+        max_wait_ms: float = EMBED_BATCH_MAX_WAIT_MS
+    ):
+        self.embed_fn = embed_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._inflight: set = set()
+        # Taken off the queue but not yet dispatched; failed by close()
+        self._collecting: List[Tuple[str, asyncio.Future]] = []
+
+    def _ensure_worker(self):
+        if self._worker is not None and not self._worker.done():
+            return
+
+        if self._worker is not None and not self._worker.cancelled() and self._worker.exception():
+            logger.error("Embedding batch worker crashed, restarting", exc_info=self._worker.exception())
+
+        # Queue and task are bound to the running loop, so create them lazily.
+        # A restarted worker keeps the old queue, so queued callers are still served.
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._run())
+
+    async def embed(self, text: str) -> List[float]:
+        self._ensure_worker()
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, future))
+
+        return await future
+
+    async def _collect_batch(self) -> List[Tuple[str, asyncio.Future]]:
+        batch = self._collecting = [await self._queue.get()]
+        deadline = asyncio.get_running_loop().time() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - asyncio.get_running_loop().time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        return batch
+
+    async def _run(self):
+        while True:
+            batch = await self._collect_batch()
+            self._collecting = []
+            pending = [(text, fut) for text, fut in batch if not fut.cancelled()]
+
+            if not pending:
+                continue
+
+            # Dispatch without awaiting so the next batch can form while
+            # this one is still in flight
+            task = asyncio.create_task(self._dispatch(pending))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def _dispatch(self, pending: List[Tuple[str, asyncio.Future]]):
+        try:
+            vectors = await self.embed_fn([text for text, _ in pending])
+
+            if len(vectors) != len(pending):
+                raise ValueError(
+                    f"Expected {len(pending)} embeddings, got {len(vectors)}"
+                )
+
+            for (_, fut), vector in zip(pending, vectors):
+                if not fut.done():
+                    fut.set_result(vector)
+
+            logger.debug(f"Embedded batch of {len(pending)} queries")
+
+        except Exception as e:
+            logger.error("Batched embedding request failed", exc_info=True)
+            self._fail(pending, e)
+
+        except asyncio.CancelledError:
+            self._fail(pending, RuntimeError("Embedding batcher closed"))
+            raise
+
+    @staticmethod
+    def _fail(pending: List[Tuple[str, asyncio.Future]], error: BaseException):
+        for _, fut in pending:
+            if not fut.done():
+                fut.set_exception(error)
+
+    async def close(self):
+        """
+        Stops the worker and resolves every caller: in-flight batches get
+        EMBED_BATCH_CLOSE_TIMEOUT to finish, everything else fails.
+        """
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            except Exception:
+                logger.error("Embedding batch worker had crashed", exc_info=True)
+            self._worker = None
+
+        closed = RuntimeError("Embedding batcher closed")
+
+        self._fail(self._collecting, closed)
+        self._collecting = []
+
+        if self._queue is not None:
+            while not self._queue.empty():
+                self._fail([self._queue.get_nowait()], closed)
+            self._queue = None
+
+        if self._inflight:
+            _, still_running = await asyncio.wait(set(self._inflight), timeout=EMBED_BATCH_CLOSE_TIMEOUT)
+            for task in still_running:
+                task.cancel()
+            await asyncio.gather(*still_running, return_exceptions=True)
@@ -0,0 +1,38 @@
+import hashlib
+import json
+from typing import List, Optional
+
+from ..config.env import get_env
+from ..config.redis import RedisClient
+
+
+EMBEDDING_CACHE_TTL = int(get_env("EMBEDDING_CACHE_TTL", 86400))
+
+KEY_PREFIX = "embedding"
+
+
+def normalize_query(text: str) -> str:
+    # "What is OneTracker?" and "what is  onetracker" share one vector
+    return " ".join(text.lower().split()).rstrip("?!. ")
+
+
+class EmbeddingCache:
+    """Query embeddings in Redis, keyed by model and normalized text."""
+
+    @staticmethod
+    def key_for(model: str, text: str) -> str:
+        digest = hashlib.sha1(normalize_query(text).encode("utf-8")).hexdigest()
+        return f"{KEY_PREFIX}:{model}:{digest}"
+
+    @staticmethod
+    async def get(model: str, text: str) -> Optional[List[float]]:
+        client = await RedisClient.get_client()
+        data = await client.get(EmbeddingCache.key_for(model, text))
+        if data:
+            return json.loads(data)
+        return None
+
+    @staticmethod
+    async def set(model: str, text: str, vector: List[float], expire: int = EMBEDDING_CACHE_TTL):
+        client = await RedisClient.get_client()
+        await client.set(EmbeddingCache.key_for(model, text), json.dumps(vector), ex=expire)
@@ -0,0 +1,45 @@
+import hashlib
+from typing import Optional
+
+from fastapi import Response
+
+
+# Clients may keep the body but must revalidate it with If-None-Match
+ETAG_CACHE_CONTROL = "private, no-cache"
+
+
+def _opaque(tag: str) -> str:
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def make_etag(*parts) -> str:
+    """
+    Weak ETag for the content identified by parts (versions, params). Weak,
+    because the compression middleware sends the same content as identity,
+    gzip or br bodies that are not byte-for-byte equal.
+    """
+    digest = hashlib.sha1(":".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+    return f'W/"{digest[:20]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    # If-None-Match uses weak comparison: W/ prefixes are ignored on both sides
+    if not if_none_match:
+        return False
+
+    if if_none_match.strip() == "*":
+        return True
+
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return _opaque(etag) in (_opaque(tag) for tag in candidates)
+
+
+def etag_headers(etag: Optional[str]) -> dict:
+    if etag is None:
+        return {}
+    # Vary on 304s too, so shared caches keep one entry per encoding
+    return {"ETag": etag, "Cache-Control": ETAG_CACHE_CONTROL, "Vary": "Accept-Encoding"}
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers=etag_headers(etag))
@@ -0,0 +1,168 @@
+import hashlib
+import json
+import logging
+from typing import Awaitable, Callable, Optional, Tuple
+
+from fastapi import HTTPException, Response, status
+
+from ..config.env import get_env
+from ..config.redis import RedisClient
+
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_TTL = int(get_env("IDEMPOTENCY_TTL_SECONDS", 24 * 3600))
+IDEMPOTENCY_LOCK_TTL = int(get_env("IDEMPOTENCY_LOCK_TTL_SECONDS", 30))
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
+
+KEY_PREFIX = "idempotency"
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+# Stored result or lock in one round trip.
+# Returns {"done", stored} | {"acquired", ""} | {"locked", ""}
+BEGIN_LUA = """
+local stored = redis.call('GET', KEYS[1])
+if stored then
+    return {'done', stored}
+end
+if redis.call('SET', KEYS[2], ARGV[1], 'NX', 'EX', ARGV[2]) then
+    return {'acquired', ''}
+end
+return {'locked', ''}
+"""
+
+
+class IdempotencyInProgress(HTTPException):
+    def __init__(self):
+        super().__init__(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A request with this Idempotency-Key is still in progress",
+            headers={"Retry-After": "1"}
+        )
+
+
+def fingerprint(payload: str) -> str:
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class IdempotencyStore:
+    """
+    First response per (scope, key) kept in Redis for IDEMPOTENCY_TTL.
+    A short lock marks a key whose first request is still running.
+    """
+
+    _begin_script = None
+
+    @staticmethod
+    def _keys(scope: str, key: str) -> Tuple[str, str]:
+        base = f"{KEY_PREFIX}:{scope}:{key}"
+        return f"{base}:result", f"{base}:lock"
+
+    @classmethod
+    async def begin(cls, scope: str, key: str, request_hash: str) -> Tuple[str, Optional[dict]]:
+        client = await RedisClient.get_client()
+
+        if cls._begin_script is None:
+            cls._begin_script = client.register_script(BEGIN_LUA)
+
+        result_key, lock_key = cls._keys(scope, key)
+        state, stored = await cls._begin_script(
+            keys=[result_key, lock_key],
+            args=[request_hash, IDEMPOTENCY_LOCK_TTL]
+        )
+
+        return state, json.loads(stored) if stored else None
+
+    @classmethod
+    async def complete(cls, scope: str, key: str, request_hash: str, status_code: int, body: str):
+        client = await RedisClient.get_client()
+        result_key, lock_key = cls._keys(scope, key)
+
+        record = json.dumps({"fingerprint": request_hash, "status_code": status_code, "body": body})
+
+        async with client.pipeline(transaction=True) as pipe:
+            pipe.set(result_key, record, ex=IDEMPOTENCY_TTL)
+            pipe.delete(lock_key)
+            await pipe.execute()
+
+    @classmethod
+    async def release(cls, scope: str, key: str):
+        client = await RedisClient.get_client()
+        await client.delete(cls._keys(scope, key)[1])
+
+
+async def _settle(action: Awaitable[None]):
+    # The request itself already finished; a Redis hiccup here must not fail it
+    try:
+        await action
+    except Exception:
+        logger.warning("Could not record idempotency result", exc_info=True)
+
+
+async def run_idempotent(
+    scope: str,
+    key: Optional[str],
+    request_hash: str,
+    handler: Callable[[], Awaitable[Response]]
+) -> Response:
+    """
+    Runs handler once per idempotency key. Retries get the stored response
+    (marked with Idempotent-Replayed) without running handler again. Client
+    errors are stored too; 5xx and unexpected failures release the key so the
+    request can be retried.
+    """
+    if not key:
+        return await handler()
+
+    if len(key) > IDEMPOTENCY_KEY_MAX_LENGTH:
+        raise HTTPException(status_code=400, detail="Idempotency-Key too long")
+
+    try:
+        state, stored = await IdempotencyStore.begin(scope, key, request_hash)
+    except Exception:
+        # Without Redis we can't dedupe; the DB slot check still prevents double booking
+        logger.warning("Idempotency store unavailable, running request without it", exc_info=True)
+        return await handler()
+
+    if state == "done":
+        if stored["fingerprint"] != request_hash:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Idempotency-Key was already used with a different request"
+            )
+
+        logger.info(f"Idempotent replay | scope={scope}")
+        return Response(
+            content=stored["body"],
+            status_code=stored["status_code"],
+            media_type="application/json",
+            headers={REPLAYED_HEADER: "true"}
+        )
+
+    if state == "locked":
+        raise IdempotencyInProgress()
+
+    try:
+        response = await handler()
+
+    except HTTPException as e:
+        if e.status_code < 500:
+            await _settle(IdempotencyStore.complete(
+                scope, key, request_hash, e.status_code, json.dumps({"detail": e.detail})
+            ))
+        else:
+            await _settle(IdempotencyStore.release(scope, key))
+        raise
+
+    except BaseException:
+        await _settle(IdempotencyStore.release(scope, key))
+        raise
+
+    if response.status_code < 500:
+        await _settle(IdempotencyStore.complete(
+            scope, key, request_hash, response.status_code, response.body.decode()
+        ))
+    else:
+        await _settle(IdempotencyStore.release(scope, key))
+
+    return response
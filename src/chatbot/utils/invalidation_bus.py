@@ -0,0 +1,174 @@
+import asyncio
+import json
+import logging
+import os
+import time
+import uuid
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from ..config.env import get_env
+from ..config.redis import RedisClient
+
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "cache:invalidate"
+LOCAL_CACHE_MAX_AGE = float(get_env("LOCAL_CACHE_MAX_AGE_SECONDS", 60))
+LOCAL_CACHE_MAX_ENTRIES = int(get_env("LOCAL_CACHE_MAX_ENTRIES", 512))
+RESUBSCRIBE_DELAY = 1.0
+
+# Identifies this worker so it can skip its own events (applied locally on publish)
+WORKER_ID = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+
+class LocalCache:
+    """
+    Per-worker cache for one topic, cleared by invalidation events.
+
+    Readers note generation before computing a value and pass it to set();
+    if an invalidation landed in between, the (possibly stale) value is
+    dropped instead of cached. max_age is only a safety net for events lost
+    while the subscriber was reconnecting.
+    """
+
+    def __init__(self, topic: str, max_age: float = LOCAL_CACHE_MAX_AGE, max_entries: int = LOCAL_CACHE_MAX_ENTRIES):
+        self.topic = topic
+        self.max_age = max_age
+        self.max_entries = max_entries
+        self.generation = 0
+        self.version: Optional[int] = None
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+        invalidation_bus.register(self)
+
+    def get(self, key: Hashable) -> Any:
+        # Without a live subscriber we can't hear other workers' writes
+        if not invalidation_bus.connected:
+            return None
+
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        stored_at, value = entry
+        if time.monotonic() - stored_at > self.max_age:
+            self._entries.pop(key, None)
+            return None
+
+        return value
+
+    def set(self, key: Hashable, value: Any, generation: int):
+        if generation != self.generation:
+            return
+
+        if len(self._entries) >= self.max_entries:
+            self._entries.clear()
+
+        self._entries[key] = (time.monotonic(), value)
+
+    def invalidate(self, version: Optional[int] = None):
+        # Clearing is idempotent, so duplicate or reordered events are harmless
+        self.generation += 1
+        self.version = version
+        self._entries.clear()
+
+
+class InvalidationBus:
+    """
+    Redis pub/sub fan-out of cache invalidations. A writer calls publish()
+    after changing shared state; every worker's subscriber evicts the
+    LocalCaches registered for that topic.
+    """
+
+    def __init__(self):
+        self._caches: Dict[str, List[LocalCache]] = {}
+        self.connected = False
+        self.received = 0
+        self.published = 0
+
+    def register(self, cache: LocalCache):
+        self._caches.setdefault(cache.topic, []).append(cache)
+
+    def _apply(self, topic: str, version: Optional[int]):
+        for cache in self._caches.get(topic, []):
+            cache.invalidate(version)
+
+    def _apply_all(self):
+        for caches in self._caches.values():
+            for cache in caches:
+                cache.invalidate()
+
+    async def publish(self, topic: str, version: Optional[int] = None):
+        # Local caches first, so this worker reads its own write immediately
+        self._apply(topic, version)
+
+        try:
+            client = await RedisClient.get_client()
+            await client.publish(CHANNEL, json.dumps({
+                "topic": topic,
+                "version": version,
+                "origin": WORKER_ID,
+            }))
+            self.published += 1
+        except Exception:
+            # Other workers fall back to LOCAL_CACHE_MAX_AGE for this change
+            logger.warning(f"Invalidation publish failed | topic={topic}", exc_info=True)
+
+    def _handle(self, raw: str):
+        try:
+            event = json.loads(raw)
+        except ValueError:
+            logger.warning("Ignoring malformed invalidation event")
+            return
+
+        if event.get("origin") == WORKER_ID:
+            return
+
+        self.received += 1
+        self._apply(event.get("topic"), event.get("version"))
+
+    async def run(self):
+        while True:
+            pubsub = None
+            try:
+                client = await RedisClient.get_client()
+                pubsub = client.pubsub(ignore_subscribe_messages=True)
+                await pubsub.subscribe(CHANNEL)
+
+                # Anything published while we weren't listening is unknown
+                self._apply_all()
+                self.connected = True
+                logger.info("Invalidation bus subscribed")
+
+                async for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        self._handle(message["data"])
+
+            except asyncio.CancelledError:
+                raise
+
+            except Exception:
+                logger.warning("Invalidation subscriber disconnected, resubscribing", exc_info=True)
+                await asyncio.sleep(RESUBSCRIBE_DELAY)
+
+            finally:
+                self.connected = False
+                if pubsub is not None:
+                    try:
+                        await pubsub.aclose()
+                    except Exception:
+                        pass
+
+    def stats(self) -> dict:
+        return {
+            "worker_id": WORKER_ID,
+            "connected": self.connected,
+            "published": self.published,
+            "received": self.received,
+            "topics": {
+                topic: [{"generation": c.generation, "version": c.version} for c in caches]
+                for topic, caches in self._caches.items()
+            },
+        }
+
+
+invalidation_bus = InvalidationBus()
@@ -0,0 +1,326 @@
+import asyncio
+import logging
+import re
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+from starlette.websockets import WebSocketDisconnect
+
+from ..config.cloudflare import CloudflareClient
+from ..config.env import get_env
+
+
+logger = logging.getLogger(__name__)
+
+FAST_MODEL = get_env("CHAT_FAST_MODEL", "@cf/meta/llama-3.1-8b-instruct-fast")
+LARGE_MODEL = get_env("CHAT_LARGE_MODEL", "@cf/meta/llama-3.3-70b-instruct-fp8-fast")
+
+# Per-attempt upstream budget before failing over to the other model
+FAST_TIMEOUT = float(get_env("CHAT_FAST_TIMEOUT_SECONDS", 8))
+LARGE_TIMEOUT = float(get_env("CHAT_LARGE_TIMEOUT_SECONDS", 15))
+
+# Route away from a model whose recent p95 latency or error rate is above these
+SLOW_P95_FACTOR = float(get_env("CHAT_ROUTER_SLOW_P95_FACTOR", 0.8))
+MAX_ERROR_RATE = float(get_env("CHAT_ROUTER_MAX_ERROR_RATE", 0.3))
+
+STATS_WINDOW = 100
+# Samples older than this stop counting, so a model that was routed away from
+# while degraded is retried once its bad samples age out
+STATS_MAX_AGE = float(get_env("CHAT_ROUTER_STATS_MAX_AGE_SECONDS", 120))
+
+REASONING_RE = re.compile(
+    r"\b(why|how does|how do|how can|explain|compare|difference|versus|vs|"
+    r"steps|walk me through|pros|cons|trade-?offs?|troubleshoot|integrat\w*)\b"
+)
+
+OnToken = Callable[[str], Awaitable[None]]
+
+
+@dataclass
+class RoutePlan:
+    model: str
+    fallback: str
+    max_tokens: int
+    timeout: float
+    reason: str
+
+
+class ModelStats:
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.failovers = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        # (monotonic time, value) pairs, newest last
+        self._latencies: Deque[Tuple[float, float]] = deque(maxlen=STATS_WINDOW)
+        self._outcomes: Deque[Tuple[float, bool]] = deque(maxlen=STATS_WINDOW)
+
+    def record(self, latency: float, ok: bool, prompt_tokens: int = 0, completion_tokens: int = 0):
+        now = time.monotonic()
+        self.requests += 1
+        self._outcomes.append((now, ok))
+        if ok:
+            self._latencies.append((now, latency))
+            self.prompt_tokens += prompt_tokens
+            self.completion_tokens += completion_tokens
+        else:
+            self.errors += 1
+
+    def _expire(self):
+        cutoff = time.monotonic() - STATS_MAX_AGE
+        for samples in (self._latencies, self._outcomes):
+            while samples and samples[0][0] < cutoff:
+                samples.popleft()
+
+    def p95(self) -> Optional[float]:
+        self._expire()
+        if not self._latencies:
+            return None
+        ordered = sorted(latency for _, latency in self._latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+    def error_rate(self) -> float:
+        self._expire()
+        if not self._outcomes:
+            return 0.0
+        return sum(1 for _, ok in self._outcomes if not ok) / len(self._outcomes)
+
+    def snapshot(self) -> dict:
+        self._expire()
+        latencies = [latency for _, latency in self._latencies]
+        p95 = self.p95()
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "failovers": self.failovers,
+            "error_rate": round(self.error_rate(), 3),
+            "latency_avg_ms": round(sum(latencies) / len(latencies) * 1000, 2) if latencies else None,
+            "latency_p95_ms": round(p95 * 1000, 2) if p95 is not None else None,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+        }
+
+
+class ModelCallError(Exception):
+    def __init__(self, model: str, detail: str, streamed: bool):
+        super().__init__(f"{model}: {detail}")
+        self.model = model
+        self.detail = detail
+        self.streamed = streamed
+
+
+def estimate_tokens(text: str) -> int:
+    # Rough 4 chars/token; only used when upstream reports no usage
+    return max(1, len(text) // 4)
+
+
+class ModelRouter:
+    """
+    Picks the model and max_tokens for a RAG turn. Short factual questions go
+    to the fast model with a small completion budget. Multi-part or reasoning
+    questions, and turns with a lot of retrieved context, go to the large
+    model. A model that is currently slow or failing is skipped, and a call
+    that errors or exceeds its timeout is retried once on the other model.
+    Health is judged on the last STATS_MAX_AGE seconds only, so a skipped
+    model gets traffic again once its bad samples expire.
+    """
+
+    def __init__(self, fast_model: str = FAST_MODEL, large_model: str = LARGE_MODEL):
+        self.fast_model = fast_model
+        self.large_model = large_model
+        self.timeouts = {fast_model: FAST_TIMEOUT, large_model: LARGE_TIMEOUT}
+        self.stats: Dict[str, ModelStats] = {
+            fast_model: ModelStats(),
+            large_model: ModelStats(),
+        }
+
+    # -----------------------------
+    # Routing
+    # -----------------------------
+
+    @staticmethod
+    def complexity(query: str, context_chars: int) -> int:
+        text = query.lower()
+        score = 0
+
+        if len(text.split()) > 25:
+            score += 1
+        if text.count("?") > 1 or " and " in text and len(text.split()) > 12:
+            score += 1
+        if REASONING_RE.search(text):
+            score += 1
+        if context_chars > 1500:
+            score += 1
+
+        return score
+
+    def is_degraded(self, model: str) -> bool:
+        stats = self.stats[model]
+        p95 = stats.p95()
+        return (
+            stats.error_rate() > MAX_ERROR_RATE
+            or (p95 is not None and p95 > self.timeouts[model] * SLOW_P95_FACTOR)
+        )
+
+    def plan(self, query: str, context_chars: int) -> RoutePlan:
+        score = self.complexity(query, context_chars)
+
+        if score >= 2:
+            model, max_tokens, reason = self.large_model, 800, f"complex({score})"
+        elif score == 1:
+            model, max_tokens, reason = self.fast_model, 600, f"moderate({score})"
+        else:
+            model, max_tokens, reason = self.fast_model, 300, "simple"
+
+        other = self.fast_model if model == self.large_model else self.large_model
+
+        if self.is_degraded(model) and not self.is_degraded(other):
+            model, other = other, model
+            reason += ",degraded"
+
+        return RoutePlan(
+            model=model,
+            fallback=other,
+            max_tokens=max_tokens,
+            timeout=self.timeouts[model],
+            reason=reason
+        )
+
+    # -----------------------------
+    # Execution
+    # -----------------------------
+
+    async def _call(
+        self,
+        model: str,
+        messages: List[dict],
+        max_tokens: int,
+        on_token: Optional[OnToken],
+        timeout: float
+    ):
+        """
+        Returns (reply, prompt_tokens, completion_tokens, latency). Latency is
+        the full call, or time to first token when streaming.
+        """
+        client = CloudflareClient.get_ai_client()
+        start = time.perf_counter()
+
+        if on_token is None:
+            completion = await asyncio.wait_for(
+                client.chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    temperature=0.7,
+                    max_tokens=max_tokens
+                ),
+                timeout
+            )
+            reply = completion.choices[0].message.content.strip()
+            usage = completion.usage
+            latency = time.perf_counter() - start
+            if usage is not None:
+                return reply, usage.prompt_tokens, usage.completion_tokens, latency
+            return reply, 0, estimate_tokens(reply), latency
+
+        # Streaming: the budget covers time to first token only, so a long
+        # answer that is already flowing is never cut off
+        async def open_stream():
+            stream = await client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=0.7,
+                max_tokens=max_tokens,
+                stream=True
+            )
+            iterator = stream.__aiter__()
+            try:
+                first = await iterator.__anext__()
+            except StopAsyncIteration:
+                first = None
+            return iterator, first
+
+        iterator, first = await asyncio.wait_for(open_stream(), timeout)
+        latency = time.perf_counter() - start
+
+        parts = []
+
+        async def emit(chunk):
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if delta:
+                parts.append(delta)
+                await on_token(delta)
+
+        if first is not None:
+            await emit(first)
+            async for chunk in iterator:
+                await emit(chunk)
+
+        reply = "".join(parts).strip()
+        return reply, 0, estimate_tokens(reply), latency
+
+    async def _attempt(self, model: str, messages: List[dict], max_tokens: int, on_token: Optional[OnToken]):
+        streamed = False
+
+        async def tracking_on_token(token: str):
+            nonlocal streamed
+            streamed = True
+            await on_token(token)
+
+        start = time.perf_counter()
+        try:
+            reply, prompt_tokens, completion_tokens, latency = await self._call(
+                model,
+                messages,
+                max_tokens,
+                tracking_on_token if on_token else None,
+                self.timeouts[model]
+            )
+        except WebSocketDisconnect:
+            raise
+        except asyncio.TimeoutError:
+            self.stats[model].timeouts += 1
+            self.stats[model].record(time.perf_counter() - start, ok=False)
+            raise ModelCallError(model, "timeout", streamed)
+        except Exception as e:
+            self.stats[model].record(time.perf_counter() - start, ok=False)
+            raise ModelCallError(model, str(e) or type(e).__name__, streamed) from e
+
+        if not prompt_tokens:
+            prompt_tokens = sum(estimate_tokens(str(m.get("content", ""))) for m in messages)
+
+        self.stats[model].record(latency, True, prompt_tokens, completion_tokens)
+        return reply
+
+    async def complete(self, query: str, messages: List[dict], context_chars: int, on_token: Optional[OnToken] = None) -> str:
+        plan = self.plan(query, context_chars)
+        logger.info(f"LLM route | model={plan.model} | max_tokens={plan.max_tokens} | reason={plan.reason}")
+
+        try:
+            return await self._attempt(plan.model, messages, plan.max_tokens, on_token)
+        except ModelCallError as e:
+            # Tokens already reached the client: a retry would duplicate them
+            if e.streamed:
+                raise
+
+            logger.warning(f"LLM failover | from={plan.model} to={plan.fallback} | {e.detail}")
+            self.stats[plan.model].failovers += 1
+
+        return await self._attempt(plan.fallback, messages, plan.max_tokens, on_token)
+
+    def snapshot(self) -> dict:
+        return {
+            model: {
+                **stats.snapshot(),
+                "degraded": self.is_degraded(model),
+                "timeout_s": self.timeouts[model],
+            }
+            for model, stats in self.stats.items()
+        }
+
+
+model_router = ModelRouter()
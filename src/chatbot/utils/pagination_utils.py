@@ -0,0 +1,24 @@
+import base64
+from datetime import datetime
+from typing import Tuple
+from uuid import UUID
+
+
+def encode_cursor(booking_datetime: datetime, booking_id: UUID) -> str:
+    raw = f"{booking_datetime.isoformat()}|{booking_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """Raises ValueError for malformed cursors."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+        dt, booking_id = raw.split("|", 1)
+        return datetime.fromisoformat(dt), UUID(booking_id)
+    except Exception as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
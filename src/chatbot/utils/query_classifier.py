@@ -0,0 +1,51 @@
+import re
+from typing import Dict, Optional, Tuple
+
+
+# Keyword stems per knowledge base category. Categories match the
+# front-matter / folder categories ingest.py writes as Vectorize namespaces.
+CATEGORY_KEYWORDS: Dict[str, Tuple[str, ...]] = {
+    "booking": (
+        "demo", "book", "schedul", "slot", "appointment", "meeting",
+        "timezone", "reschedul",
+    ),
+    "integrations": (
+        "integrat", "shopify", "woocommerce", "magento", "api", "webhook",
+        "twilio", "whatsapp", "sendgrid", "plugin", "connect",
+    ),
+    "product": (
+        "dashboard", "feature", "delay", "predict", "route", "analytic",
+        "notification", "alert", "track", "shipment", "carrier",
+    ),
+    "company": (
+        "company", "mission", "vision", "founded", "founder", "about",
+        "team", "who",
+    ),
+}
+
+# Namespace of docs without a category (the FAQ). It spans every topic, so
+# it is searched alongside whichever category a question is classified into.
+GENERAL_CATEGORY = "general"
+
+WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def classify_query(text: str) -> Optional[str]:
+    """
+    Keyword vote over CATEGORY_KEYWORDS. Returns the single best category,
+    or None when nothing matches or the top categories tie, in which case
+    the caller should search the whole index.
+    """
+    words = WORD_RE.findall(text.lower())
+    scores = {
+        category: sum(1 for word in words if word.startswith(stems))
+        for category, stems in CATEGORY_KEYWORDS.items()
+    }
+
+    ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+    best, best_score = ranked[0]
+
+    if best_score == 0 or (len(ranked) > 1 and ranked[1][1] == best_score):
+        return None
+
+    return best
@@ -0,0 +1,221 @@
+import hashlib
+import logging
+import math
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, status
+from starlette.requests import HTTPConnection
+
+from ..config.env import get_env
+from ..config.redis import RedisClient
+
+
+logger = logging.getLogger(__name__)
+
+# (capacity, refill tokens per second) per limiter scope
+CHAT_LIMITS = {
+    "session": (
+        int(get_env("CHAT_RATE_LIMIT_SESSION_CAPACITY", 20)),
+        float(get_env("CHAT_RATE_LIMIT_SESSION_RATE", 0.5)),
+    ),
+    "ip": (
+        int(get_env("CHAT_RATE_LIMIT_IP_CAPACITY", 60)),
+        float(get_env("CHAT_RATE_LIMIT_IP_RATE", 1)),
+    ),
+    "api_key": (
+        int(get_env("CHAT_RATE_LIMIT_API_KEY_CAPACITY", 300)),
+        float(get_env("CHAT_RATE_LIMIT_API_KEY_RATE", 5)),
+    ),
+}
+
+CHAT_MAX_INFLIGHT_LLM = int(get_env("CHAT_MAX_INFLIGHT_LLM", 32))
+CHAT_OVERLOAD_RETRY_AFTER = int(get_env("CHAT_OVERLOAD_RETRY_AFTER", 2))
+
+KEY_PREFIX = "ratelimit:chat"
+
+# Refill every bucket, then take from all of them only if all have enough, in
+# one atomic step: a request rejected by one scope costs nothing in the others.
+# Uses the Redis clock so workers with skewed clocks share one view of time.
+# ARGV = cost, then (capacity, rate) per key.
+# Returns {allowed, retry_after_ms, index of the first rejecting key (1-based)}.
+TOKEN_BUCKET_LUA = """
+local cost = tonumber(ARGV[1])
+
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+
+local levels = {}
+local rejected = 0
+local retry_after = 0
+
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[i * 2])
+    local rate = tonumber(ARGV[i * 2 + 1])
+
+    local bucket = redis.call('HMGET', key, 'tokens', 'ts')
+    local tokens = tonumber(bucket[1])
+    local ts = tonumber(bucket[2])
+
+    if tokens == nil then
+        tokens = capacity
+        ts = now
+    end
+
+    tokens = math.min(capacity, tokens + (now - ts) * rate / 1000)
+    levels[i] = tokens
+
+    if tokens < cost and rejected == 0 then
+        rejected = i
+        retry_after = math.ceil((cost - tokens) * 1000 / rate)
+    end
+end
+
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[i * 2])
+    local rate = tonumber(ARGV[i * 2 + 1])
+    local tokens = levels[i]
+
+    if rejected == 0 then
+        tokens = tokens - cost
+    end
+
+    redis.call('HSET', key, 'tokens', tokens, 'ts', now)
+    redis.call('PEXPIRE', key, math.ceil(capacity * 1000 / rate) + 1000)
+end
+
+if rejected == 0 then
+    return {1, 0, 0}
+end
+return {0, retry_after, rejected}
+"""
+
+# (key, capacity, refill tokens per second)
+Bucket = Tuple[str, int, float]
+
+
+class LocalTokenBucket:
+    """In-process fallback used while Redis is unreachable."""
+
+    _buckets: Dict[str, Tuple[float, float]] = {}
+    MAX_BUCKETS = 10_000
+
+    @classmethod
+    def take_all(cls, buckets: List[Bucket], cost: int = 1) -> Tuple[bool, int, int]:
+        now = time.monotonic()
+
+        if len(cls._buckets) >= cls.MAX_BUCKETS:
+            cls._buckets.clear()
+
+        levels = []
+        rejected, retry_after = -1, 0
+
+        for i, (key, capacity, rate) in enumerate(buckets):
+            tokens, ts = cls._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - ts) * rate)
+            levels.append(tokens)
+
+            if tokens < cost and rejected < 0:
+                rejected, retry_after = i, math.ceil((cost - tokens) * 1000 / rate)
+
+        for (key, _, _), tokens in zip(buckets, levels):
+            cls._buckets[key] = (tokens - cost if rejected < 0 else tokens, now)
+
+        return rejected < 0, retry_after, rejected
+
+
+class RateLimiter:
+    _script = None
+
+    @classmethod
+    async def take_all(cls, buckets: List[Bucket], cost: int = 1) -> Tuple[bool, int, int]:
+        """
+        Charges every bucket or none. Returns (allowed, retry_after_ms, index
+        of the bucket that rejected, -1 when allowed).
+        """
+        try:
+            client = await RedisClient.get_client()
+            if cls._script is None:
+                cls._script = client.register_script(TOKEN_BUCKET_LUA)
+
+            args = [cost]
+            for _, capacity, rate in buckets:
+                args.extend([capacity, rate])
+
+            allowed, retry_after, rejected = await cls._script(
+                keys=[key for key, _, _ in buckets], args=args
+            )
+            return bool(int(allowed)), int(retry_after), int(rejected) - 1
+
+        except Exception:
+            logger.warning("Redis rate limiter unavailable, using local bucket", exc_info=True)
+            return LocalTokenBucket.take_all(buckets, cost)
+
+
+def client_ip(request: HTTPConnection) -> str:
+    return request.client.host if request.client else "unknown"
+
+
+def hash_identity(value: str) -> str:
+    # Secrets such as API keys must not appear in Redis key names
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()[:16]
+
+
+async def enforce_chat_rate_limit(request: HTTPConnection, session_id: str):
+    api_key = request.headers.get("x-api-key")
+
+    scopes: List[Tuple[str, Optional[str]]] = [
+        ("session", session_id),
+        ("ip", client_ip(request)),
+        ("api_key", hash_identity(api_key) if api_key else None),
+    ]
+    scopes = [(scope, identity) for scope, identity in scopes if identity]
+
+    buckets = [
+        (f"{KEY_PREFIX}:{scope}:{identity}", *CHAT_LIMITS[scope])
+        for scope, identity in scopes
+    ]
+
+    allowed, retry_after_ms, rejected = await RateLimiter.take_all(buckets)
+
+    if not allowed:
+        logger.warning(f"Chat rate limited | scope={scopes[rejected][0]}")
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many requests",
+            headers={"Retry-After": str(max(1, math.ceil(retry_after_ms / 1000)))}
+        )
+
+
+class AdmissionController:
+    """
+    Caps in-flight upstream LLM calls per worker. Requests over the limit are
+    shed immediately with 503 instead of queueing behind slow upstream calls.
+    The cap is not shared: the deployment-wide limit is
+    CHAT_MAX_INFLIGHT_LLM times the number of workers.
+    """
+
+    def __init__(self, max_inflight: int, retry_after: int):
+        self.max_inflight = max_inflight
+        self.retry_after = retry_after
+        self.inflight = 0
+
+    @asynccontextmanager
+    async def slot(self):
+        if self.inflight >= self.max_inflight:
+            logger.warning(f"LLM admission rejected | inflight={self.inflight}")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Assistant is busy, please retry shortly",
+                headers={"Retry-After": str(self.retry_after)}
+            )
+
+        self.inflight += 1
+        try:
+            yield
+        finally:
+            self.inflight -= 1
+
+
+llm_admission = AdmissionController(CHAT_MAX_INFLIGHT_LLM, CHAT_OVERLOAD_RETRY_AFTER)
@@ -0,0 +1,149 @@
+import asyncio
+import logging
+import math
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+from sqlalchemy import select, delete, exists
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from ..config.env import get_env, get_bool_env
+from .email_utils import smtp_pool, build_reminder_message, SMTP_CONFIGURED
+from src.chatbot.models.booking import Bookings
+from src.chatbot.models.booking_reminder import BookingReminders
+
+
+logger = logging.getLogger(__name__)
+
+# Off by default without SMTP credentials; every pass would claim, fail and unclaim
+REMINDERS_ENABLED = get_bool_env("REMINDERS_ENABLED", SMTP_CONFIGURED)
+REMINDER_LEAD_HOURS = int(get_env("REMINDER_LEAD_HOURS", 24))
+REMINDER_INTERVAL = int(get_env("REMINDER_INTERVAL_SECONDS", 300))
+REMINDER_BATCH_SIZE = int(get_env("REMINDER_BATCH_SIZE", 50))
+
+
+def reminder_kind(lead_hours: int) -> str:
+    return f"before_{lead_hours}h"
+
+
+def claim_due_reminders(db: Session, now: datetime, lead_hours: int, limit: int) -> List[Bookings]:
+    """
+    Find bookings starting within lead_hours that have no reminder yet and
+    claim them by inserting their reminder rows. ON CONFLICT DO NOTHING makes
+    the claim safe across workers: only the inserter sends the email.
+    """
+    kind = reminder_kind(lead_hours)
+
+    # Range predicate on booking_datetime uses ix_bookings_booking_datetime
+    due = db.execute(
+        select(Bookings)
+        .where(
+            Bookings.booking_datetime > now,
+            Bookings.booking_datetime <= now + timedelta(hours=lead_hours),
+            ~exists().where(
+                BookingReminders.booking_id == Bookings.id,
+                BookingReminders.kind == kind
+            )
+        )
+        .order_by(Bookings.booking_datetime)
+        .limit(limit)
+    ).scalars().all()
+
+    if not due:
+        return []
+
+    claimed = set(db.execute(
+        pg_insert(BookingReminders)
+        .values([{"booking_id": booking.id, "kind": kind} for booking in due])
+        .on_conflict_do_nothing()
+        .returning(BookingReminders.booking_id)
+    ).scalars().all())
+
+    # Detach before commit so the rows stay loaded for the send phase
+    for booking in due:
+        db.expunge(booking)
+
+    db.commit()
+
+    return [booking for booking in due if booking.id in claimed]
+
+
+def send_reminder_batch(bookings: List[Bookings], now: datetime) -> List:
+    """Sends one by one; returns ids that failed."""
+    failed = []
+
+    for booking in bookings:
+        hours_left = max(1, math.ceil((booking.booking_datetime - now).total_seconds() / 3600))
+        try:
+            # Checked out per message, so a confirmation waits one send at most
+            with smtp_pool.connection() as server:
+                server.send_message(build_reminder_message(booking, hours_left))
+        except Exception:
+            logger.error(f"Reminder email failed | id={booking.id}", exc_info=True)
+            failed.append(booking.id)
+
+    return failed
+
+
+def run_reminder_pass(session_factory, lead_hours: int = REMINDER_LEAD_HOURS) -> int:
+    db = session_factory()
+    sent = 0
+
+    try:
+        while True:
+            now = datetime.now(timezone.utc)
+            bookings = claim_due_reminders(db, now, lead_hours, REMINDER_BATCH_SIZE)
+
+            if not bookings:
+                break
+
+            # One slice per pooled connection, sent in parallel
+            slices = [bookings[i::smtp_pool.size] for i in range(smtp_pool.size)]
+            slices = [s for s in slices if s]
+
+            with ThreadPoolExecutor(max_workers=len(slices)) as executor:
+                results = executor.map(lambda part: _send_safely(part, now), slices)
+                failed = [booking_id for ids in results for booking_id in ids]
+
+            if failed:
+                # Release the claims so the next pass retries them
+                db.execute(
+                    delete(BookingReminders).where(
+                        BookingReminders.booking_id.in_(failed),
+                        BookingReminders.kind == reminder_kind(lead_hours)
+                    )
+                )
+                db.commit()
+
+            sent += len(bookings) - len(failed)
+
+            if failed or len(bookings) < REMINDER_BATCH_SIZE:
+                break
+
+    finally:
+        db.close()
+
+    if sent:
+        logger.info(f"Reminder emails sent | count={sent}")
+
+    return sent
+
+
+def _send_safely(bookings: List[Bookings], now: datetime) -> List:
+    try:
+        return send_reminder_batch(bookings, now)
+    except Exception:
+        logger.error("Reminder batch failed", exc_info=True)
+        return [booking.id for booking in bookings]
+
+
+async def run_reminder_loop(session_factory, interval: int = REMINDER_INTERVAL):
+    while True:
+        try:
+            await asyncio.to_thread(run_reminder_pass, session_factory)
+        except Exception:
+            logger.error("Reminder pass failed", exc_info=True)
+
+        await asyncio.sleep(interval)
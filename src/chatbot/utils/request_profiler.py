@@ -0,0 +1,157 @@
+import asyncio
+import cProfile
+import hmac
+import logging
+import random
+import re
+import time
+import uuid
+from pathlib import Path
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..config.env import get_env
+
+try:
+    from pyinstrument import Profiler
+except ImportError:
+    Profiler = None
+
+
+logger = logging.getLogger(__name__)
+
+# Header-triggered profiling is off unless an admin key is configured
+PROFILE_ADMIN_KEY = get_env("PROFILE_ADMIN_KEY")
+PROFILE_SAMPLE_RATE = float(get_env("PROFILE_SAMPLE_RATE", 0))
+PROFILES_DIR = Path(get_env("PROFILES_DIR", "profiles"))
+# Oldest reports beyond this many are deleted
+PROFILE_KEEP = int(get_env("PROFILE_KEEP", 200))
+PROFILE_INTERVAL = float(get_env("PROFILE_INTERVAL_SECONDS", 0.001))
+
+PROFILE_HEADER = "x-profile"
+ADMIN_KEY_HEADER = "x-admin-key"
+PROFILE_ID_HEADER = "X-Profile-Id"
+
+SLUG_RE = re.compile(r"[^a-zA-Z0-9]+")
+
+
+class ProfilingMiddleware:
+    """
+    Runs selected requests under a profiler and writes one report per request
+    to PROFILES_DIR. A request is profiled when it sends X-Profile: 1 with
+    X-Admin-Key matching PROFILE_ADMIN_KEY, or when it is picked by
+    PROFILE_SAMPLE_RATE.
+
+    With pyinstrument installed the report is HTML, and time the request
+    spent awaiting (DB, Redis, upstream calls, the threadpool) shows as
+    [await] frames, separate from the frames that used CPU. Without it,
+    cProfile records CPU time per function into a .prof file.
+
+    The logged CPU total is thread_time of the event loop thread. Work a
+    sync endpoint or run_in_threadpool does on other threads is not in it
+    (it counts as await), and other requests served by the loop during the
+    profile are.
+
+    Only one request is profiled at a time; a profiler sees the whole event
+    loop thread, so overlapping profiles would mix each other's frames.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self._active = False
+
+    def _wanted(self, scope: Scope) -> bool:
+        headers = Headers(scope=scope)
+
+        if headers.get(PROFILE_HEADER) == "1" and PROFILE_ADMIN_KEY:
+            key = headers.get(ADMIN_KEY_HEADER, "")
+            if hmac.compare_digest(key.encode(), PROFILE_ADMIN_KEY.encode()):
+                return True
+            logger.warning("Profile requested with an invalid admin key")
+
+        return PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or self._active or not self._wanted(scope):
+            await self.app(scope, receive, send)
+            return
+
+        self._active = True
+        try:
+            await self._profile(scope, receive, send)
+        finally:
+            self._active = False
+
+    async def _profile(self, scope: Scope, receive: Receive, send: Send):
+        profile_id = uuid.uuid4().hex[:12]
+        status_code = 500
+
+        async def send_with_id(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(scope=message).append(PROFILE_ID_HEADER, profile_id)
+            await send(message)
+
+        if Profiler is not None:
+            profiler = Profiler(interval=PROFILE_INTERVAL, async_mode="enabled")
+        else:
+            # thread_time: the pstats show the loop thread's CPU, not time blocked on awaits
+            profiler = cProfile.Profile(time.thread_time)
+
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        if Profiler is not None:
+            profiler.start()
+        else:
+            profiler.enable()
+
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            if Profiler is not None:
+                profiler.stop()
+            else:
+                profiler.disable()
+            wall_ms = (time.perf_counter() - wall_start) * 1000
+            cpu_ms = (time.thread_time() - cpu_start) * 1000
+
+            try:
+                path = await asyncio.to_thread(
+                    self._write_report, profiler, scope, profile_id
+                )
+                logger.info(
+                    f"Request profiled | {scope['method']} {scope['path']} | status={status_code} | "
+                    f"wall={wall_ms:.1f}ms | loop_cpu={cpu_ms:.1f}ms | await={max(0.0, wall_ms - cpu_ms):.1f}ms | "
+                    f"report={path}"
+                )
+            except Exception:
+                logger.error("Could not write profile report", exc_info=True)
+
+    @staticmethod
+    def _write_report(profiler, scope: Scope, profile_id: str) -> Path:
+        PROFILES_DIR.mkdir(parents=True, exist_ok=True)
+
+        slug = SLUG_RE.sub("_", scope["path"]).strip("_") or "root"
+        stem = f"{time.strftime('%Y%m%dT%H%M%S')}-{scope['method']}-{slug}-{profile_id}"
+
+        if Profiler is not None:
+            path = PROFILES_DIR / f"{stem}.html"
+            path.write_text(profiler.output_html(), encoding="utf-8")
+        else:
+            path = PROFILES_DIR / f"{stem}.prof"
+            profiler.dump_stats(str(path))
+
+        _prune(PROFILE_KEEP)
+        return path
+
+
+def _prune(keep: int):
+    reports = sorted(
+        (p for p in PROFILES_DIR.iterdir() if p.suffix in (".html", ".prof")),
+        key=lambda p: p.stat().st_mtime
+    )
+    for path in reports[:-keep] if keep > 0 else []:
+        path.unlink(missing_ok=True)
+
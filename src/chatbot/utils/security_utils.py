@@ -1,7 +1,8 @@
 from fastapi import Header, HTTPException, status
-import os
 
-API_KEY = os.getenv("API_KEY")
+from ..config.env import get_env
+
+API_KEY = get_env("API_KEY")
 
 async def verify_api_key(x_api_key: str = Header(None)):
     if not x_api_key:
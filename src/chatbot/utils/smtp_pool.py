@@ -0,0 +1,114 @@
+import logging
+import queue
+import smtplib
+import threading
+from contextlib import contextmanager
+from typing import Optional
+
+from ..config.env import get_env
+
+
+logger = logging.getLogger(__name__)
+
+SMTP_POOL_SIZE = int(get_env("SMTP_POOL_SIZE", 2))
+# Extra connections only priority callers (booking confirmations) may use
+SMTP_RESERVED_CONNECTIONS = int(get_env("SMTP_RESERVED_CONNECTIONS", 1))
+SMTP_TIMEOUT = float(get_env("SMTP_TIMEOUT", 30))
+# How long a caller waits for a free pooled connection before giving up
+SMTP_ACQUIRE_TIMEOUT = float(get_env("SMTP_ACQUIRE_TIMEOUT", 10))
+
+
+class SMTPPoolExhausted(Exception):
+    pass
+
+
+class SMTPConnectionPool:
+    """
+    A small set of long-lived, logged-in SMTP connections. Connections are
+    health-checked with NOOP on checkout and rebuilt when the server has
+    dropped them, so batches skip the per-message connect/TLS/login cost.
+
+    size connections are shared by everyone; reserved more are held back
+    for priority callers, so a busy reminder batch can't starve booking
+    confirmations.
+    """
+
+    def __init__(
+        self,
+        host,
+        port,
+        user,
+        password,
+        size: int = SMTP_POOL_SIZE,
+        reserved: int = SMTP_RESERVED_CONNECTIONS
+    ):
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.size = size
+        self._idle: "queue.LifoQueue[smtplib.SMTP]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._reserved = threading.BoundedSemaphore(reserved) if reserved > 0 else None
+
+    def _connect(self) -> smtplib.SMTP:
+        server = smtplib.SMTP(self.host, self.port, timeout=SMTP_TIMEOUT)
+        server.starttls()
+        server.login(self.user, self.password)
+        return server
+
+    @staticmethod
+    def _is_alive(server: smtplib.SMTP) -> bool:
+        try:
+            return server.noop()[0] == 250
+        except smtplib.SMTPException:
+            return False
+        except OSError:
+            return False
+
+    @staticmethod
+    def _quit(server: smtplib.SMTP):
+        try:
+            server.quit()
+        except Exception:
+            server.close()
+
+    def _acquire(self, timeout: float, priority: bool) -> threading.BoundedSemaphore:
+        if priority and self._reserved is not None and self._reserved.acquire(blocking=False):
+            return self._reserved
+
+        if self._slots.acquire(timeout=timeout):
+            return self._slots
+
+        raise SMTPPoolExhausted(f"No SMTP connection free after {timeout}s")
+
+    @contextmanager
+    def connection(self, timeout: float = SMTP_ACQUIRE_TIMEOUT, priority: bool = False):
+        slot = self._acquire(timeout, priority)
+        server: Optional[smtplib.SMTP] = None
+        try:
+            try:
+                server = self._idle.get_nowait()
+                if not self._is_alive(server):
+                    self._quit(server)
+                    server = self._connect()
+            except queue.Empty:
+                server = self._connect()
+
+            yield server
+
+            self._idle.put(server)
+            server = None
+
+        finally:
+            # Only reached with a server here if the caller raised: drop it
+            if server is not None:
+                self._quit(server)
+            slot.release()
+
+    def close(self):
+        while True:
+            try:
+                self._quit(self._idle.get_nowait())
+            except queue.Empty:
+                break
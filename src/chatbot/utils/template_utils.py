@@ -0,0 +1,34 @@
+import html
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import List
+
+TEMPLATE_DIR = Path(__file__).resolve().parent.parent / "templates"
+
+PLACEHOLDER = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+
+
+class CompiledTemplate:
+    """
+    A template split once into its static chunks and field names. Rendering
+    is a single join; the static HTML is never re-parsed or re-built.
+    """
+
+    def __init__(self, source: str):
+        parts = PLACEHOLDER.split(source)
+        self.static: List[str] = parts[0::2]
+        self.fields: List[str] = parts[1::2]
+
+    def render(self, **values) -> str:
+        out = [self.static[0]]
+        for field, static in zip(self.fields, self.static[1:]):
+            value = values.get(field)
+            out.append(html.escape("" if value is None else str(value)))
+            out.append(static)
+        return "".join(out)
+
+
+@lru_cache(maxsize=None)
+def load_template(name: str) -> CompiledTemplate:
+    return CompiledTemplate((TEMPLATE_DIR / name).read_text(encoding="utf-8"))
@@ -0,0 +1,78 @@
+from collections import OrderedDict
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, List, Tuple
+from zoneinfo import ZoneInfo
+
+from ..config.env import get_env
+
+
+RENDER_CACHE_SIZE = int(get_env("AVAILABILITY_RENDER_CACHE_SIZE", 256))
+
+_render_cache: "OrderedDict[Tuple[str, str, str, str], List[Dict]]" = OrderedDict()
+
+
+@lru_cache(maxsize=None)
+def get_zone(tz_name: str) -> ZoneInfo:
+    """Shared ZoneInfo lookup. Raises for unknown or malformed names."""
+    return ZoneInfo(tz_name)
+
+
+def is_valid_timezone(tz_name: str) -> bool:
+    try:
+        get_zone(tz_name)
+        return True
+    except Exception:
+        return False
+
+
+def render_slots(availability: List[Dict], tz_name: str) -> List[Dict]:
+    """Group UTC slots by local date and attach human readable labels."""
+    tz = get_zone(tz_name)
+    grouped: Dict[str, Dict] = {}
+
+    for day in availability:
+        for slot in day["available_slots"]:
+            local_dt = datetime.fromisoformat(slot).astimezone(tz)
+            local_date = local_dt.date().isoformat()
+
+            if local_date not in grouped:
+                grouped[local_date] = {
+                    "date": local_date,
+                    "label": local_dt.strftime("%a, %d %b %Y"),
+                    "slots": []
+                }
+
+            grouped[local_date]["slots"].append({
+                "value": slot,
+                "label": local_dt.strftime("%I:%M %p"),
+            })
+
+    return [grouped[d] for d in sorted(grouped)]
+
+
+def render_availability(availability: List[Dict], tz_name: str, version: str) -> List[Dict]:
+    """
+    Cached render_slots. The rendered list is shared by every user in the same
+    timezone and date range until version changes; callers fold the calendar's
+    slot epoch into version so passed slots drop out.
+    """
+    key = (
+        tz_name,
+        version,
+        availability[0]["date"] if availability else "",
+        availability[-1]["date"] if availability else ""
+    )
+
+    cached = _render_cache.get(key)
+    if cached is not None:
+        _render_cache.move_to_end(key)
+        return cached
+
+    rendered = render_slots(availability, tz_name)
+
+    _render_cache[key] = rendered
+    if len(_render_cache) > RENDER_CACHE_SIZE:
+        _render_cache.popitem(last=False)
+
+    return rendered
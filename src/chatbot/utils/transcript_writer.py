@@ -0,0 +1,152 @@
+import asyncio
+import logging
+from collections import deque
+from datetime import datetime, timezone
+from typing import Deque, Dict, List, Optional
+
+from sqlalchemy import insert
+
+from ..config.db import SessionLocal
+from ..config.env import get_env, get_bool_env
+from src.chatbot.models.chat_message import ChatMessages
+
+
+logger = logging.getLogger(__name__)
+
+TRANSCRIPTS_ENABLED = get_bool_env("TRANSCRIPTS_ENABLED", True)
+TRANSCRIPT_BATCH_SIZE = int(get_env("TRANSCRIPT_BATCH_SIZE", 200))
+TRANSCRIPT_FLUSH_INTERVAL = float(get_env("TRANSCRIPT_FLUSH_INTERVAL_SECONDS", 2))
+TRANSCRIPT_MAX_BUFFER = int(get_env("TRANSCRIPT_MAX_BUFFER", 10000))
+
+
+class TranscriptWriter:
+    """
+    Write-behind buffer for chat transcripts. record() only appends to an
+    in-memory queue; a background task flushes it with one multi-row INSERT
+    whenever batch_size messages are waiting or flush_interval has passed.
+
+    The buffer is bounded: once max_buffer messages are pending (database
+    down or too slow) the oldest ones are dropped and counted, so chat
+    requests never wait on transcript persistence.
+    """
+
+    def __init__(
+        self,
+        session_factory=SessionLocal,
+        batch_size: int = TRANSCRIPT_BATCH_SIZE,
+        flush_interval: float = TRANSCRIPT_FLUSH_INTERVAL,
+        max_buffer: int = TRANSCRIPT_MAX_BUFFER
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self._buffer: Deque[Dict] = deque()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._closing = False
+        self.dropped = 0
+        self.written = 0
+
+    def _ensure_worker(self):
+        # Event and task are bound to the running loop, so create them lazily
+        if self._worker is None or self._worker.done():
+            self._wakeup = asyncio.Event()
+            self._worker = asyncio.create_task(self._run())
+
+    def record(self, session_id: str, role: str, content: str):
+        if not TRANSCRIPTS_ENABLED:
+            return
+
+        self._ensure_worker()
+
+        if len(self._buffer) >= self.max_buffer:
+            self._buffer.popleft()
+            self.dropped += 1
+            if self.dropped % 1000 == 1:
+                logger.warning(f"Transcript buffer full, dropping messages | dropped={self.dropped}")
+
+        self._buffer.append({
+            "session_id": session_id,
+            "role": role,
+            "content": content,
+            "created_at": datetime.now(timezone.utc),
+        })
+
+        if len(self._buffer) >= self.batch_size:
+            self._wakeup.set()
+
+    async def _run(self):
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+            while self._buffer:
+                if not await self.flush():
+                    # Leave the rows buffered and retry on the next tick
+                    break
+                if len(self._buffer) < self.batch_size:
+                    break
+
+    def _take_batch(self) -> List[Dict]:
+        count = min(self.batch_size, len(self._buffer))
+        return [self._buffer.popleft() for _ in range(count)]
+
+    def _insert(self, rows: List[Dict]):
+        db = self.session_factory()
+        try:
+            # executemany of a Core insert is sent as multi-row
+            # INSERT ... VALUES by SQLAlchemy's insertmanyvalues
+            db.execute(insert(ChatMessages), rows)
+            db.commit()
+        finally:
+            db.close()
+
+    async def flush(self) -> bool:
+        rows = self._take_batch()
+        if not rows:
+            return True
+
+        try:
+            await asyncio.to_thread(self._insert, rows)
+            self.written += len(rows)
+            return True
+
+        except Exception:
+            logger.error(f"Transcript flush failed | rows={len(rows)}", exc_info=True)
+
+            # Put the batch back in front, keeping within the buffer bound
+            room = self.max_buffer - len(self._buffer)
+            if room < len(rows):
+                self.dropped += len(rows) - room
+                rows = rows[len(rows) - room:] if room > 0 else []
+            self._buffer.extendleft(reversed(rows))
+            return False
+
+    def stats(self) -> dict:
+        return {
+            "pending": len(self._buffer),
+            "written": self.written,
+            "dropped": self.dropped,
+        }
+
+    async def close(self):
+        # Let an in-flight flush finish rather than cancelling it mid-batch
+        self._closing = True
+        if self._worker is not None:
+            self._wakeup.set()
+            await self._worker
+            self._worker = None
+
+        # Drain whatever is left on graceful shutdown
+        while self._buffer:
+            if not await self.flush():
+                logger.warning(f"Transcripts lost on shutdown | count={len(self._buffer)}")
+                self._buffer.clear()
+                break
+
+
+transcript_writer = TranscriptWriter()
@@ -0,0 +1,49 @@
+from pydantic import BaseModel, ConfigDict
+from datetime import datetime
+from typing import List, Optional, Union
+from uuid import UUID
+
+
+class BookingResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    name: str
+    business_name: str
+    work_email: str
+    contact_number: str
+    booking_datetime: datetime
+    message: Optional[str] = None
+    timezone: str
+
+
+class PaginatedBookingsResponse(BaseModel):
+    page: int
+    limit: int
+    total: int
+    records: List[BookingResponse]
+
+
+class BookingSearchResponse(BaseModel):
+    limit: int
+    next_cursor: Optional[str] = None
+    records: List[BookingResponse]
+
+
+class AvailabilityDayResponse(BaseModel):
+    date: str
+    available_slots: List[str]
+
+
+class LocalSlotResponse(BaseModel):
+    value: str
+    label: str
+
+
+class LocalAvailabilityDayResponse(BaseModel):
+    date: str
+    label: str
+    slots: List[LocalSlotResponse]
+
+
+AvailabilityResponse = List[Union[AvailabilityDayResponse, LocalAvailabilityDayResponse]]